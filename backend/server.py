@@ -1,24 +1,48 @@
 from __future__ import annotations
 
+import argparse
 import asyncio
 import base64
+import csv
+import gzip
+import hashlib
 import hmac
 import json
 import logging
+import mimetypes
+import multiprocessing
 import os
 import secrets
+import sqlite3
+import time
 import uuid
+import zipfile
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
 from datetime import datetime, timedelta, timezone
-from io import BytesIO
+from io import BytesIO, StringIO
 from pathlib import Path
-from dataclasses import dataclass
-from typing import Any, AsyncGenerator, Dict, List, Optional, Sequence, Set, Tuple, Type, TypeVar
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, AsyncGenerator, Awaitable, Callable, Dict, Iterator, List, Optional, Sequence, Set, Tuple, Type, TypeVar, Union
 
 from hashlib import pbkdf2_hmac
 from jose import ExpiredSignatureError, JWTError, jwt as PyJWT
 from dotenv import load_dotenv
-from fastapi import APIRouter, Depends, FastAPI, HTTPException, status
-from fastapi.responses import StreamingResponse
+from fastapi import (
+    APIRouter,
+    Depends,
+    FastAPI,
+    File,
+    HTTPException,
+    Query,
+    Request,
+    UploadFile,
+    status,
+)
+from fastapi.responses import Response, StreamingResponse
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
 from pydantic import BaseModel, ConfigDict, EmailStr, Field
@@ -26,24 +50,63 @@ from sqlalchemy import (
     JSON,
     Boolean,
     DateTime,
+    Index,
     Integer,
+    LargeBinary,
     String,
     Text,
     UniqueConstraint,
     delete,
+    event,
     func,
+    insert,
+    inspect,
+    literal,
+    literal_column,
+    or_,
     select,
+    text,
+    update,
 )
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.dialects import mysql as mysql_dialect
+from sqlalchemy.dialects import postgresql as postgresql_dialect
+from sqlalchemy.dialects import sqlite as sqlite_dialect
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.exceptions import HTTPException as StarletteHTTPException
 from starlette.middleware.cors import CORSMiddleware
-
-from openpyxl import Workbook
-from openpyxl.drawing.image import Image as XLImage
-from openpyxl.utils import get_column_letter
+from starlette.responses import FileResponse
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import orjson
+except ImportError:  # the stdlib encoder is used instead
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # responses are only gzip-compressed
+    brotli = None
+
+try:
+    import fcntl
+except ImportError:  # scheduled backups are not coordinated across processes
+    fcntl = None
+
+# openpyxl and Pillow are imported where they are used: only exports, imports
+# and image uploads need them, and they are slow to load on worker start.
+if TYPE_CHECKING:
+    from openpyxl.drawing.image import Image as XLImage
 
 app = FastAPI()
 
+# Response header marking a successful write; the client sends it back so its
+# next reads go to the primary. See ``prefers_primary``.
+LAST_WRITE_HEADER = "X-Last-Write"
+
 _allowed_origins = os.environ.get("CORS_ALLOW_ORIGINS", "*")
 allow_origin_list = [origin.strip() for origin in _allowed_origins.split(",") if origin.strip()]
 if "*" in allow_origin_list:
@@ -55,6 +118,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[LAST_WRITE_HEADER],
 )
 api_router = APIRouter(prefix="/api")
 ROOT_DIR = Path(__file__).parent
@@ -66,11 +130,134 @@ DATABASE_URL = os.environ.get(
     "DATABASE_URL", f"sqlite+aiosqlite:///{(ROOT_DIR / 'app.db').as_posix()}"
 )
 
-engine = create_async_engine(DATABASE_URL, echo=False, future=True)
-async_session = async_sessionmaker(engine, expire_on_commit=False)
+# Applied on every new SQLite connection. WAL lets readers run alongside the
+# single writer, and busy_timeout makes writers wait instead of failing with
+# "database is locked". Set a value to an empty string to leave that pragma
+# at SQLite's default.
+SQLITE_PRAGMAS: Dict[str, str] = {
+    "journal_mode": os.environ.get("SQLITE_JOURNAL_MODE", "WAL"),
+    "synchronous": os.environ.get("SQLITE_SYNCHRONOUS", "NORMAL"),
+    # Negative values are KiB, so the default is a 64 MiB page cache.
+    "cache_size": os.environ.get("SQLITE_CACHE_SIZE", "-65536"),
+    "mmap_size": os.environ.get("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)),
+    "busy_timeout": os.environ.get("SQLITE_BUSY_TIMEOUT_MS", "5000"),
+}
+
+# Connection pool settings for server databases (PostgreSQL, MySQL, ...).
+DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.environ.get("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT_SECONDS = float(os.environ.get("DB_POOL_TIMEOUT_SECONDS", "30"))
+DB_POOL_RECYCLE_SECONDS = int(os.environ.get("DB_POOL_RECYCLE_SECONDS", "1800"))
+DB_POOL_PRE_PING = os.environ.get("DB_POOL_PRE_PING", "true").lower() in {"1", "true", "yes"}
+
+
+def engine_options(database_url: str) -> Dict[str, Any]:
+    options: Dict[str, Any] = {"echo": False, "future": True}
+    if make_url(database_url).get_backend_name() == "sqlite":
+        return options
+    options.update(
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=DB_POOL_PRE_PING,
+    )
+    return options
+
+
+def apply_sqlite_pragmas(dbapi_connection: Any, connection_record: Any) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in SQLITE_PRAGMAS.items():
+            if value:
+                cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+engine = create_async_engine(DATABASE_URL, **engine_options(DATABASE_URL))
+if engine.dialect.name == "sqlite":
+    event.listen(engine.sync_engine, "connect", apply_sqlite_pragmas)
+DEFAULT_SHARD = "default"
+async_session = async_sessionmaker(engine, expire_on_commit=False, info={"shard": DEFAULT_SHARD})
+
+# Optional read replica for list and export endpoints. Its schema is expected
+# to follow the primary's, so startup migrations only run on the primary.
+DATABASE_READ_URL = os.environ.get("DATABASE_READ_URL")
+read_engine = (
+    create_async_engine(DATABASE_READ_URL, **engine_options(DATABASE_READ_URL))
+    if DATABASE_READ_URL
+    else None
+)
+if read_engine is not None and read_engine.dialect.name == "sqlite":
+    event.listen(read_engine.sync_engine, "connect", apply_sqlite_pragmas)
+async_read_session = (
+    async_sessionmaker(read_engine, expire_on_commit=False, info={"shard": DEFAULT_SHARD})
+    if read_engine is not None
+    else async_session
+)
+# How long a session that just wrote keeps reading from the primary, so it
+# sees its own changes while the replica catches up.
+READ_AFTER_WRITE_SECONDS = float(os.environ.get("READ_AFTER_WRITE_SECONDS", "5"))
+SAFE_HTTP_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+def parse_shard_urls(value: str) -> Dict[str, str]:
+    shards: Dict[str, str] = {}
+    for item in value.split(","):
+        name, separator, url = item.strip().partition("=")
+        if not item.strip():
+            continue
+        if not separator or not name.strip() or not url.strip():
+            raise RuntimeError(f"Invalid DATABASE_SHARD_URLS entry: {item.strip()!r}")
+        if name.strip() == DEFAULT_SHARD:
+            raise RuntimeError(f"Shard name {DEFAULT_SHARD!r} is reserved for DATABASE_URL")
+        shards[name.strip()] = url.strip()
+    return shards
+
+
+# Extra databases for project-scoped tables, as comma-separated name=url pairs.
+# Users, projects, access grants and the shard directory always stay on
+# DATABASE_URL, which also serves as the "default" shard for projects that
+# have no directory entry.
+DATABASE_SHARD_URLS = parse_shard_urls(os.environ.get("DATABASE_SHARD_URLS", ""))
+shard_engines: Dict[str, AsyncEngine] = {DEFAULT_SHARD: engine}
+for _shard_name, _shard_url in DATABASE_SHARD_URLS.items():
+    shard_engines[_shard_name] = create_async_engine(_shard_url, **engine_options(_shard_url))
+    if shard_engines[_shard_name].dialect.name == "sqlite":
+        event.listen(shard_engines[_shard_name].sync_engine, "connect", apply_sqlite_pragmas)
+SHARDING_ENABLED = len(shard_engines) > 1
+# How long a project's shard lookup is cached per process. Moves wait this
+# long between steps so every worker sees each change.
+PROJECT_SHARD_CACHE_SECONDS = float(os.environ.get("PROJECT_SHARD_CACHE_SECONDS", "5"))
+# A shard move whose worker has not checked in for this long is resumed by
+# another worker's reaper loop.
+PROJECT_SHARD_MOVE_LEASE_SECONDS = float(
+    os.environ.get("PROJECT_SHARD_MOVE_LEASE_SECONDS", "300")
+)
+# Turn off to apply schema migrations only through ``python server.py migrate``,
+# e.g. as a deploy step ahead of starting several workers.
+SCHEMA_MIGRATIONS_ON_STARTUP = os.environ.get(
+    "SCHEMA_MIGRATIONS_ON_STARTUP", "true"
+).lower() in {"1", "true", "yes"}
+
+SQLITE_BACKUP_DIR = Path(os.environ.get("SQLITE_BACKUP_DIR", str(ROOT_DIR / "backups")))
+SQLITE_BACKUP_INTERVAL_SECONDS = float(os.environ.get("SQLITE_BACKUP_INTERVAL_SECONDS", "86400"))
+SQLITE_BACKUP_RETENTION = max(1, int(os.environ.get("SQLITE_BACKUP_RETENTION", "7")))
+SQLITE_BACKUP_PAGES_PER_STEP = int(os.environ.get("SQLITE_BACKUP_PAGES_PER_STEP", "256"))
+SQLITE_BACKUP_STEP_SLEEP_SECONDS = float(os.environ.get("SQLITE_BACKUP_STEP_SLEEP_SECONDS", "0.01"))
+SQLITE_BACKUP_MAX_RESTARTS = int(os.environ.get("SQLITE_BACKUP_MAX_RESTARTS", "3"))
 
 PASSWORD_HASH_ALGORITHM = "pbkdf2_sha256"
 PASSWORD_HASH_ITERATIONS = int(os.environ.get("PASSWORD_HASH_ITERATIONS", "390000"))
+# Passwords stored in plaintext by old releases, or hashed with other settings,
+# are rehashed on the next successful login. Enable the background task to
+# hash the remaining plaintext rows without waiting for their users to log in.
+PASSWORD_REHASH_IN_BACKGROUND = os.environ.get(
+    "PASSWORD_REHASH_IN_BACKGROUND", "false"
+).lower() in {"1", "true", "yes"}
+PASSWORD_REHASH_CONCURRENCY = max(1, int(os.environ.get("PASSWORD_REHASH_CONCURRENCY", "2")))
+PASSWORD_REHASH_BATCH_SIZE = 100
 
 
 def _b64encode(data: bytes) -> str:
@@ -139,6 +326,13 @@ def verify_password(password: str, stored_hash: str) -> bool:
     return password == stored_hash
 
 
+def password_needs_rehash(stored_hash: str) -> bool:
+    if not is_password_hash(stored_hash):
+        return True
+    _, iterations, _, _ = stored_hash.split("$")
+    return int(iterations) != PASSWORD_HASH_ITERATIONS
+
+
 class Base(DeclarativeBase):
     pass
 
@@ -170,6 +364,10 @@ class ProjectTable(Base, TimestampMixin):
     name: Mapped[str] = mapped_column(String, nullable=False)
     description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     created_by: Mapped[str] = mapped_column(String, nullable=False)
+    # Set when a project is deleted; its rows are purged later by the reaper.
+    deleted_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), index=True, nullable=True
+    )
 
 
 class ProjectLinkedMixin:
@@ -186,7 +384,45 @@ class ProjectAccessTable(Base, TimestampMixin):
     project_id: Mapped[str] = mapped_column(String, index=True, nullable=False)
     visible: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
 
-    __table_args__ = (UniqueConstraint("user_id", "project_id", name="uq_project_access"),)
+    __table_args__ = (
+        UniqueConstraint("user_id", "project_id", name="uq_project_access"),
+        Index("ix_project_access_user_visible", "user_id", "visible"),
+    )
+
+
+class ProjectShardTable(Base, TimestampMixin):
+    __tablename__ = "project_shards"
+
+    project_id: Mapped[str] = mapped_column(String, primary_key=True)
+    shard: Mapped[str] = mapped_column(String, index=True, nullable=False)
+    # Set while the project is copied to another shard; writes are refused.
+    moving: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    # Progress of a shard move, kept so another worker can resume it:
+    # "copying", then "switched" until the source rows are purged.
+    move_state: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    move_source: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    move_target: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    # Refreshed by the worker running the move; a stale value frees the move.
+    move_heartbeat_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    move_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+
+class SchemaMigrationTable(Base):
+    __tablename__ = "schema_migrations"
+
+    # Kept in every database (primary and shards) to record what ran there.
+    version: Mapped[int] = mapped_column(Integer, primary_key=True)
+    name: Mapped[str] = mapped_column(String, nullable=False)
+    applied_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+
+class SchemaStateTable(Base):
+    __tablename__ = "schema_state"
+
+    key: Mapped[str] = mapped_column(String, primary_key=True)
+    value: Mapped[str] = mapped_column(String, nullable=False)
 
 
 class RevisionHistoryTable(Base, ProjectLinkedMixin):
@@ -231,7 +467,40 @@ class SingleEntryFieldTable(Base, ProjectLinkedMixin):
     )
     field_name: Mapped[str] = mapped_column(String, nullable=False)
     content: Mapped[str] = mapped_column(Text, nullable=False)
-    image_data: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    image_id: Mapped[Optional[str]] = mapped_column(String, index=True, nullable=True)
+    # Base64 data URLs written before images moved to ``image_blobs``; emptied
+    # by ``migrate_single_entry_images`` and never loaded implicitly.
+    legacy_image_data: Mapped[Optional[str]] = mapped_column(
+        "image_data", Text, nullable=True, deferred=True
+    )
+
+    __table_args__ = (
+        Index("uq_single_entry_field", "project_id", "field_name", unique=True),
+    )
+
+
+class ImageBlobTable(Base, TimestampMixin):
+    __tablename__ = "image_blobs"
+
+    # Content address: hex SHA-256 of ``data``, so identical uploads share a row.
+    id: Mapped[str] = mapped_column(String, primary_key=True)
+    content_type: Mapped[str] = mapped_column(String, nullable=False)
+    size: Mapped[int] = mapped_column(Integer, nullable=False)
+    width: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    height: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    data: Mapped[bytes] = mapped_column(LargeBinary, nullable=False, deferred=True)
+
+
+class ImageRenditionTable(Base, TimestampMixin):
+    __tablename__ = "image_renditions"
+
+    image_id: Mapped[str] = mapped_column(String, primary_key=True)
+    kind: Mapped[str] = mapped_column(String, primary_key=True)
+    content_type: Mapped[str] = mapped_column(String, nullable=False)
+    size: Mapped[int] = mapped_column(Integer, nullable=False)
+    width: Mapped[int] = mapped_column(Integer, nullable=False)
+    height: Mapped[int] = mapped_column(Integer, nullable=False)
+    data: Mapped[bytes] = mapped_column(LargeBinary, nullable=False, deferred=True)
 
 
 class ProjectDetailsTable(Base, ProjectLinkedMixin):
@@ -323,6 +592,8 @@ class MilestoneColumnTable(Base, ProjectLinkedMixin):
     column_name: Mapped[str] = mapped_column(String, nullable=False)
     order: Mapped[int] = mapped_column(Integer, nullable=False)
 
+    __table_args__ = (Index("ix_milestone_columns_project_order", "project_id", "order"),)
+
 
 class SamDeliverableTable(Base, ProjectLinkedMixin):
     __tablename__ = "sam_deliverables"
@@ -347,6 +618,47 @@ class SamMilestoneColumnTable(Base, ProjectLinkedMixin):
     column_name: Mapped[str] = mapped_column(String, nullable=False)
     order: Mapped[int] = mapped_column(Integer, nullable=False)
 
+    __table_args__ = (Index("ix_sam_milestone_columns_project_order", "project_id", "order"),)
+
+
+class ProjectTableVersionTable(Base, ProjectLinkedMixin):
+    __tablename__ = "project_table_versions"
+
+    id: Mapped[str] = mapped_column(
+        String, primary_key=True, default=lambda: str(uuid.uuid4())
+    )
+    table_name: Mapped[str] = mapped_column(String, nullable=False)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        UniqueConstraint("project_id", "table_name", name="uq_project_table_version"),
+    )
+
+
+# Where rows of the generic section tables (SECTION_TABLE_DEFINITIONS) live:
+# "tables" gives each definition its own table, "document" keeps all of them
+# in ``section_rows`` with the column values in a JSON document. Switch with
+# ``python server.py convert-section-storage`` while the app is stopped.
+SECTION_TABLE_STORAGE = os.environ.get("SECTION_TABLE_STORAGE", "tables")
+if SECTION_TABLE_STORAGE not in {"tables", "document"}:
+    raise RuntimeError(f"Invalid SECTION_TABLE_STORAGE: {SECTION_TABLE_STORAGE!r}")
+SECTION_DOCUMENT_STORAGE = SECTION_TABLE_STORAGE == "document"
+
+
+class SectionRowTable(Base, ProjectLinkedMixin):
+    __tablename__ = "section_rows"
+
+    id: Mapped[str] = mapped_column(
+        String, primary_key=True, default=lambda: str(uuid.uuid4())
+    )
+    section: Mapped[str] = mapped_column(String, nullable=False)
+    table_name: Mapped[str] = mapped_column(String, nullable=False)
+    data: Mapped[Dict[str, Any]] = mapped_column(JSON, nullable=False, default=dict)
+
+    __table_args__ = (
+        Index("ix_section_rows_project_table", "project_id", "section", "table_name"),
+    )
+
 
 @dataclass(frozen=True)
 class ColumnDefinition:
@@ -398,6 +710,9 @@ def col(name: str, type_: Any = Text, nullable: bool = True) -> ColumnDefinition
 class SectionTableMeta:
     model: Type[ProjectLinkedMixin]
     columns: Sequence[str]
+    section: str
+    table_name: str
+    required_columns: Sequence[str]
 
 
 SECTION_TABLE_DEFINITIONS: Sequence[SectionTableDefinition] = [
@@ -1041,6 +1356,11 @@ for section_definition in SECTION_TABLE_DEFINITIONS:
         SectionTableMeta(
             model=model_cls,
             columns=[column.name for column in section_definition.columns],
+            section=section_definition.section,
+            table_name=model_cls.__tablename__,
+            required_columns=[
+                column.name for column in section_definition.columns if not column.nullable
+            ],
         )
     )
 
@@ -1079,15 +1399,111 @@ def format_cell_value(value: Any) -> Any:
     return value
 
 
-def decode_image_for_workbook(image_data: str) -> Optional[Tuple[XLImage, BytesIO]]:
+IMAGE_SIGNATURES: Sequence[Tuple[bytes, str]] = (
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+    (b"BM", "image/bmp"),
+)
+
+
+def sniff_image_content_type(header: bytes) -> Optional[str]:
+    for signature, content_type in IMAGE_SIGNATURES:
+        if header.startswith(signature):
+            return content_type
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        return "image/webp"
+    return None
+
+
+def parse_image_data_url(image_data: str) -> Optional[Tuple[bytes, str]]:
     if not image_data:
         return None
+    header, _, base64_data = image_data.rpartition(",")
     try:
-        base64_data = image_data.split(",", 1)[1] if "," in image_data else image_data
         binary = base64.b64decode(base64_data)
     except Exception:
         return None
 
+    content_type = sniff_image_content_type(binary[:16])
+    if content_type is None and header.startswith("data:image/"):
+        content_type = header[5:].split(";", 1)[0]
+    if content_type is None or not binary:
+        return None
+    return binary, content_type
+
+
+def read_image_dimensions(binary: bytes) -> Tuple[Optional[int], Optional[int]]:
+    from PIL import Image as PILImage
+
+    try:
+        with PILImage.open(BytesIO(binary)) as image:
+            width, height = image.size
+    except Exception:
+        return None, None
+    return width, height
+
+
+MAX_IMAGE_UPLOAD_BYTES = int(os.environ.get("MAX_IMAGE_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+EXPORT_IMAGE_MAX_SIZE = (480, 320)
+RENDITION_SIZES: Dict[str, Tuple[int, int]] = {
+    "export": EXPORT_IMAGE_MAX_SIZE,
+    "thumbnail": (160, 120),
+}
+
+
+@dataclass(frozen=True)
+class RenderedImage:
+    kind: str
+    content_type: str
+    width: int
+    height: int
+    data: bytes
+
+
+def render_image_renditions(binary: bytes) -> List[RenderedImage]:
+    """Produce the downscaled renditions of an image; CPU-bound, run off-loop."""
+    from PIL import Image as PILImage
+
+    renditions: List[RenderedImage] = []
+    with PILImage.open(BytesIO(binary)) as source:
+        source.load()
+        keep_jpeg = source.format == "JPEG"
+        for kind, max_size in RENDITION_SIZES.items():
+            image = source.copy()
+            image.thumbnail(max_size)
+            output = BytesIO()
+            if keep_jpeg:
+                image.convert("RGB").save(output, format="JPEG", quality=85, optimize=True)
+                content_type = "image/jpeg"
+            else:
+                if image.mode not in ("RGB", "RGBA", "L", "LA", "P"):
+                    image = image.convert("RGBA")
+                image.save(output, format="PNG", optimize=True)
+                content_type = "image/png"
+            renditions.append(
+                RenderedImage(
+                    kind=kind,
+                    content_type=content_type,
+                    width=image.width,
+                    height=image.height,
+                    data=output.getvalue(),
+                )
+            )
+    return renditions
+
+
+def decode_image_for_workbook(
+    binary: bytes, width: Optional[int] = None, height: Optional[int] = None
+) -> Optional[Tuple[XLImage, BytesIO]]:
+    from openpyxl.drawing.image import Image as XLImage
+
+    if not binary:
+        return None
+
     buffer = BytesIO(binary)
     buffer.seek(0)
     try:
@@ -1095,19 +1511,17 @@ def decode_image_for_workbook(image_data: str) -> Optional[Tuple[XLImage, BytesI
     except Exception:
         return None
 
-    max_width = 480
-    max_height = 320
-    width = getattr(image, "width", None)
-    height = getattr(image, "height", None)
+    max_width, max_height = EXPORT_IMAGE_MAX_SIZE
+    width = width or getattr(image, "width", None)
+    height = height or getattr(image, "height", None)
     if width and height:
         scale = min(
             1.0,
             max_width / float(width) if width else 1.0,
             max_height / float(height) if height else 1.0,
         )
-        if scale < 1.0:
-            image.width = int(width * scale)
-            image.height = int(height * scale)
+        image.width = int(width * scale)
+        image.height = int(height * scale)
 
     return image, buffer
 
@@ -1128,6 +1542,414 @@ EXPORT_STATIC_TABLES: Sequence[Tuple[str, Type[ProjectLinkedMixin]]] = [
 ]
 
 
+TYPED_TABLE_SECTIONS: Dict[str, str] = {
+    RevisionHistoryTable.__tablename__: "M1",
+    TOCEntryTable.__tablename__: "M2",
+    DefinitionAcronymTable.__tablename__: "M3",
+    ProjectDetailsTable.__tablename__: "M4",
+    AssumptionTable.__tablename__: "M4",
+    ConstraintTable.__tablename__: "M4",
+    DependencyTable.__tablename__: "M4",
+    StakeholderTable.__tablename__: "M4",
+    DeliverableTable.__tablename__: "M12",
+    MilestoneColumnTable.__tablename__: "M12",
+    SamDeliverableTable.__tablename__: "M13",
+    SamMilestoneColumnTable.__tablename__: "M13",
+}
+
+SINGLE_ENTRY_FIELD_SECTIONS: Dict[str, str] = {
+    "reference_to_pif": "M3",
+    "reference_to_other_documents": "M3",
+    "plan_for_other_resources": "M3",
+    "reference_to_pis": "M4",
+    "product_overview": "M4",
+    "life_cycle_model": "M4",
+    "cyber_security_requirements_design_model": "M4",
+    "cybersecurity_case": "M4",
+    "functional_safety_plan": "M4",
+    "organization_structure": "M5",
+    "summary_estimates_assumptions": "M5",
+    "transition_plan": "M6",
+    "supplier_evaluation_capability": "M7",
+    "cyber_security_assessment_and_release": "M7",
+    "configuration_management_tools": "M11",
+    "location_of_ci": "M11",
+    "versioning": "M11",
+    "baselining": "M11",
+    "change_management_plan": "M11",
+    "backup_and_retrieval": "M11",
+    "recovery": "M11",
+    "release_mechanism": "M11",
+    "information_retention_plan": "M11",
+    "supplier_project_introduction_and_scope": "M13",
+    "support_project_plan": "M13",
+    "supplier_configuration_management_plan": "M13",
+    "sam_location_of_ci": "M13",
+    "sam_versioning": "M13",
+    "sam_baselining": "M13",
+    "sam_change_management_plan": "M13",
+    "sam_configuration_management_audit": "M13",
+    "sam_backup": "M13",
+    "sam_release_mechanism": "M13",
+    "sam_information_retention_plan": "M13",
+}
+
+KNOWN_SECTIONS: Set[str] = (
+    set(TYPED_TABLE_SECTIONS.values())
+    | set(SINGLE_ENTRY_FIELD_SECTIONS.values())
+    | {section for section, _ in SECTION_TABLE_REGISTRY}
+)
+KNOWN_EXPORT_TABLES: Set[str] = (
+    set(TYPED_TABLE_SECTIONS)
+    | {SingleEntryFieldTable.__tablename__}
+    | {table_name for _, table_name in SECTION_TABLE_REGISTRY}
+)
+
+
+@dataclass(frozen=True)
+class ExportSelection:
+    sections: Optional[Set[str]] = None
+    tables: Optional[Set[str]] = None
+
+    @property
+    def is_full(self) -> bool:
+        return self.sections is None and self.tables is None
+
+    def includes(self, section: Optional[str], table_name: str) -> bool:
+        if self.is_full:
+            return True
+        if self.tables is not None and table_name in self.tables:
+            return True
+        return self.sections is not None and section in self.sections
+
+    def single_entry_fields(self) -> Optional[List[str]]:
+        """Return the field names to export, or ``None`` for every field."""
+        if self.includes(None, SingleEntryFieldTable.__tablename__):
+            return None
+        return [
+            field_name
+            for field_name, section in SINGLE_ENTRY_FIELD_SECTIONS.items()
+            if self.includes(section, SingleEntryFieldTable.__tablename__)
+        ]
+
+
+def _split_csv_param(value: Optional[str]) -> Optional[Set[str]]:
+    if value is None:
+        return None
+    items = {item.strip() for item in value.split(",") if item.strip()}
+    return items or None
+
+
+def parse_export_selection(
+    sections: Optional[str] = None, tables: Optional[str] = None
+) -> ExportSelection:
+    section_set = _split_csv_param(sections)
+    table_set = _split_csv_param(tables)
+    unknown_sections = (section_set or set()) - KNOWN_SECTIONS
+    if unknown_sections:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown sections: {', '.join(sorted(unknown_sections))}",
+        )
+    unknown_tables = (table_set or set()) - KNOWN_EXPORT_TABLES
+    if unknown_tables:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown tables: {', '.join(sorted(unknown_tables))}",
+        )
+    return ExportSelection(sections=section_set, tables=table_set)
+
+
+@dataclass(frozen=True)
+class ImportTarget:
+    model: Type[ProjectLinkedMixin]
+    columns: Sequence[str]
+    section_meta: Optional[SectionTableMeta] = None
+
+
+IMPORT_FIXED_SHEETS = {"Project Summary", "Single Entries"}
+
+
+def build_import_targets() -> Dict[str, List[ImportTarget]]:
+    """Group the tables an export can contain by their unsuffixed sheet title.
+
+    Truncated titles can collide, and the export then numbers them ``_1``,
+    ``_2``... in the order of the sheets it actually writes. A title therefore
+    only identifies a table within one workbook; see ``resolve_import_targets``.
+    """
+    targets: Dict[str, List[ImportTarget]] = {}
+    for sheet_title, model in EXPORT_STATIC_TABLES:
+        columns = [
+            column.name
+            for column in model.__table__.columns
+            if column.name not in EXPORT_COLUMN_EXCLUDES
+        ]
+        targets.setdefault(make_sheet_title(sheet_title, set()), []).append(
+            ImportTarget(model, columns)
+        )
+    for (section, table_name), meta in SECTION_TABLE_REGISTRY.items():
+        base_title = f"{section} {table_name.replace('_', ' ').title()}"
+        targets.setdefault(make_sheet_title(base_title, set()), []).append(
+            ImportTarget(meta.model, meta.columns, meta)
+        )
+    return targets
+
+
+IMPORT_SHEET_TARGETS: Dict[str, List[ImportTarget]] = build_import_targets()
+
+
+def _import_title_candidates(title: str) -> List[ImportTarget]:
+    candidates = list(IMPORT_SHEET_TARGETS.get(title, ()))
+    base, separator, counter = title.rpartition("_")
+    if separator and counter.isdigit():
+        prefix_length = MAX_SHEET_TITLE_LENGTH - len(counter) - 1
+        for stem, targets in IMPORT_SHEET_TARGETS.items():
+            if stem[:prefix_length] == base:
+                candidates.extend(targets)
+    unique: Dict[Any, ImportTarget] = {}
+    for target in candidates:
+        unique.setdefault(target.model, target)
+    return list(unique.values())
+
+
+def resolve_import_targets(worksheets: Sequence[Any]) -> Dict[str, Union[ImportTarget, str]]:
+    """Match each table sheet of a workbook to one table, or to an error message.
+
+    Only the sheets present are considered. When several tables share a
+    truncated title, only tables having every column of the header row remain;
+    a sheet that still fits more than one table, or a second sheet for the
+    same table, is rejected. Reads header rows, so run it in a worker thread.
+    """
+    resolved: Dict[str, Union[ImportTarget, str]] = {}
+    claimed: Dict[Any, str] = {}
+    for worksheet in worksheets:
+        title = worksheet.title
+        if title in IMPORT_FIXED_SHEETS:
+            continue
+        candidates = _import_title_candidates(title)
+        if len(candidates) > 1:
+            header_row = next(worksheet.iter_rows(max_row=1, values_only=True), ())
+            headers = {str(value).strip() for value in header_row if value is not None}
+            candidates = [
+                target
+                for target in candidates
+                if headers <= {friendly_header(column) for column in target.columns}
+            ]
+        if not candidates:
+            resolved[title] = "Sheet does not match any table"
+        elif len(candidates) > 1:
+            resolved[title] = "Sheet title matches more than one table"
+        elif candidates[0].model in claimed:
+            resolved[title] = f"Sheet maps to the same table as {claimed[candidates[0].model]!r}"
+        else:
+            resolved[title] = candidates[0]
+            claimed[candidates[0].model] = title
+    return resolved
+
+
+IMPORT_BATCH_SIZE = int(os.environ.get("IMPORT_BATCH_SIZE", "500"))
+IMPORT_MAX_REPORTED_ERRORS = 50
+
+
+def coerce_import_value(column: Any, value: Any) -> Any:
+    if value is None or (isinstance(value, str) and not value.strip()):
+        if not column.nullable:
+            raise ValueError(f"{friendly_header(column.name)} is required")
+        return None
+    if isinstance(column.type, Integer):
+        return int(value)
+    if isinstance(column.type, JSON):
+        return json.loads(value) if isinstance(value, str) else value
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+EXPORT_MAX_WORKERS = max(1, int(os.environ.get("EXPORT_MAX_WORKERS", str(os.cpu_count() or 1))))
+
+EXPORT_FRAGMENT_CACHE_SIZE = int(os.environ.get("EXPORT_FRAGMENT_CACHE_SIZE", "2048"))
+# Single-entry fragments carry image bytes, so the cache is bounded by size too.
+EXPORT_FRAGMENT_CACHE_MAX_BYTES = int(
+    os.environ.get("EXPORT_FRAGMENT_CACHE_MAX_BYTES", str(64 * 1024 * 1024))
+)
+
+RAW_EXPORT_FORMATS: Dict[str, str] = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+RAW_EXPORT_CHUNK_ROWS = int(os.environ.get("RAW_EXPORT_CHUNK_ROWS", "1000"))
+
+# URL slugs of the typed table routes, e.g. /projects/{id}/assumptions.
+TYPED_TABLE_SLUGS: Dict[str, Type[ProjectLinkedMixin]] = {
+    "project-details": ProjectDetailsTable,
+    "revision-history": RevisionHistoryTable,
+    "toc-entries": TOCEntryTable,
+    "definition-acronyms": DefinitionAcronymTable,
+    "assumptions": AssumptionTable,
+    "constraints": ConstraintTable,
+    "dependencies": DependencyTable,
+    "stakeholders": StakeholderTable,
+    "deliverables": DeliverableTable,
+    "milestone-columns": MilestoneColumnTable,
+    "sam-deliverables": SamDeliverableTable,
+    "sam-milestone-columns": SamMilestoneColumnTable,
+}
+
+_export_executor: Optional[ProcessPoolExecutor] = None
+# Rendered sheet fragments keyed by (project_id, table_name, variant) and tagged
+# with the table content version they were built from and their approximate size.
+_export_fragment_cache: "OrderedDict[Tuple[str, str, Any], Tuple[int, Any, int]]" = OrderedDict()
+_export_fragment_cache_bytes = 0
+
+
+@dataclass
+class ExportSheet:
+    title: str
+    columns: List[str]
+    rows: List[List[Any]]
+
+
+@dataclass
+class ExportSingleEntry:
+    field_name: str
+    content: str
+    image: Optional[bytes] = None
+    image_width: Optional[int] = None
+    image_height: Optional[int] = None
+
+
+@dataclass
+class ProjectExportData:
+    filename: str
+    summary_rows: List[Tuple[str, Any]]
+    single_entries: List[ExportSingleEntry]
+    sheets: List[ExportSheet]
+
+
+def export_filename(project: ProjectTable) -> str:
+    safe_name = "".join(
+        char if char.isalnum() else "_" for char in (project.name or project.id)
+    ).strip("_")
+    return f"{safe_name or project.id}.xlsx"
+
+
+def export_fragment_size(fragment: Any) -> int:
+    """Approximate memory held by a cached fragment, dominated by cell text and images."""
+    size = 0
+    for item in fragment:
+        if isinstance(item, ExportSingleEntry):
+            size += len(item.content or "") + len(item.image or b"")
+        elif isinstance(item, ExportSheet):
+            size += sum(len(str(value)) for row in item.rows for value in row)
+    return size
+
+
+def get_cached_export_fragment(key: Tuple[str, str, Any], version: int) -> Optional[Any]:
+    cached = _export_fragment_cache.get(key)
+    if cached is None or cached[0] != version:
+        return None
+    _export_fragment_cache.move_to_end(key)
+    return cached[1]
+
+
+def _drop_export_fragment(key: Tuple[str, str, Any]) -> None:
+    global _export_fragment_cache_bytes
+    cached = _export_fragment_cache.pop(key, None)
+    if cached is not None:
+        _export_fragment_cache_bytes -= cached[2]
+
+
+def store_export_fragment(key: Tuple[str, str, Any], version: int, fragment: Any) -> None:
+    global _export_fragment_cache_bytes
+    _drop_export_fragment(key)
+    size = export_fragment_size(fragment)
+    if size > EXPORT_FRAGMENT_CACHE_MAX_BYTES:
+        return
+    _export_fragment_cache[key] = (version, fragment, size)
+    _export_fragment_cache_bytes += size
+    while (
+        len(_export_fragment_cache) > EXPORT_FRAGMENT_CACHE_SIZE
+        or _export_fragment_cache_bytes > EXPORT_FRAGMENT_CACHE_MAX_BYTES
+    ):
+        _drop_export_fragment(next(iter(_export_fragment_cache)))
+
+
+def evict_project_export_fragments(project_id: str) -> None:
+    for key in [key for key in _export_fragment_cache if key[0] == project_id]:
+        _drop_export_fragment(key)
+
+
+def render_project_workbook(export_data: ProjectExportData) -> bytes:
+    # Pure function of the collected data so it can run in a worker process.
+    from openpyxl import Workbook
+    from openpyxl.utils import get_column_letter
+
+    workbook = Workbook()
+    used_titles: Set[str] = set()
+    retained_image_streams: List[BytesIO] = []
+
+    summary_sheet = workbook.active
+    summary_sheet.title = make_sheet_title("Project Summary", used_titles)
+    summary_sheet.column_dimensions["A"].width = 20
+    summary_sheet.column_dimensions["B"].width = 80
+
+    for label, value in export_data.summary_rows:
+        summary_sheet.append([label, value])
+
+    if export_data.single_entries:
+        single_sheet = workbook.create_sheet(
+            title=make_sheet_title("Single Entries", used_titles)
+        )
+        single_sheet.append(["Field Name", "Content", "Image"])
+        single_sheet.column_dimensions["A"].width = 32
+        single_sheet.column_dimensions["B"].width = 80
+        single_sheet.column_dimensions["C"].width = 50
+
+        row_index = 2
+        for entry in export_data.single_entries:
+            single_sheet.cell(row=row_index, column=1, value=entry.field_name)
+            single_sheet.cell(row=row_index, column=2, value=entry.content)
+            if entry.image:
+                decoded = decode_image_for_workbook(
+                    entry.image, entry.image_width, entry.image_height
+                )
+                if decoded is not None:
+                    image, buffer = decoded
+                    single_sheet.add_image(image, f"C{row_index}")
+                    retained_image_streams.append(buffer)
+                    if getattr(image, "height", None):
+                        single_sheet.row_dimensions[row_index].height = max(
+                            single_sheet.row_dimensions[row_index].height or 15,
+                            image.height * 0.75,
+                        )
+                else:
+                    single_sheet.cell(
+                        row=row_index,
+                        column=3,
+                        value="Image unavailable",
+                    )
+            row_index += 1
+
+    for export_sheet in export_data.sheets:
+        sheet = workbook.create_sheet(
+            title=make_sheet_title(export_sheet.title, used_titles)
+        )
+        sheet.append([friendly_header(column) for column in export_sheet.columns])
+
+        for idx, _ in enumerate(export_sheet.columns, start=1):
+            sheet.column_dimensions[get_column_letter(idx)].width = 24
+
+        for row in export_sheet.rows:
+            sheet.append(row)
+
+    output = BytesIO()
+    workbook.save(output)
+    return output.getvalue()
+
+
 TABLES_TO_PURGE: List[Type[ProjectLinkedMixin]] = [
     RevisionHistoryTable,
     TOCEntryTable,
@@ -1142,11 +1964,44 @@ TABLES_TO_PURGE: List[Type[ProjectLinkedMixin]] = [
     MilestoneColumnTable,
     SamDeliverableTable,
     SamMilestoneColumnTable,
+    ProjectTableVersionTable,
 ]
 
-TABLES_TO_PURGE.extend(
+SECTION_TABLE_MODELS: List[Type[ProjectLinkedMixin]] = [
     meta.model for meta in SECTION_TABLE_REGISTRY.values()
+]
+# Only the active layout's tables are created and purged; the other one stays
+# mapped so ``convert-section-storage`` can read it.
+TABLES_TO_PURGE.extend([SectionRowTable] if SECTION_DOCUMENT_STORAGE else SECTION_TABLE_MODELS)
+INACTIVE_SECTION_TABLES: List[Type[ProjectLinkedMixin]] = (
+    SECTION_TABLE_MODELS if SECTION_DOCUMENT_STORAGE else [SectionRowTable]
 )
+SECTION_TABLES_BY_NAME: Dict[str, SectionTableMeta] = {
+    meta.table_name: meta for meta in SECTION_TABLE_REGISTRY.values()
+}
+
+# Tables that always live on DATABASE_URL; everything else follows its project
+# to the project's shard.
+GLOBAL_TABLES: List[Type[Base]] = [UserTable, ProjectTable, ProjectAccessTable, ProjectShardTable]
+SHARDED_TABLES: List[Type[Base]] = [*TABLES_TO_PURGE, ImageBlobTable, ImageRenditionTable]
+
+
+def _shard_sessionmaker(
+    global_engine: AsyncEngine, shard_engine: AsyncEngine, shard: str
+) -> async_sessionmaker:
+    binds: Dict[Any, AsyncEngine] = {table: global_engine for table in GLOBAL_TABLES}
+    binds.update({table: shard_engine for table in SHARDED_TABLES})
+    return async_sessionmaker(binds=binds, expire_on_commit=False, info={"shard": shard})
+
+
+SHARD_SESSIONMAKERS: Dict[str, async_sessionmaker] = {DEFAULT_SHARD: async_session}
+SHARD_READ_SESSIONMAKERS: Dict[str, async_sessionmaker] = {DEFAULT_SHARD: async_read_session}
+for _shard_name, _shard_engine in shard_engines.items():
+    if _shard_name != DEFAULT_SHARD:
+        SHARD_SESSIONMAKERS[_shard_name] = _shard_sessionmaker(engine, _shard_engine, _shard_name)
+        SHARD_READ_SESSIONMAKERS[_shard_name] = _shard_sessionmaker(
+            read_engine or engine, _shard_engine, _shard_name
+        )
 
 
 def resolve_section_table(section: str, table_name: str) -> SectionTableMeta:
@@ -1156,10 +2011,90 @@ def resolve_section_table(section: str, table_name: str) -> SectionTableMeta:
         raise HTTPException(status_code=404, detail="Table not found") from exc
 
 
+def section_row_model(meta: SectionTableMeta) -> Type[ProjectLinkedMixin]:
+    return SectionRowTable if SECTION_DOCUMENT_STORAGE else meta.model
+
+
+def section_rows_filter(meta: SectionTableMeta, project_id: str) -> Any:
+    if SECTION_DOCUMENT_STORAGE:
+        return (
+            (SectionRowTable.project_id == project_id)
+            & (SectionRowTable.section == meta.section)
+            & (SectionRowTable.table_name == meta.table_name)
+        )
+    return meta.model.project_id == project_id
+
+
+def section_row_values(meta: SectionTableMeta, row: Any) -> Dict[str, Any]:
+    if SECTION_DOCUMENT_STORAGE:
+        return {column: row.data.get(column) for column in meta.columns}
+    return {column: getattr(row, column) for column in meta.columns}
+
+
+def section_row_data(meta: SectionTableMeta, data: Dict[str, Any]) -> Dict[str, Any]:
+    """Validated column values for a section row, in either storage layout.
+
+    Every generic column is text, so values are typed the way SQLite's text
+    affinity stores them and missing required values are rejected.
+    """
+    document: Dict[str, Any] = {}
+    for column in meta.columns:
+        value = data.get(column)
+        if isinstance(value, bool):
+            value = str(int(value))
+        elif isinstance(value, (int, float)):
+            value = str(value)
+        elif value is not None and not isinstance(value, str):
+            raise HTTPException(
+                status_code=400, detail=f"{friendly_header(column)} must be text"
+            )
+        if value is None and column in meta.required_columns:
+            raise HTTPException(
+                status_code=400, detail=f"{friendly_header(column)} is required"
+            )
+        document[column] = value
+    return document
+
+
+def new_section_row(
+    meta: SectionTableMeta, project_id: str, data: Dict[str, Any]
+) -> ProjectLinkedMixin:
+    if SECTION_DOCUMENT_STORAGE:
+        return SectionRowTable(
+            project_id=project_id,
+            section=meta.section,
+            table_name=meta.table_name,
+            data=section_row_data(meta, data),
+        )
+    return meta.model(project_id=project_id, **section_row_data(meta, data))
+
+
+def assign_section_row(meta: SectionTableMeta, row: Any, data: Dict[str, Any]) -> None:
+    values = section_row_data(meta, data)
+    if SECTION_DOCUMENT_STORAGE:
+        row.data = values
+        return
+    for column, value in values.items():
+        setattr(row, column, value)
+
+
+async def get_section_row_or_404(
+    session: AsyncSession, meta: SectionTableMeta, item_id: str, project_id: str
+) -> Any:
+    model = section_row_model(meta)
+    result = await session.execute(
+        select(model).where(model.id == item_id, section_rows_filter(meta, project_id))
+    )
+    row = result.scalar_one_or_none()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Item not found")
+    return row
+
+
 def serialize_section_row(
     section: str, table_name: str, meta: SectionTableMeta, row: Any
 ) -> GenericTableRow:
-    data = {column: getattr(row, column) for column in meta.columns}
+    data = section_row_values(meta, row)
     return GenericTableRow(
         id=row.id,
         project_id=row.project_id,
@@ -1317,6 +2252,12 @@ class ProjectCreate(BaseModel):
     description: Optional[str] = None
 
 
+class ProjectCloneRequest(BaseModel):
+    name: Optional[str] = None
+    description: Optional[str] = None
+    sections: Optional[List[str]] = None
+
+
 class ProjectAccess(BaseModel):
     model_config = ConfigDict(extra="ignore", from_attributes=True)
 
@@ -1387,7 +2328,12 @@ class SingleEntryField(BaseModel):
     project_id: str
     field_name: str
     content: str
-    image_data: Optional[str] = None
+    image_url: Optional[str] = None
+    image_width: Optional[int] = None
+    image_height: Optional[int] = None
+    thumbnail_url: Optional[str] = None
+    thumbnail_width: Optional[int] = None
+    thumbnail_height: Optional[int] = None
 
 
 class SingleEntryFieldCreate(BaseModel):
@@ -1533,6 +2479,67 @@ class MilestoneColumnCreate(BaseModel):
     column_name: str
 
 
+class BulkExportRequest(BaseModel):
+    project_ids: List[str] = Field(default_factory=list)
+    all_visible: bool = False
+    sections: Optional[str] = None
+    tables: Optional[str] = None
+
+
+class ImportSheetReport(BaseModel):
+    sheet: str
+    table: Optional[str] = None
+    rows: int = 0
+    imported: int = 0
+    ignored_columns: List[str] = Field(default_factory=list)
+    errors: List[str] = Field(default_factory=list)
+
+
+class ImportReport(BaseModel):
+    dry_run: bool
+    valid: bool
+    sheets: List[ImportSheetReport] = Field(default_factory=list)
+
+
+class ShardInfo(BaseModel):
+    name: str
+    projects: int
+
+
+class ProjectShardMove(BaseModel):
+    shard: str
+
+
+class ProjectShardMoveStatus(BaseModel):
+    project_id: str
+    shard: str
+    moving: bool = False
+    state: Optional[str] = None
+    source_shard: Optional[str] = None
+    target_shard: Optional[str] = None
+    error: Optional[str] = None
+
+
+class SqliteBackupFile(BaseModel):
+    name: str
+    size: int
+    created_at: datetime
+
+
+class SqliteBackupStatus(BaseModel):
+    enabled: bool
+    running: bool
+    interval_seconds: float
+    retention: int
+    last_started_at: Optional[datetime] = None
+    last_finished_at: Optional[datetime] = None
+    last_duration_seconds: Optional[float] = None
+    last_size_bytes: Optional[int] = None
+    last_files: List[str] = Field(default_factory=list)
+    last_error: Optional[str] = None
+    backups: List[SqliteBackupFile] = Field(default_factory=list)
+
+
 class GenericTableRow(BaseModel):
     model_config = ConfigDict(extra="ignore", from_attributes=True)
 
@@ -1547,15 +2554,28 @@ class GenericTableRowCreate(BaseModel):
     data: Dict[str, Any]
 
 
-class SamDeliverable(BaseModel):
-    model_config = ConfigDict(extra="ignore", from_attributes=True)
+class ColumnarRows(BaseModel):
+    """A list sent with ``format=columnar``: the column names once, then rows as arrays."""
 
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     project_id: str
-    sl_no: str
-    work_product: str
-    owner_of_deliverable: str
-    approving_authority: str
+    columns: List[str]
+    rows: List[List[Any]]
+
+
+class ColumnarTableRows(ColumnarRows):
+    section: str
+    table_name: str
+
+
+class SamDeliverable(BaseModel):
+    model_config = ConfigDict(extra="ignore", from_attributes=True)
+
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    project_id: str
+    sl_no: str
+    work_product: str
+    owner_of_deliverable: str
+    approving_authority: str
     release_to_tsbj: str
     milestones: Dict[str, str] = Field(default_factory=dict)
 
@@ -1591,6 +2611,28 @@ TableType = TypeVar("TableType", bound=ProjectLinkedMixin)
 
 
 
+_background_tasks: Set[asyncio.Task] = set()
+
+
+def spawn_background_task(coro: Any) -> asyncio.Task:
+    """Run a coroutine detached from the request, keeping a strong reference."""
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
+
+def cancel_requested() -> bool:
+    """Whether the running task was cancelled, even if a driver swallowed it.
+
+    A cancellation that lands inside a database call can surface as a driver
+    error instead of ``CancelledError``; loops check this before retrying.
+    """
+    task = asyncio.current_task()
+    cancelling = getattr(task, "cancelling", None)  # Python 3.11+
+    return bool(cancelling and cancelling())
+
+
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + (
@@ -1600,11 +2642,113 @@ def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta]
     return PyJWT.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 
-async def get_session() -> AsyncGenerator[AsyncSession, None]:
+_project_shard_cache: Dict[str, Tuple[float, str, bool]] = {}
+
+
+def session_shard(session: AsyncSession) -> str:
+    return session.info.get("shard", DEFAULT_SHARD)
+
+
+def shard_dialect_name(session: AsyncSession) -> str:
+    # Any project-scoped table resolves to the session's shard.
+    return session.get_bind(ProjectTableVersionTable).dialect.name
+
+
+async def lookup_project_shard(project_id: str) -> Tuple[str, bool]:
+    """Return ``(shard, moving)`` for a project from the shard directory."""
+    if not SHARDING_ENABLED:
+        return DEFAULT_SHARD, False
+    now = time.monotonic()
+    cached = _project_shard_cache.get(project_id)
+    if cached is not None and cached[0] > now:
+        return cached[1], cached[2]
+
     async with async_session() as session:
+        entry = await session.get(ProjectShardTable, project_id)
+    if entry is not None and entry.shard in shard_engines:
+        shard, moving = entry.shard, entry.moving
+    else:
+        shard, moving = DEFAULT_SHARD, False
+    if PROJECT_SHARD_CACHE_SECONDS > 0:
+        _project_shard_cache[project_id] = (now + PROJECT_SHARD_CACHE_SECONDS, shard, moving)
+    return shard, moving
+
+
+async def project_session_factory(
+    project_id: Optional[str], read: bool = False
+) -> async_sessionmaker:
+    shard = (await lookup_project_shard(project_id))[0] if project_id else DEFAULT_SHARD
+    return (SHARD_READ_SESSIONMAKERS if read else SHARD_SESSIONMAKERS)[shard]
+
+
+async def get_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Session on the primary, routed to the shard of the path's project."""
+    project_id = request.path_params.get("project_id")
+    shard, moving = (
+        await lookup_project_shard(project_id) if project_id else (DEFAULT_SHARD, False)
+    )
+    if moving and request.method not in SAFE_HTTP_METHODS:
+        raise HTTPException(
+            status_code=423, detail="Project is being moved to another shard"
+        )
+    async with SHARD_SESSIONMAKERS[shard]() as session:
         yield session
 
 
+def prefers_primary(request: Request) -> bool:
+    """Whether the caller just wrote and should read its own changes.
+
+    The marker travels with the client rather than living in this process,
+    so it holds whichever worker served the write. A forged or stale value
+    can only send reads to the primary.
+    """
+    try:
+        last_write = float(request.headers.get(LAST_WRITE_HEADER, ""))
+    except ValueError:
+        return False
+    return abs(time.time() - last_write) < READ_AFTER_WRITE_SECONDS
+
+
+async def read_session_factory(request: Request) -> async_sessionmaker:
+    """Pick the replica, or the primary for a session that just wrote."""
+    return await project_session_factory(
+        request.path_params.get("project_id"), read=not prefers_primary(request)
+    )
+
+
+async def get_read_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    async with (await read_session_factory(request))() as session:
+        yield session
+
+
+async def shard_project_counts(session: AsyncSession) -> Dict[str, int]:
+    counts = {name: 0 for name in shard_engines}
+    result = await session.execute(
+        select(ProjectShardTable.shard, func.count()).group_by(ProjectShardTable.shard)
+    )
+    for shard, count in result.all():
+        if shard in counts:
+            counts[shard] += count
+    total = await session.scalar(select(func.count()).select_from(ProjectTable))
+    counts[DEFAULT_SHARD] += max(0, (total or 0) - sum(counts.values()))
+    return counts
+
+
+async def choose_project_shard(session: AsyncSession) -> str:
+    """Shard for a new project: the one holding the fewest projects."""
+    if not SHARDING_ENABLED:
+        return DEFAULT_SHARD
+    counts = await shard_project_counts(session)
+    return min(counts, key=lambda name: (counts[name], name))
+
+
+def record_project_shard(session: AsyncSession, project_id: str, shard: str) -> None:
+    """Add a project's shard directory entry; the caller commits."""
+    if SHARDING_ENABLED:
+        session.add(ProjectShardTable(project_id=project_id, shard=shard))
+        _project_shard_cache.pop(project_id, None)
+
+
 async def fetch_user_by_id(session: AsyncSession, user_id: str) -> Optional[UserTable]:
     result = await session.execute(select(UserTable).where(UserTable.id == user_id))
     return result.scalar_one_or_none()
@@ -1651,33 +2795,439 @@ async def require_editor(current_user: UserProfile = Depends(get_current_user))
     return current_user
 
 
-async def migrate_existing_password_hashes() -> None:
-    async with async_session() as session:
-        result = await session.execute(select(UserTable))
-        users = result.scalars().all()
-        updated = False
-        for user in users:
-            if not is_password_hash(user.password_hash):
-                user.password_hash = hash_password(user.password_hash)
-                updated = True
-        if updated:
+async def rehash_plaintext_passwords(
+    concurrency: int = PASSWORD_REHASH_CONCURRENCY,
+    batch_size: int = PASSWORD_REHASH_BATCH_SIZE,
+) -> None:
+    """Hash passwords still stored in plaintext by old releases.
+
+    Hashing runs in worker threads, at most ``concurrency`` at a time. Each
+    row is only updated if it still holds the value that was hashed, so a
+    concurrent login that already rehashed it wins.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def rehash(user_id: str, plaintext: str) -> int:
+        async with semaphore:
+            password_hash = await asyncio.to_thread(hash_password, plaintext)
+        async with async_session() as session:
+            result = await session.execute(
+                update(UserTable)
+                .where(UserTable.id == user_id, UserTable.password_hash == plaintext)
+                .values(password_hash=password_hash)
+            )
             await session.commit()
+        return result.rowcount
+
+    last_id = ""
+    rehashed = 0
+    while True:
+        async with async_session() as session:
+            result = await session.execute(
+                select(UserTable.id, UserTable.password_hash)
+                .where(
+                    UserTable.id > last_id,
+                    UserTable.password_hash.notlike(f"{PASSWORD_HASH_ALGORITHM}$%"),
+                )
+                .order_by(UserTable.id)
+                .limit(batch_size)
+            )
+            rows = result.all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+        counts = await asyncio.gather(
+            *(
+                rehash(row.id, row.password_hash)
+                for row in rows
+                if not is_password_hash(row.password_hash)
+            )
+        )
+        rehashed += sum(counts)
+    if rehashed:
+        logger.info("Hashed %d plaintext passwords", rehashed)
+
+
+def add_missing_columns(sync_conn: Any) -> None:
+    """Add nullable columns introduced after a table was first created."""
+    inspector = inspect(sync_conn)
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing or not column.nullable:
+                continue
+            column_type = column.type.compile(dialect=sync_conn.dialect)
+            sync_conn.execute(
+                text(f'ALTER TABLE "{table.name}" ADD COLUMN "{column.name}" {column_type}')
+            )
+
+
+@dataclass(frozen=True)
+class SchemaMigration:
+    version: int
+    name: str
+    # Runs on a synchronous connection inside the migration's transaction.
+    # Each database only holds some tables once sharding is on, so steps
+    # must skip tables that are missing.
+    upgrade: Callable[[Any], None]
+
+
+def _create_model_indexes(sync_conn: Any, model: Type[Base], *names: str) -> None:
+    if not inspect(sync_conn).has_table(model.__tablename__):
+        return
+    for index in model.__table__.indexes:
+        if index.name in names:
+            index.create(sync_conn, checkfirst=True)
+
+
+def _drop_duplicate_single_entry_fields(sync_conn: Any) -> None:
+    """Keep the newest row per project and field so the pair can be unique.
+
+    The table has no timestamp, so "newest" is the highest SQLite rowid. Other
+    databases have no insertion order to go by; duplicates there are reported
+    for the operator to resolve instead of dropping an arbitrary row.
+    """
+    table = SingleEntryFieldTable.__table__
+    if not inspect(sync_conn).has_table(table.name):
+        return
+    if sync_conn.dialect.name != "sqlite":
+        duplicated = sync_conn.execute(
+            select(func.count()).select_from(
+                select(table.c.project_id)
+                .group_by(table.c.project_id, table.c.field_name)
+                .having(func.count() > 1)
+                .subquery()
+            )
+        ).scalar_one()
+        if duplicated:
+            raise RuntimeError(
+                f"{duplicated} single entry fields have more than one row for the same "
+                "project; keep one row for each and run the migration again"
+            )
+        return
+    row_key = literal_column("rowid")
+    newest = (
+        select(func.max(row_key))
+        .select_from(table)
+        .group_by(table.c.project_id, table.c.field_name)
+    )
+    duplicates = sync_conn.execute(
+        select(table.c.id, table.c.image_id).where(row_key.notin_(newest))
+    ).all()
+    if not duplicates:
+        return
+    sync_conn.execute(delete(table).where(table.c.id.in_([row.id for row in duplicates])))
+    image_ids = {row.image_id for row in duplicates if row.image_id}
+    still_used = set(
+        sync_conn.execute(
+            select(table.c.image_id).where(table.c.image_id.in_(image_ids))
+        ).scalars()
+    )
+    orphaned = list(image_ids - still_used)
+    if orphaned:
+        sync_conn.execute(
+            delete(ImageRenditionTable.__table__).where(
+                ImageRenditionTable.__table__.c.image_id.in_(orphaned)
+            )
+        )
+        sync_conn.execute(
+            delete(ImageBlobTable.__table__).where(ImageBlobTable.__table__.c.id.in_(orphaned))
+        )
+    logger.info("Removed %d duplicate single entry fields", len(duplicates))
+
+
+def _migration_composite_indexes(sync_conn: Any) -> None:
+    _drop_duplicate_single_entry_fields(sync_conn)
+    _create_model_indexes(sync_conn, SingleEntryFieldTable, "uq_single_entry_field")
+    _create_model_indexes(
+        sync_conn, MilestoneColumnTable, "ix_milestone_columns_project_order"
+    )
+    _create_model_indexes(
+        sync_conn, SamMilestoneColumnTable, "ix_sam_milestone_columns_project_order"
+    )
+    _create_model_indexes(sync_conn, ProjectAccessTable, "ix_project_access_user_visible")
+
+
+# Append only; a released version must never change. Fresh databases get the
+# current schema from ``create_all`` and still run every step, so steps must be
+# idempotent.
+SCHEMA_MIGRATIONS: List[SchemaMigration] = [
+    SchemaMigration(1, "composite indexes for hot lookups", _migration_composite_indexes),
+]
+
+
+SCHEMA_FINGERPRINT_KEY = "fingerprint"
+
+
+def database_tables(shard: str) -> List[Any]:
+    if shard == DEFAULT_SHARD:
+        inactive = {table.__table__ for table in INACTIVE_SECTION_TABLES}
+        return [table for table in Base.metadata.sorted_tables if table not in inactive]
+    bookkeeping = [SchemaMigrationTable, SchemaStateTable]
+    return [table.__table__ for table in [*SHARDED_TABLES, *bookkeeping]]
+
+
+def schema_fingerprint(tables: Sequence[Any]) -> str:
+    """Hash of the declared tables and migrations a database should have."""
+    digest = hashlib.sha256()
+    for table in sorted(tables, key=lambda table: table.name):
+        parts = [table.name]
+        parts.extend(
+            f"{column.name}:{column.type}:{column.nullable}:{column.primary_key}"
+            for column in table.columns
+        )
+        parts.extend(
+            f"{index.name}:{index.unique}:{','.join(column.name for column in index.columns)}"
+            for index in sorted(table.indexes, key=lambda index: index.name or "")
+        )
+        digest.update("|".join(parts).encode("utf-8"))
+    digest.update(",".join(str(migration.version) for migration in SCHEMA_MIGRATIONS).encode())
+    return digest.hexdigest()
+
+
+def stored_schema_fingerprint(sync_conn: Any) -> Optional[str]:
+    if not inspect(sync_conn).has_table(SchemaStateTable.__tablename__):
+        return None
+    return sync_conn.execute(
+        select(SchemaStateTable.value).where(SchemaStateTable.key == SCHEMA_FINGERPRINT_KEY)
+    ).scalar_one_or_none()
+
+
+def store_schema_fingerprint(sync_conn: Any, fingerprint: str) -> None:
+    SchemaStateTable.__table__.create(sync_conn, checkfirst=True)
+    sync_conn.execute(
+        delete(SchemaStateTable).where(SchemaStateTable.key == SCHEMA_FINGERPRINT_KEY)
+    )
+    sync_conn.execute(
+        insert(SchemaStateTable).values(key=SCHEMA_FINGERPRINT_KEY, value=fingerprint)
+    )
+
+
+def applied_schema_versions(sync_conn: Any) -> Set[int]:
+    if not inspect(sync_conn).has_table(SchemaMigrationTable.__tablename__):
+        return set()
+    return set(sync_conn.execute(select(SchemaMigrationTable.version)).scalars())
+
+
+def apply_schema_migrations(sync_conn: Any) -> List[int]:
+    """Run pending migrations on one database; returns the versions applied."""
+    SchemaMigrationTable.__table__.create(sync_conn, checkfirst=True)
+    applied = applied_schema_versions(sync_conn)
+    versions: List[int] = []
+    for migration in SCHEMA_MIGRATIONS:
+        if migration.version in applied:
+            continue
+        migration.upgrade(sync_conn)
+        sync_conn.execute(
+            insert(SchemaMigrationTable).values(
+                version=migration.version, name=migration.name, applied_at=_utcnow()
+            )
+        )
+        versions.append(migration.version)
+    return versions
+
+
+async def run_schema_migrations(shards: Optional[Sequence[str]] = None) -> Dict[str, List[int]]:
+    """Apply pending migrations to the primary database and every shard."""
+    applied: Dict[str, List[int]] = {}
+    for shard in shards or list(shard_engines):
+        shard_engine = shard_engines[shard]
+        async with shard_engine.begin() as conn:
+            if shard_engine.dialect.name == "sqlite":
+                # Hold the write lock for the whole run so concurrent workers
+                # apply each version once; pysqlite would not open a
+                # transaction for DDL on its own.
+                await conn.exec_driver_sql("BEGIN IMMEDIATE")
+            applied[shard] = await conn.run_sync(apply_schema_migrations)
+            await conn.run_sync(
+                store_schema_fingerprint, schema_fingerprint(database_tables(shard))
+            )
+        if applied[shard]:
+            logger.info("Applied schema migrations %s on shard %s", applied[shard], shard)
+    return applied
+
+
+def _table_batches(sync_conn: Any, table: Any, batch_size: int) -> Any:
+    # Paged in storage order (rowid on SQLite), which is the order the list
+    # endpoint returns rows in.
+    key = literal_column("rowid") if sync_conn.dialect.name == "sqlite" else table.c.id
+    last_key = None
+    while True:
+        stmt = select(key.label("storage_key"), *table.c).order_by(key).limit(batch_size)
+        if last_key is not None:
+            stmt = stmt.where(key > last_key)
+        rows = sync_conn.execute(stmt).all()
+        if not rows:
+            return
+        yield rows
+        last_key = rows[-1].storage_key
+
+
+def _section_layout_tables(layout: str) -> List[Any]:
+    if layout == "document":
+        return [SectionRowTable.__table__]
+    return [model.__table__ for model in SECTION_TABLE_MODELS]
+
+
+def _count_section_rows(sync_conn: Any, layout: str) -> int:
+    inspector = inspect(sync_conn)
+    return sum(
+        sync_conn.execute(select(func.count()).select_from(table)).scalar_one()
+        for table in _section_layout_tables(layout)
+        if inspector.has_table(table.name)
+    )
+
+
+def _convert_section_rows(sync_conn: Any, layout: str, batch_size: int) -> int:
+    document_table = SectionRowTable.__table__
+    inspector = inspect(sync_conn)
+    for table in _section_layout_tables(layout):
+        table.create(sync_conn, checkfirst=True)
+        sync_conn.execute(delete(table))
+
+    copied = 0
+    if layout == "document":
+        for meta in SECTION_TABLE_REGISTRY.values():
+            if not inspector.has_table(meta.table_name):
+                continue
+            for rows in _table_batches(sync_conn, meta.model.__table__, batch_size):
+                sync_conn.execute(
+                    insert(document_table),
+                    [
+                        {
+                            "id": row.id,
+                            "project_id": row.project_id,
+                            "section": meta.section,
+                            "table_name": meta.table_name,
+                            "data": {column: row._mapping[column] for column in meta.columns},
+                        }
+                        for row in rows
+                    ],
+                )
+                copied += len(rows)
+        return copied
+
+    if not inspector.has_table(document_table.name):
+        return copied
+    for rows in _table_batches(sync_conn, document_table, batch_size):
+        rows_by_table: Dict[str, List[Dict[str, Any]]] = {}
+        for row in rows:
+            meta = SECTION_TABLES_BY_NAME.get(row.table_name)
+            if meta is None:
+                logger.warning("Skipping section row %s of unknown table %s", row.id, row.table_name)
+                continue
+            data = row.data or {}
+            rows_by_table.setdefault(meta.table_name, []).append(
+                {
+                    "id": row.id,
+                    "project_id": row.project_id,
+                    **{column: data.get(column) for column in meta.columns},
+                }
+            )
+        for table_name, table_rows in rows_by_table.items():
+            sync_conn.execute(
+                insert(SECTION_TABLES_BY_NAME[table_name].model.__table__), table_rows
+            )
+            copied += len(table_rows)
+    return copied
+
+
+async def convert_section_storage(
+    layout: str, replace: bool = False, batch_size: int = 1000
+) -> Dict[str, int]:
+    """Copy every generic section row into ``layout`` on each database.
+
+    The source rows are kept until they are removed by hand. A target layout
+    that already holds rows is only overwritten with ``replace``. Run it while
+    the app is stopped, then restart with the matching SECTION_TABLE_STORAGE.
+    """
+    if not replace:
+        for shard, shard_engine in shard_engines.items():
+            async with shard_engine.connect() as conn:
+                existing = await conn.run_sync(_count_section_rows, layout)
+            if existing:
+                raise RuntimeError(
+                    f"Shard {shard} already has {existing} rows in the {layout} layout"
+                )
+    copied: Dict[str, int] = {}
+    for shard, shard_engine in shard_engines.items():
+        async with shard_engine.begin() as conn:
+            if shard_engine.dialect.name == "sqlite":
+                await conn.exec_driver_sql("BEGIN IMMEDIATE")
+            copied[shard] = await conn.run_sync(_convert_section_rows, layout, batch_size)
+    return copied
+
+
+async def migrate_single_entry_images(batch_size: int = 50) -> None:
+    """Move inline base64 images into ``image_blobs`` (one-time, idempotent)."""
+    for session_factory in SHARD_SESSIONMAKERS.values():
+        await _migrate_shard_single_entry_images(session_factory, batch_size)
+
+
+async def _migrate_shard_single_entry_images(
+    session_factory: async_sessionmaker, batch_size: int
+) -> None:
+    while True:
+        async with session_factory() as session:
+            result = await session.execute(
+                select(
+                    SingleEntryFieldTable.id,
+                    SingleEntryFieldTable.project_id,
+                    SingleEntryFieldTable.legacy_image_data,
+                )
+                .where(SingleEntryFieldTable.legacy_image_data.is_not(None))
+                .limit(batch_size)
+            )
+            rows = result.all()
+            if not rows:
+                return
+
+            touched_projects: Set[str] = set()
+            for entry_id, project_id, image_data in rows:
+                values: Dict[str, Any] = {"legacy_image_data": None}
+                parsed = parse_image_data_url(image_data)
+                if parsed is not None:
+                    binary, content_type = parsed
+                    values["image_id"] = await store_image_blob(session, binary, content_type)
+                else:
+                    logger.warning("Dropping undecodable image on single entry %s", entry_id)
+                await session.execute(
+                    update(SingleEntryFieldTable)
+                    .where(SingleEntryFieldTable.id == entry_id)
+                    .values(**values)
+                )
+                touched_projects.add(project_id)
+            for project_id in touched_projects:
+                await bump_table_version(
+                    session, project_id, SingleEntryFieldTable.__tablename__
+                )
+            await session.commit()
+
+
+DEFAULT_USERS = (
+    ("admin@plankit.com", "Admin User", "admin", "admin123"),
+    ("editor@plankit.com", "Editor User", "editor", "editor123"),
+    ("viewer@plankit.com", "Viewer User", "viewer", "viewer123"),
+)
 
 
 async def init_default_users() -> None:
     async with async_session() as session:
-        for email, username, role, password in (
-            ("admin@plankit.com", "Admin User", "admin", "admin123"),
-            ("editor@plankit.com", "Editor User", "editor", "editor123"),
-            ("viewer@plankit.com", "Viewer User", "viewer", "viewer123"),
-        ):
-            result = await session.execute(select(UserTable).where(UserTable.email == email))
-            if result.scalar_one_or_none() is None:
+        result = await session.execute(
+            select(UserTable.email).where(UserTable.email.in_([user[0] for user in DEFAULT_USERS]))
+        )
+        existing = set(result.scalars().all())
+        if len(existing) == len(DEFAULT_USERS):
+            return
+        for email, username, role, password in DEFAULT_USERS:
+            if email not in existing:
                 user = UserTable(
                     email=email,
                     username=username,
                     role=role,
-                    password_hash=hash_password(password),
+                    password_hash=await asyncio.to_thread(hash_password, password),
                 )
                 session.add(user)
         await session.commit()
@@ -1688,7 +3238,11 @@ async def get_project_or_404(
     project_id: str,
     current_user: Optional["UserProfile"] = None,
 ) -> ProjectTable:
-    result = await session.execute(select(ProjectTable).where(ProjectTable.id == project_id))
+    result = await session.execute(
+        select(ProjectTable).where(
+            ProjectTable.id == project_id, ProjectTable.deleted_at.is_(None)
+        )
+    )
     project = result.scalar_one_or_none()
     if project is None:
         raise HTTPException(status_code=404, detail="Project not found")
@@ -1727,13 +3281,815 @@ def to_schema(schema: Type[SchemaType], instance: Any) -> SchemaType:
     return schema.model_validate(instance)
 
 
-async def purge_project_children(session: AsyncSession, project_id: str) -> None:
+class FastJSONResponse(Response):
+    """JSON response for content that is already plain dicts and lists.
+
+    List endpoints build their rows straight from the selected columns and
+    return this, which skips both ``to_schema`` and FastAPI's re-validation
+    against ``response_model``.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content, option=orjson.OPT_UTC_Z)
+        return json.dumps(
+            content, ensure_ascii=False, separators=(",", ":"), default=_json_default
+        ).encode("utf-8")
+
+
+_schema_columns_cache: Dict[Tuple[Any, Any], Optional[List[Any]]] = {}
+
+
+def schema_columns(table: Type[TableType], schema: Type[BaseModel]) -> Optional[List[Any]]:
+    """Table columns for each field of ``schema``, or None if one has no column."""
+    key = (table, schema)
+    if key not in _schema_columns_cache:
+        columns = table.__table__.c
+        _schema_columns_cache[key] = (
+            [columns[name] for name in schema.model_fields]
+            if all(name in columns for name in schema.model_fields)
+            else None
+        )
+    return _schema_columns_cache[key]
+
+
+LIST_RESPONSE_FORMATS = ("rows", "columnar")
+
+
+def list_response_format(response_format: str = Query("rows", alias="format")) -> str:
+    """The ``format`` query parameter of the list endpoints.
+
+    ``rows`` is the usual list of objects. ``columnar`` sends the column names
+    once and each row as an array of values, which is much smaller for wide
+    tables.
+    """
+    if response_format not in LIST_RESPONSE_FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported format. Use one of: {', '.join(LIST_RESPONSE_FORMATS)}",
+        )
+    return response_format
+
+
+def list_responses(
+    schema: Type[BaseModel], columnar_schema: Type[ColumnarRows] = ColumnarRows
+) -> Dict[Union[int, str], Dict[str, Any]]:
+    """OpenAPI ``responses`` for a list endpoint.
+
+    These endpoints return a ready-made response in either format, so no
+    ``response_model`` applies; both shapes are documented here instead.
+    """
+    return {
+        200: {
+            "model": Union[List[schema], columnar_schema],  # type: ignore[valid-type]
+            "description": "Rows as objects, or columnar with ``format=columnar``",
+        }
+    }
+
+
+def columnar_response(
+    columns: Sequence[str], rows: Sequence[Sequence[Any]], **shared: Any
+) -> Response:
+    """Rows as arrays under ``columns``; ``shared`` holds values common to every row."""
+    return FastJSONResponse(
+        {**shared, "columns": list(columns), "rows": [list(row) for row in rows]}
+    )
+
+
+async def bump_table_version(session: AsyncSession, project_id: str, table_name: str) -> None:
+    """Record that a project's table changed; the caller commits.
+
+    The increment happens in the database, as an upsert where the dialect has
+    one, so concurrent edits never reuse a version or race on the first row.
+    """
+    table = ProjectTableVersionTable.__table__
+    values = {
+        "id": str(uuid.uuid4()),
+        "project_id": project_id,
+        "table_name": table_name,
+        "version": 1,
+    }
+    dialect_name = shard_dialect_name(session)
+    if dialect_name in ("sqlite", "postgresql"):
+        dialect = sqlite_dialect if dialect_name == "sqlite" else postgresql_dialect
+        await session.execute(
+            dialect.insert(table)
+            .values(**values)
+            .on_conflict_do_update(
+                index_elements=[table.c.project_id, table.c.table_name],
+                set_={"version": table.c.version + 1},
+            )
+        )
+        return
+    if dialect_name == "mysql":
+        await session.execute(
+            mysql_dialect.insert(table)
+            .values(**values)
+            .on_duplicate_key_update(version=table.c.version + 1)
+        )
+        return
+    result = await session.execute(
+        update(table)
+        .where(table.c.project_id == project_id, table.c.table_name == table_name)
+        .values(version=table.c.version + 1)
+    )
+    if result.rowcount == 0:
+        await session.execute(insert(table).values(**values))
+
+
+async def fetch_table_versions(session: AsyncSession, project_id: str) -> Dict[str, int]:
+    result = await session.execute(
+        select(ProjectTableVersionTable.table_name, ProjectTableVersionTable.version).where(
+            ProjectTableVersionTable.project_id == project_id
+        )
+    )
+    return {table_name: version for table_name, version in result.all()}
+
+
+async def image_blob_exists(session: AsyncSession, image_id: str) -> bool:
+    result = await session.execute(select(ImageBlobTable.id).where(ImageBlobTable.id == image_id))
+    return result.scalar_one_or_none() is not None
+
+
+def insert_ignoring_duplicates(session: AsyncSession, table: Any, values: Dict[str, Any]) -> Any:
+    """INSERT that skips a row whose key is already stored.
+
+    Returns ``None`` on dialects without such a form; callers then check for
+    the row first.
+    """
+    dialect_name = shard_dialect_name(session)
+    if dialect_name in ("sqlite", "postgresql"):
+        dialect = sqlite_dialect if dialect_name == "sqlite" else postgresql_dialect
+        return dialect.insert(table).values(**values).on_conflict_do_nothing()
+    if dialect_name == "mysql":
+        return insert(table).values(**values).prefix_with("IGNORE")
+    return None
+
+
+async def insert_image_blob(session: AsyncSession, **values: Any) -> None:
+    """Insert a blob row, doing nothing if the same content is already stored.
+
+    Blob ids are content hashes, so two concurrent uploads of one image race
+    on the primary key; the loser's insert is skipped instead of failing.
+    """
+    table = ImageBlobTable.__table__
+    stmt = insert_ignoring_duplicates(session, table, values)
+    if stmt is None:
+        if await image_blob_exists(session, values["id"]):
+            return
+        stmt = insert(table).values(**values)
+    await session.execute(stmt)
+
+
+async def prepare_image_blob(binary: bytes, content_type: str) -> Dict[str, Any]:
+    """Hash and measure image bytes in a worker thread; returns the blob row values.
+
+    Done before a write is queued, so the single writer only runs the INSERT.
+    """
+
+    def measure() -> Tuple[str, Optional[int], Optional[int]]:
+        return hashlib.sha256(binary).hexdigest(), *read_image_dimensions(binary)
+
+    digest, width, height = await asyncio.to_thread(measure)
+    return {
+        "id": digest,
+        "content_type": content_type,
+        "size": len(binary),
+        "width": width,
+        "height": height,
+        "data": binary,
+    }
+
+
+async def store_image_blob(
+    session: AsyncSession, binary: bytes, content_type: str
+) -> str:
+    """Store image bytes once per content hash and return the blob id."""
+    blob = await prepare_image_blob(binary, content_type)
+    await insert_image_blob(session, **blob)
+    return blob["id"]
+
+
+@dataclass
+class ValidatedImage:
+    id: str
+    content_type: str
+    size: int
+    width: int
+    height: int
+
+
+async def read_image_upload(upload: UploadFile) -> ValidatedImage:
+    """Validate an uploaded image chunk by chunk.
+
+    Returns the content hash, sniffed content type, size and dimensions. Only
+    the first chunk is inspected for the format. Bodies far over the size
+    limit never get this far (see ``ImageUploadLimitMiddleware``); the exact
+    file size is checked here. The dimensions come from the header, parsed
+    in a worker thread.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    content_type: Optional[str] = None
+    await upload.seek(0)
+    while True:
+        chunk = await upload.read(UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            break
+        if content_type is None:
+            content_type = sniff_image_content_type(chunk[:16])
+            if content_type is None:
+                raise HTTPException(status_code=415, detail="Unsupported image format")
+        size += len(chunk)
+        if size > MAX_IMAGE_UPLOAD_BYTES:
+            raise HTTPException(status_code=413, detail="Image exceeds the upload size limit")
+        digest.update(chunk)
+
+    if content_type is None:
+        raise HTTPException(status_code=400, detail="Empty image upload")
+
+    def verify_header() -> Tuple[int, int]:
+        from PIL import Image as PILImage
+
+        upload.file.seek(0)
+        # Image.open only parses the header; pixel data is not decoded.
+        with PILImage.open(upload.file) as image:
+            return image.size
+
+    try:
+        width, height = await asyncio.to_thread(verify_header)
+    except Exception as exc:
+        raise HTTPException(status_code=415, detail="Unreadable image") from exc
+    return ValidatedImage(digest.hexdigest(), content_type, size, width, height)
+
+
+def read_spooled_upload(upload: UploadFile) -> bytes:
+    upload.file.seek(0)
+    return upload.file.read()
+
+
+async def uploaded_image_blob(upload: UploadFile, image: ValidatedImage) -> Dict[str, Any]:
+    """Blob row values for an upload already checked by ``read_image_upload``.
+
+    The blob column takes the whole value, so the spooled file is read once,
+    off the event loop, before the write is queued.
+    """
+    return {
+        "id": image.id,
+        "content_type": image.content_type,
+        "size": image.size,
+        "width": image.width,
+        "height": image.height,
+        "data": await asyncio.to_thread(read_spooled_upload, upload),
+    }
+
+
+async def release_image_blob(session: AsyncSession, image_id: Optional[str]) -> None:
+    """Delete a blob once no single-entry field references it."""
+    if not image_id:
+        return
+    result = await session.execute(
+        select(func.count())
+        .select_from(SingleEntryFieldTable)
+        .where(SingleEntryFieldTable.image_id == image_id)
+    )
+    if result.scalar_one() == 0:
+        await session.execute(
+            delete(ImageRenditionTable).where(ImageRenditionTable.image_id == image_id)
+        )
+        await session.execute(delete(ImageBlobTable).where(ImageBlobTable.id == image_id))
+
+
+async def generate_image_renditions(image_id: str, shard: str = DEFAULT_SHARD) -> None:
+    """Render and store the renditions an image is missing.
+
+    No connection is held while rendering. Tasks for the same image can run
+    at once (two fields saving one image, or the startup backfill next to an
+    upload), so rows another task stored first are skipped.
+    """
+    session_factory = SHARD_SESSIONMAKERS[shard]
+    async with session_factory() as session:
+        existing = await session.execute(
+            select(ImageRenditionTable.kind).where(ImageRenditionTable.image_id == image_id)
+        )
+        if set(existing.scalars().all()) >= set(RENDITION_SIZES):
+            return
+        result = await session.execute(
+            select(ImageBlobTable.data).where(ImageBlobTable.id == image_id)
+        )
+        binary = result.scalar_one_or_none()
+    if binary is None:
+        return
+
+    try:
+        renditions = await asyncio.to_thread(render_image_renditions, binary)
+    except Exception:
+        logger.warning("Could not render image renditions for %s", image_id, exc_info=True)
+        return
+
+    async def store(session: AsyncSession) -> None:
+        table = ImageRenditionTable.__table__
+        for rendition in renditions:
+            values = {
+                "image_id": image_id,
+                "kind": rendition.kind,
+                "content_type": rendition.content_type,
+                "size": len(rendition.data),
+                "width": rendition.width,
+                "height": rendition.height,
+                "data": rendition.data,
+            }
+            stmt = insert_ignoring_duplicates(session, table, values)
+            if stmt is None:
+                if await session.get(ImageRenditionTable, (image_id, rendition.kind)):
+                    continue
+                stmt = insert(table).values(**values)
+            await session.execute(stmt)
+
+    async with session_factory() as session:
+        await perform_write(session, store)
+
+
+def schedule_image_renditions(image_id: Optional[str], shard: str = DEFAULT_SHARD) -> None:
+    if image_id:
+        spawn_background_task(generate_image_renditions(image_id, shard))
+
+
+async def backfill_image_renditions() -> None:
+    for shard, session_factory in SHARD_SESSIONMAKERS.items():
+        async with session_factory() as session:
+            missing = await session.execute(
+                select(ImageBlobTable.id).where(
+                    ~select(ImageRenditionTable.image_id)
+                    .where(ImageRenditionTable.image_id == ImageBlobTable.id)
+                    .exists()
+                )
+            )
+            image_ids = list(missing.scalars().all())
+        for image_id in image_ids:
+            await generate_image_renditions(image_id, shard)
+
+
+def single_entry_image_url(project_id: str, field_name: str, image_id: str) -> str:
+    # The content hash in the query string changes with the image, which lets
+    # clients cache each URL indefinitely.
+    return f"/api/projects/{project_id}/single-entry/{field_name}/image?v={image_id}"
+
+
+def single_entry_select() -> Any:
+    """Select single-entry text plus image metadata, never the image bytes."""
+    return (
+        select(
+            SingleEntryFieldTable,
+            ImageBlobTable.width,
+            ImageBlobTable.height,
+            ImageRenditionTable.width,
+            ImageRenditionTable.height,
+        )
+        .outerjoin(ImageBlobTable, ImageBlobTable.id == SingleEntryFieldTable.image_id)
+        .outerjoin(
+            ImageRenditionTable,
+            (ImageRenditionTable.image_id == SingleEntryFieldTable.image_id)
+            & (ImageRenditionTable.kind == "thumbnail"),
+        )
+    )
+
+
+def serialize_single_entry(
+    row: SingleEntryFieldTable,
+    image_width: Optional[int] = None,
+    image_height: Optional[int] = None,
+    thumbnail_width: Optional[int] = None,
+    thumbnail_height: Optional[int] = None,
+) -> SingleEntryField:
+    image_url = None
+    thumbnail_url = None
+    if row.image_id:
+        image_url = single_entry_image_url(row.project_id, row.field_name, row.image_id)
+        if thumbnail_width is not None:
+            thumbnail_url = f"{image_url}&rendition=thumbnail"
+    return SingleEntryField(
+        id=row.id,
+        project_id=row.project_id,
+        field_name=row.field_name,
+        content=row.content,
+        image_url=image_url,
+        image_width=image_width,
+        image_height=image_height,
+        thumbnail_url=thumbnail_url,
+        thumbnail_width=thumbnail_width,
+        thumbnail_height=thumbnail_height,
+    )
+
+
+def parse_byte_range(range_header: str, size: int) -> Optional[Tuple[int, int]]:
+    """Parse a single ``bytes=`` range into inclusive offsets.
+
+    Returns ``None`` when the header should be ignored and raises 416 when the
+    range cannot be satisfied.
+    """
+    unit, _, spec = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    start_text, _, end_text = spec.strip().partition("-")
+    try:
+        if start_text:
+            start = int(start_text)
+            end = int(end_text) if end_text else size - 1
+        else:
+            suffix = int(end_text)
+            if suffix <= 0:
+                raise ValueError
+            start = max(size - suffix, 0)
+            end = size - 1
+    except ValueError:
+        return None
+    if start >= size or start > end:
+        raise HTTPException(
+            status_code=416,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+    return start, min(end, size - 1)
+
+
+PROJECT_PURGE_BATCH_SIZE = int(os.environ.get("PROJECT_PURGE_BATCH_SIZE", "500"))
+PROJECT_PURGE_PAUSE_SECONDS = float(os.environ.get("PROJECT_PURGE_PAUSE_SECONDS", "0.05"))
+PROJECT_REAPER_INTERVAL_SECONDS = float(os.environ.get("PROJECT_REAPER_INTERVAL_SECONDS", "60"))
+
+_project_reaper_wakeup = asyncio.Event()
+
+
+async def _delete_project_rows_in_batches(
+    table: Any, project_id: str, session_factory: async_sessionmaker = async_session
+) -> None:
+    while True:
+        async with session_factory() as session:
+            batch = (
+                select(table.id)
+                .where(table.project_id == project_id)
+                .limit(PROJECT_PURGE_BATCH_SIZE)
+                .scalar_subquery()
+            )
+            result = await session.execute(delete(table).where(table.id.in_(batch)))
+            await session.commit()
+        if result.rowcount < PROJECT_PURGE_BATCH_SIZE:
+            return
+        # Release the write lock between chunks so other writers can proceed.
+        await asyncio.sleep(PROJECT_PURGE_PAUSE_SECONDS)
+
+
+async def _delete_single_entry_rows_in_batches(
+    project_id: str, session_factory: async_sessionmaker
+) -> None:
+    # Blobs are released in the transaction that drops their last reference,
+    # so an interrupted purge can never leave an unreferenced blob behind.
+    while True:
+        async with session_factory() as session:
+            result = await session.execute(
+                select(SingleEntryFieldTable.id, SingleEntryFieldTable.image_id)
+                .where(SingleEntryFieldTable.project_id == project_id)
+                .limit(PROJECT_PURGE_BATCH_SIZE)
+            )
+            rows = result.all()
+            if rows:
+                await session.execute(
+                    delete(SingleEntryFieldTable).where(
+                        SingleEntryFieldTable.id.in_([row.id for row in rows])
+                    )
+                )
+                for image_id in {row.image_id for row in rows if row.image_id}:
+                    await release_image_blob(session, image_id)
+                await session.commit()
+        if len(rows) < PROJECT_PURGE_BATCH_SIZE:
+            return
+        await asyncio.sleep(PROJECT_PURGE_PAUSE_SECONDS)
+
+
+async def purge_project_children(project_id: str, shard: Optional[str] = None) -> None:
+    """Delete a project's rows table by table in short transactions.
+
+    ``shard`` overrides the directory lookup, for rows written to a shard
+    before the project was recorded there.
+    """
+    session_factory = (
+        SHARD_SESSIONMAKERS[shard] if shard else await project_session_factory(project_id)
+    )
     for table in TABLES_TO_PURGE:
-        await session.execute(delete(table).where(table.project_id == project_id))
-    await session.execute(
-        delete(ProjectAccessTable).where(ProjectAccessTable.project_id == project_id)
+        if table is SingleEntryFieldTable:
+            await _delete_single_entry_rows_in_batches(project_id, session_factory)
+        else:
+            await _delete_project_rows_in_batches(table, project_id, session_factory)
+    await _delete_project_rows_in_batches(ProjectAccessTable, project_id)
+
+    async with session_factory() as session:
+        await session.execute(delete(ProjectTable).where(ProjectTable.id == project_id))
+        await session.execute(
+            delete(ProjectShardTable).where(ProjectShardTable.project_id == project_id)
+        )
+        await session.commit()
+    _project_shard_cache.pop(project_id, None)
+    evict_project_export_fragments(project_id)
+
+
+async def reap_deleted_projects() -> None:
+    async with async_session() as session:
+        result = await session.execute(
+            select(ProjectTable.id)
+            .where(ProjectTable.deleted_at.is_not(None))
+            .order_by(ProjectTable.deleted_at)
+        )
+        project_ids = list(result.scalars().all())
+    for project_id in project_ids:
+        await purge_project_children(project_id)
+
+
+async def project_reaper_loop() -> None:
+    while True:
+        try:
+            await reap_deleted_projects()
+            await resume_project_shard_moves()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            if cancel_requested():
+                raise asyncio.CancelledError
+            logger.exception("Project reaper failed")
+        try:
+            await asyncio.wait_for(
+                _project_reaper_wakeup.wait(), timeout=PROJECT_REAPER_INTERVAL_SECONDS
+            )
+        except asyncio.TimeoutError:
+            pass
+        _project_reaper_wakeup.clear()
+
+
+@dataclass
+class SqliteBackupState:
+    running: bool = False
+    last_started_at: Optional[datetime] = None
+    last_finished_at: Optional[datetime] = None
+    last_duration_seconds: Optional[float] = None
+    last_size_bytes: Optional[int] = None
+    last_files: List[str] = field(default_factory=list)
+    last_error: Optional[str] = None
+
+
+_sqlite_backup_state = SqliteBackupState()
+_sqlite_backup_lock = asyncio.Lock()
+
+
+def sqlite_database_path(database_engine: AsyncEngine) -> Optional[Path]:
+    """Path of the SQLite database file, or ``None`` for other backends."""
+    url = database_engine.url
+    if url.get_backend_name() != "sqlite" or not url.database or url.database == ":memory:":
+        return None
+    return Path(url.database)
+
+
+def sqlite_backup_sources() -> Dict[str, Path]:
+    """SQLite files to back up, keyed by their backup file prefix."""
+    sources: Dict[str, Path] = {}
+    for shard, shard_engine in shard_engines.items():
+        path = sqlite_database_path(shard_engine)
+        if path is not None:
+            sources["app" if shard == DEFAULT_SHARD else f"shard_{shard}"] = path
+    return sources
+
+
+class _SqliteBackupRestarted(Exception):
+    pass
+
+
+def run_sqlite_backup(source_path: Path, target_path: Path) -> int:
+    """Copy the database with SQLite's online backup API; returns the file size.
+
+    Pages are copied a few at a time with a pause between steps, so the source
+    is only locked briefly and writers keep making progress. A write from
+    another connection makes SQLite restart the copy; if that keeps happening,
+    the last attempt copies the whole file in one step. The copy is written
+    to a temporary name and renamed once complete.
+    """
+    partial_path = target_path.with_name(target_path.name + ".partial")
+    restarts = 0
+    last_remaining: Optional[int] = None
+
+    def pause_between_steps(status: int, remaining: int, total: int) -> None:
+        nonlocal restarts, last_remaining
+        if last_remaining is not None and remaining > last_remaining:
+            restarts += 1
+            if restarts > SQLITE_BACKUP_MAX_RESTARTS:
+                raise _SqliteBackupRestarted()
+        last_remaining = remaining
+        if remaining:
+            time.sleep(SQLITE_BACKUP_STEP_SLEEP_SECONDS)
+
+    source = sqlite3.connect(f"{source_path.resolve().as_uri()}?mode=ro", uri=True)
+    try:
+        target = sqlite3.connect(partial_path)
+        try:
+            try:
+                source.backup(
+                    target,
+                    pages=SQLITE_BACKUP_PAGES_PER_STEP,
+                    progress=pause_between_steps,
+                )
+            except _SqliteBackupRestarted:
+                source.backup(target)
+        finally:
+            target.close()
+    except BaseException:
+        partial_path.unlink(missing_ok=True)
+        raise
+    finally:
+        source.close()
+    os.replace(partial_path, target_path)
+    return target_path.stat().st_size
+
+
+def list_sqlite_backups(prefix: str = "*") -> List[Path]:
+    """Completed backups, newest first."""
+    if not SQLITE_BACKUP_DIR.is_dir():
+        return []
+    return sorted(
+        SQLITE_BACKUP_DIR.glob(f"{prefix}-*.db"),
+        key=lambda path: path.stat().st_mtime,
+        reverse=True,
     )
-    await session.commit()
+
+
+def sqlite_backup_due() -> bool:
+    """Whether the newest backup is older than half the schedule interval.
+
+    Every worker runs the schedule; the first one due writes the backup and
+    the others, finding it fresh, skip their turn.
+    """
+    backups = list_sqlite_backups()
+    if not backups:
+        return True
+    age = time.time() - backups[0].stat().st_mtime
+    return age >= SQLITE_BACKUP_INTERVAL_SECONDS / 2
+
+
+@contextmanager
+def sqlite_backup_file_lock() -> Iterator[bool]:
+    """Hold the backup lock shared by all worker processes.
+
+    Yields ``False`` without waiting when another process holds it. Uses a
+    ``flock`` on a file in ``SQLITE_BACKUP_DIR``, which the kernel releases if
+    the holder dies; without ``fcntl`` only the in-process lock applies.
+    """
+    if fcntl is None:
+        yield True
+        return
+    SQLITE_BACKUP_DIR.mkdir(parents=True, exist_ok=True)
+    with open(SQLITE_BACKUP_DIR / ".backup.lock", "a") as lock_file:
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def prune_sqlite_backups() -> None:
+    for prefix in sqlite_backup_sources():
+        for stale in list_sqlite_backups(prefix)[SQLITE_BACKUP_RETENTION:]:
+            stale.unlink(missing_ok=True)
+
+
+async def perform_sqlite_backup(scheduled: bool = False) -> None:
+    """Back up every SQLite shard.
+
+    A ``scheduled`` run quietly skips when another process is backing up or
+    a recent backup exists; a manual one is refused with 409 while another
+    backup runs.
+    """
+    sources = sqlite_backup_sources()
+    if not sources:
+        raise HTTPException(status_code=400, detail="Backups require a SQLite database")
+    if _sqlite_backup_lock.locked():
+        if scheduled:
+            return
+        raise HTTPException(status_code=409, detail="A backup is already running")
+
+    async with _sqlite_backup_lock:
+        with sqlite_backup_file_lock() as acquired:
+            if not acquired:
+                if scheduled:
+                    return
+                raise HTTPException(status_code=409, detail="A backup is already running")
+            if scheduled and not await asyncio.to_thread(sqlite_backup_due):
+                return
+            await _write_sqlite_backups(sources)
+
+
+async def _write_sqlite_backups(sources: Dict[str, Path]) -> None:
+    state = _sqlite_backup_state
+    state.running = True
+    state.last_started_at = _utcnow()
+    state.last_error = None
+    started = time.perf_counter()
+    files: List[str] = []
+    total_size = 0
+    try:
+        SQLITE_BACKUP_DIR.mkdir(parents=True, exist_ok=True)
+        for prefix, source_path in sources.items():
+            target_path = (
+                SQLITE_BACKUP_DIR / f"{prefix}-{state.last_started_at:%Y%m%d-%H%M%S}.db"
+            )
+            size = await asyncio.to_thread(run_sqlite_backup, source_path, target_path)
+            logger.info("SQLite backup written to %s (%d bytes)", target_path, size)
+            files.append(target_path.name)
+            total_size += size
+        await asyncio.to_thread(prune_sqlite_backups)
+    except Exception as exc:
+        state.last_error = str(exc)
+        raise
+    else:
+        state.last_size_bytes = total_size
+        state.last_files = files
+    finally:
+        state.running = False
+        state.last_finished_at = _utcnow()
+        state.last_duration_seconds = time.perf_counter() - started
+
+
+async def sqlite_backup_loop() -> None:
+    while True:
+        await asyncio.sleep(SQLITE_BACKUP_INTERVAL_SECONDS)
+        try:
+            await perform_sqlite_backup(scheduled=True)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            if cancel_requested():
+                raise asyncio.CancelledError
+            logger.exception("SQLite backup failed")
+
+
+def sqlite_backup_status() -> SqliteBackupStatus:
+    state = _sqlite_backup_state
+    backups = []
+    for path in list_sqlite_backups():
+        stat = path.stat()
+        backups.append(
+            SqliteBackupFile(
+                name=path.name,
+                size=stat.st_size,
+                created_at=datetime.fromtimestamp(stat.st_mtime, timezone.utc),
+            )
+        )
+    return SqliteBackupStatus(
+        enabled=bool(sqlite_backup_sources()) and SQLITE_BACKUP_INTERVAL_SECONDS > 0,
+        running=state.running,
+        interval_seconds=SQLITE_BACKUP_INTERVAL_SECONDS,
+        retention=SQLITE_BACKUP_RETENTION,
+        last_started_at=state.last_started_at,
+        last_finished_at=state.last_finished_at,
+        last_duration_seconds=state.last_duration_seconds,
+        last_size_bytes=state.last_size_bytes,
+        last_files=state.last_files,
+        last_error=state.last_error,
+        backups=backups,
+    )
+
+
+async def create_database_tables(
+    migrate: bool = SCHEMA_MIGRATIONS_ON_STARTUP, check_fingerprint: bool = True
+) -> None:
+    """Create missing tables and columns, then apply pending migrations.
+
+    Databases whose stored schema fingerprint matches the declared schema are
+    already current and skipped, which saves reflecting every table on each
+    worker start. The fingerprint is only stored after migrations ran.
+    """
+    stale: List[str] = []
+    for shard, shard_engine in shard_engines.items():
+        tables = database_tables(shard)
+        if check_fingerprint:
+            async with shard_engine.connect() as conn:
+                stored = await conn.run_sync(stored_schema_fingerprint)
+            if stored == schema_fingerprint(tables):
+                continue
+        async with shard_engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all, tables=tables)
+            await conn.run_sync(add_missing_columns)
+        stale.append(shard)
+    if migrate and stale:
+        await run_schema_migrations(stale)
+
+
+async def dispose_engines() -> None:
+    for shard_engine in shard_engines.values():
+        await shard_engine.dispose()
+    if read_engine is not None:
+        await read_engine.dispose()
 
 
 # ==================== FASTAPI SETUP ====================
@@ -1741,15 +4097,309 @@ async def purge_project_children(session: AsyncSession, project_id: str) -> None
 
 @app.on_event("startup")
 async def on_startup() -> None:
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-    await migrate_existing_password_hashes()
+    await create_database_tables()
+    await migrate_single_entry_images()
+    spawn_background_task(backfill_image_renditions())
+    spawn_background_task(project_reaper_loop())
+    if WRITE_QUEUE_ENABLED:
+        for shard, session_factory in SHARD_SESSIONMAKERS.items():
+            _write_queues[shard] = WriteQueue(
+                session_factory, WRITE_QUEUE_WINDOW_SECONDS, WRITE_QUEUE_MAX_BATCH
+            )
+            spawn_background_task(_write_queues[shard].run())
+    if sqlite_backup_sources() and SQLITE_BACKUP_INTERVAL_SECONDS > 0:
+        spawn_background_task(sqlite_backup_loop())
+    if PASSWORD_REHASH_IN_BACKGROUND:
+        spawn_background_task(rehash_plaintext_passwords())
     await init_default_users()
 
 
 @app.on_event("shutdown")
 async def on_shutdown() -> None:
-    await engine.dispose()
+    _write_queues.clear()
+    for task in list(_background_tasks):
+        task.cancel()
+    if _export_executor is not None:
+        _export_executor.shutdown(cancel_futures=True)
+    await dispose_engines()
+
+
+RESPONSE_COMPRESSION_ENABLED = os.environ.get(
+    "RESPONSE_COMPRESSION_ENABLED", "true"
+).lower() in {"1", "true", "yes"}
+RESPONSE_COMPRESSION_MIN_SIZE = int(os.environ.get("RESPONSE_COMPRESSION_MIN_SIZE", "1024"))
+RESPONSE_COMPRESSION_TYPES = tuple(
+    content_type.strip().lower()
+    for content_type in os.environ.get(
+        "RESPONSE_COMPRESSION_TYPES",
+        "text/,application/json,application/x-ndjson,application/javascript,"
+        "application/xml,application/manifest+json,image/svg+xml",
+    ).split(",")
+    if content_type.strip()
+)
+GZIP_COMPRESSION_LEVEL = int(os.environ.get("GZIP_COMPRESSION_LEVEL", "6"))
+BROTLI_COMPRESSION_QUALITY = int(os.environ.get("BROTLI_COMPRESSION_QUALITY", "4"))
+# Serve the React build from this app when set, e.g. /srv/plankit/frontend/build.
+FRONTEND_BUILD_DIR = os.environ.get("FRONTEND_BUILD_DIR", "")
+
+
+def accepted_encodings(accept_encoding: str) -> Set[str]:
+    """Content codings an Accept-Encoding header allows (q > 0)."""
+    accepted: Set[str] = set()
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        if params.strip().lower().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        if coding and quality > 0:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+def is_compressible_type(content_type: str) -> bool:
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return any(
+        media_type.startswith(allowed) if allowed.endswith("/") else media_type == allowed
+        for allowed in RESPONSE_COMPRESSION_TYPES
+    )
+
+
+class StreamCompressor:
+    """Incremental brotli or gzip encoder for one response body."""
+
+    def __init__(self, encoding: str) -> None:
+        self.encoding = encoding
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=BROTLI_COMPRESSION_QUALITY)
+        else:
+            self._gzip = zlib.compressobj(GZIP_COMPRESSION_LEVEL, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress a chunk and flush it, so streamed rows reach the client."""
+        if self.encoding == "br":
+            return self._brotli.process(data) + self._brotli.flush()
+        return self._gzip.compress(data) + self._gzip.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        if self.encoding == "br":
+            return self._brotli.process(data) + self._brotli.finish()
+        return self._gzip.compress(data) + self._gzip.flush()
+
+
+class CompressionMiddleware:
+    """Brotli/gzip compression for responses with an allowlisted content type.
+
+    Bodies smaller than ``minimum_size`` go out as they are. Streamed bodies
+    are compressed chunk by chunk. Responses that already have a
+    Content-Encoding, and partial content, pass through.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = RESPONSE_COMPRESSION_MIN_SIZE) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        accepted = accepted_encodings(Headers(scope=scope).get("accept-encoding", ""))
+        if brotli is not None and "br" in accepted:
+            encoding = "br"
+        elif "gzip" in accepted:
+            encoding = "gzip"
+        else:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Optional[Message] = None
+        # Body held back until it is known to reach the size threshold.
+        pending: List[bytes] = []
+        compressor: Optional[StreamCompressor] = None
+        passthrough = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start_message, compressor, passthrough
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                if (
+                    message["status"] in (204, 206, 304)
+                    or "content-encoding" in headers
+                    or "content-range" in headers
+                    or not is_compressible_type(headers.get("content-type", ""))
+                ):
+                    passthrough = True
+                    await send(message)
+                else:
+                    start_message = message
+                return
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if compressor is None:
+                pending.append(body)
+                size = sum(len(chunk) for chunk in pending)
+                if more_body and size < self.minimum_size:
+                    return
+                body = b"".join(pending)
+                pending.clear()
+                if not more_body and size < self.minimum_size:
+                    passthrough = True
+                    await send(start_message)
+                    await send({"type": "http.response.body", "body": body, "more_body": False})
+                    return
+                compressor = StreamCompressor(encoding)
+                headers = MutableHeaders(scope=start_message)
+                headers["Content-Encoding"] = encoding
+                headers.add_vary_header("Accept-Encoding")
+                etag = headers.get("etag")
+                if etag and not etag.startswith("W/"):
+                    headers["ETag"] = f"W/{etag}"
+                if more_body:
+                    if "content-length" in headers:
+                        del headers["Content-Length"]
+                else:
+                    body = compressor.finish(body)
+                    headers["Content-Length"] = str(len(body))
+                    await send(start_message)
+                    await send({"type": "http.response.body", "body": body, "more_body": False})
+                    return
+                await send(start_message)
+            body = compressor.compress(body) if more_body else compressor.finish(body)
+            await send({"type": "http.response.body", "body": body, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
+
+
+# Added before the http middleware below so it wraps the route responses
+# directly, which still carry their Content-Length in a single body message.
+if RESPONSE_COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+
+
+class ImageUploadLimitMiddleware:
+    """Stop reading image uploads once they pass the size limit.
+
+    Starlette receives and spools the whole multipart body before the route
+    runs, so ``read_image_upload`` alone would only see the size afterwards.
+    Here a Content-Length over the limit is refused before the first body
+    chunk is read, and a body without one is cut off as soon as it passes
+    the limit. The 413 is raised from ``receive`` as an HTTPException, so it
+    gets the usual error response, CORS headers included.
+    """
+
+    def __init__(
+        self, app: ASGIApp, max_body_size: int = MAX_IMAGE_UPLOAD_BYTES + UPLOAD_CHUNK_SIZE
+    ) -> None:
+        self.app = app
+        # Leaves room for the multipart boundaries and part headers.
+        self.max_body_size = max_body_size
+
+    @staticmethod
+    def applies_to(scope: Scope) -> bool:
+        path = scope["path"]
+        return (
+            scope["method"] == "PUT"
+            and path.startswith("/api/projects/")
+            and path.endswith("/image")
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.applies_to(scope):
+            await self.app(scope, receive, send)
+            return
+        content_length = Headers(scope=scope).get("content-length", "")
+        declared_size = int(content_length) if content_length.isdigit() else None
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            if declared_size is not None and declared_size > self.max_body_size:
+                raise HTTPException(status_code=413, detail="Image exceeds the upload size limit")
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body_size:
+                    raise HTTPException(
+                        status_code=413, detail="Image exceeds the upload size limit"
+                    )
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+
+app.add_middleware(ImageUploadLimitMiddleware)
+
+
+@app.middleware("http")
+async def stamp_last_write(request: Request, call_next: Any) -> Response:
+    response = await call_next(request)
+    if request.method not in SAFE_HTTP_METHODS and response.status_code < 400:
+        response.headers[LAST_WRITE_HEADER] = f"{time.time():.3f}"
+    return response
+
+
+class FrontendStaticFiles(StaticFiles):
+    """The React build: precompressed variants, cache headers, SPA routing.
+
+    ``x.js.br`` or ``x.js.gz`` next to ``x.js`` is sent instead when the client
+    accepts it. Hashed files under ``static/`` are cached as immutable, and any
+    other path without a file extension gets index.html.
+    """
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        if path == "api" or path.startswith("api/"):
+            raise StarletteHTTPException(status_code=404)
+        try:
+            return await super().get_response(path, scope)
+        except StarletteHTTPException as exc:
+            if exc.status_code != 404 or "." in os.path.basename(path):
+                raise
+        return await super().get_response("index.html", scope)
+
+    def file_response(
+        self,
+        full_path: Any,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        request_headers = Headers(scope=scope)
+        relative_path = os.path.relpath(full_path, self.directory)
+        headers = {
+            "Vary": "Accept-Encoding",
+            "Cache-Control": (
+                "public, max-age=31536000, immutable"
+                if relative_path.startswith("static" + os.sep)
+                else "no-cache"
+            ),
+        }
+        media_type = mimetypes.guess_type(str(full_path))[0] or "text/plain"
+        accepted = accepted_encodings(request_headers.get("accept-encoding", ""))
+        for encoding, suffix in (("br", ".br"), ("gzip", ".gz")):
+            if encoding not in accepted:
+                continue
+            try:
+                variant_stat = os.stat(f"{full_path}{suffix}")
+            except OSError:
+                continue
+            full_path, stat_result = f"{full_path}{suffix}", variant_stat
+            headers["Content-Encoding"] = encoding
+            break
+        response = FileResponse(
+            full_path,
+            status_code=status_code,
+            headers=headers,
+            media_type=media_type,
+            stat_result=stat_result,
+        )
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
 
 
 # ==================== AUTH ROUTES ====================
@@ -1759,8 +4409,13 @@ async def on_shutdown() -> None:
 async def login(login_data: LoginRequest, session: AsyncSession = Depends(get_session)) -> Token:
     result = await session.execute(select(UserTable).where(UserTable.email == login_data.email))
     user = result.scalar_one_or_none()
-    if user is None or not verify_password(login_data.password, user.password_hash):
+    if user is None or not await asyncio.to_thread(
+        verify_password, login_data.password, user.password_hash
+    ):
         raise HTTPException(status_code=401, detail="Incorrect email or password")
+    if password_needs_rehash(user.password_hash):
+        user.password_hash = await asyncio.to_thread(hash_password, login_data.password)
+        await session.commit()
 
     expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token({"sub": user.id}, expires)
@@ -1791,7 +4446,7 @@ async def create_user(
         email=user.email,
         username=user.username,
         role=user.role,
-        password_hash=hash_password(user.password),
+        password_hash=await asyncio.to_thread(hash_password, user.password),
     )
     session.add(user_in_db)
     await session.commit()
@@ -1917,6 +4572,21 @@ async def reset_project_access(
     return {"message": "Project access reset"}
 
 
+@api_router.get("/backups/sqlite", response_model=SqliteBackupStatus)
+async def get_sqlite_backup_status(
+    current_user: UserProfile = Depends(require_admin),
+) -> SqliteBackupStatus:
+    return await asyncio.to_thread(sqlite_backup_status)
+
+
+@api_router.post("/backups/sqlite", response_model=SqliteBackupStatus)
+async def create_sqlite_backup(
+    current_user: UserProfile = Depends(require_admin),
+) -> SqliteBackupStatus:
+    await perform_sqlite_backup()
+    return await asyncio.to_thread(sqlite_backup_status)
+
+
 # ==================== PROJECT ROUTES ====================
 
 
@@ -1932,6 +4602,8 @@ async def create_project(
         created_by=current_user.id,
     )
     session.add(project_obj)
+    await session.flush()
+    record_project_shard(session, project_obj.id, await choose_project_shard(session))
     await session.commit()
     await session.refresh(project_obj)
     return to_schema(Project, project_obj)
@@ -1940,9 +4612,9 @@ async def create_project(
 @api_router.get("/projects", response_model=List[Project])
 async def get_projects(
     current_user: UserProfile = Depends(get_current_user),
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
 ) -> List[Project]:
-    stmt = select(ProjectTable)
+    stmt = select(ProjectTable).where(ProjectTable.deleted_at.is_(None))
 
     if current_user.role != "admin":
         hidden_stmt = select(ProjectAccessTable.project_id).where(
@@ -1962,27 +4634,293 @@ async def get_projects(
 async def get_project(
     project_id: str,
     current_user: UserProfile = Depends(get_current_user),
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
 ) -> Project:
     project = await get_project_or_404(session, project_id, current_user)
     return to_schema(Project, project)
 
 
-@api_router.delete("/projects/{project_id}")
-async def delete_project(
-    project_id: str,
-    current_user: UserProfile = Depends(require_editor),
-    session: AsyncSession = Depends(get_session),
-) -> Dict[str, str]:
-    project = await get_project_or_404(session, project_id, current_user)
-    await session.delete(project)
-    await purge_project_children(session, project_id)
-    return {"message": "Project deleted successfully"}
+@api_router.post("/projects/{project_id}/clone", response_model=Project)
+async def clone_project(
+    project_id: str,
+    payload: ProjectCloneRequest,
+    current_user: UserProfile = Depends(require_editor),
+    session: AsyncSession = Depends(get_session),
+) -> Project:
+    sections = set(payload.sections) if payload.sections is not None else None
+    unknown_sections = (sections or set()) - KNOWN_SECTIONS
+    if unknown_sections:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown sections: {', '.join(sorted(unknown_sections))}",
+        )
+
+    source = await get_project_or_404(session, project_id, current_user)
+    clone = ProjectTable(
+        name=payload.name or f"{source.name} (Copy)",
+        description=(
+            payload.description if payload.description is not None else source.description
+        ),
+        created_by=current_user.id,
+    )
+    session.add(clone)
+    await session.flush()
+    # INSERT ... SELECT only works within one database, so the clone stays on
+    # the source project's shard.
+    record_project_shard(session, clone.id, session_shard(session))
+    await clone_project_rows(session, source.id, clone.id, sections)
+    await session.commit()
+    await session.refresh(clone)
+    return to_schema(Project, clone)
+
+
+@api_router.delete("/projects/{project_id}")
+async def delete_project(
+    project_id: str,
+    current_user: UserProfile = Depends(require_editor),
+    session: AsyncSession = Depends(get_session),
+) -> Dict[str, str]:
+    project = await get_project_or_404(session, project_id, current_user)
+    project.deleted_at = _utcnow()
+    await session.commit()
+    evict_project_export_fragments(project_id)
+    _project_reaper_wakeup.set()
+    return {"message": "Project deleted successfully"}
+
+
+SQLITE_UUID_SQL = (
+    "lower(hex(randomblob(4))) || '-' || lower(hex(randomblob(2))) || '-4' || "
+    "substr(lower(hex(randomblob(2))), 2) || '-' || "
+    "substr('89ab', 1 + (abs(random()) % 4), 1) || "
+    "substr(lower(hex(randomblob(2))), 2) || '-' || lower(hex(randomblob(6)))"
+)
+
+SQL_UUID_EXPRESSIONS: Dict[str, str] = {
+    "sqlite": SQLITE_UUID_SQL,
+    "postgresql": "CAST(gen_random_uuid() AS VARCHAR)",
+    "mysql": "UUID()",
+    "mariadb": "UUID()",
+}
+
+
+def sql_uuid_expression(dialect_name: str) -> Any:
+    """Server-side expression producing a fresh UUID string per row."""
+    try:
+        return literal_column(SQL_UUID_EXPRESSIONS[dialect_name])
+    except KeyError as exc:
+        raise HTTPException(
+            status_code=501, detail=f"Cloning is not supported on {dialect_name}"
+        ) from exc
+
+
+def clone_table_plan(
+    sections: Optional[Set[str]],
+) -> List[Tuple[Type[ProjectLinkedMixin], Optional[Any]]]:
+    """Tables to copy for a clone, each with an optional extra row filter."""
+    plan: List[Tuple[Type[ProjectLinkedMixin], Optional[Any]]] = []
+    for table in TABLES_TO_PURGE:
+        if table is ProjectTableVersionTable:
+            continue
+        if sections is None:
+            plan.append((table, None))
+            continue
+        if table is SectionRowTable:
+            plan.append((table, SectionRowTable.section.in_(sections)))
+            continue
+        if table is SingleEntryFieldTable:
+            fields = [
+                field_name
+                for field_name, section in SINGLE_ENTRY_FIELD_SECTIONS.items()
+                if section in sections
+            ]
+            if fields:
+                plan.append((table, SingleEntryFieldTable.field_name.in_(fields)))
+            continue
+        section = TYPED_TABLE_SECTIONS.get(table.__tablename__)
+        if section is None:
+            section = next(
+                (
+                    key[0]
+                    for key, meta in SECTION_TABLE_REGISTRY.items()
+                    if meta.model is table
+                ),
+                None,
+            )
+        if section in sections:
+            plan.append((table, None))
+    return plan
+
+
+async def clone_project_rows(
+    session: AsyncSession,
+    source_project_id: str,
+    target_project_id: str,
+    sections: Optional[Set[str]] = None,
+) -> None:
+    """Copy a project's rows with one INSERT ... SELECT per table; caller commits."""
+    new_id = sql_uuid_expression(shard_dialect_name(session))
+    for table, extra_filter in clone_table_plan(sections):
+        columns = [
+            column.name
+            for column in table.__table__.columns
+            if column.name not in EXPORT_COLUMN_EXCLUDES
+        ]
+        source_columns = [table.__table__.c[name] for name in columns]
+        stmt = select(new_id, literal(target_project_id), *source_columns).where(
+            table.project_id == source_project_id
+        )
+        if extra_filter is not None:
+            stmt = stmt.where(extra_filter)
+        await session.execute(
+            insert(table).from_select(["id", "project_id", *columns], stmt)
+        )
+
+
+WRITE_QUEUE_ENABLED = os.environ.get("WRITE_QUEUE_ENABLED", "false").lower() in {"1", "true", "yes"}
+WRITE_QUEUE_WINDOW_SECONDS = float(os.environ.get("WRITE_QUEUE_WINDOW_SECONDS", "0"))
+WRITE_QUEUE_MAX_BATCH = max(1, int(os.environ.get("WRITE_QUEUE_MAX_BATCH", "64")))
+
+WriteUnit = Callable[[AsyncSession], Awaitable[Any]]
+
+
+class WriteQueue:
+    """Single writer that group-commits work units submitted by requests.
+
+    Units that queue up while a batch is committing, plus any arriving within
+    ``WRITE_QUEUE_WINDOW_SECONDS``, are run one after another in a single
+    transaction, each inside a savepoint so
+    a failing unit only rolls back its own changes. The transaction commits
+    once and every caller receives its unit's result or exception.
+    """
+
+    def __init__(
+        self, session_factory: async_sessionmaker, window_seconds: float, max_batch: int
+    ) -> None:
+        self.session_factory = session_factory
+        self.window_seconds = window_seconds
+        self.max_batch = max_batch
+        self._queue: "asyncio.Queue[Tuple[WriteUnit, asyncio.Future]]" = asyncio.Queue()
+
+    async def submit(self, unit: WriteUnit) -> Any:
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((unit, future))
+        return await future
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                batch = [await self._queue.get()]
+                # Units queued while the previous batch was committing join
+                # this one straight away; the window optionally waits for more.
+                while len(batch) < self.max_batch and not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                deadline = loop.time() + self.window_seconds
+                while len(batch) < self.max_batch:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+                await self._commit_batch(batch)
+        finally:
+            while not self._queue.empty():
+                _, future = self._queue.get_nowait()
+                if not future.done():
+                    future.set_exception(RuntimeError("Write queue stopped"))
+
+    async def _commit_batch(self, batch: List[Tuple[WriteUnit, asyncio.Future]]) -> None:
+        outcomes: List[Tuple[asyncio.Future, Optional[BaseException], Any]] = []
+        try:
+            async with self.session_factory() as session:
+                if shard_dialect_name(session) == "sqlite":
+                    # Take the write lock up front; the driver would otherwise
+                    # let the first savepoint's release commit the batch.
+                    await session.execute(
+                        text("BEGIN IMMEDIATE"),
+                        bind_arguments={"mapper": ProjectTableVersionTable},
+                    )
+                for unit, future in batch:
+                    if future.done():
+                        continue
+                    try:
+                        async with session.begin_nested():
+                            result = await unit(session)
+                    except Exception as exc:
+                        outcomes.append((future, exc, None))
+                    else:
+                        outcomes.append((future, None, result))
+                await session.commit()
+        except BaseException as exc:
+            error = exc if isinstance(exc, Exception) else RuntimeError("Write queue stopped")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+            if error is not exc:
+                raise
+            return
+
+        for future, error, result in outcomes:
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+
+# One writer per shard, since a batch commits on a single database.
+_write_queues: Dict[str, WriteQueue] = {}
+
+
+async def perform_write(session: AsyncSession, unit: WriteUnit) -> Any:
+    """Run a write unit and commit it.
+
+    With the write queue enabled the unit is group-committed by the single
+    writer on its own session; otherwise it runs on ``session``, which is
+    committed straight away.
+    """
+    write_queue = _write_queues.get(session_shard(session))
+    if write_queue is not None:
+        # Hand the request's connection back to the pool while waiting, so a
+        # burst of queued requests cannot starve the writer of a connection.
+        await session.commit()
+        return await write_queue.submit(unit)
+    result = await unit(session)
+    await session.commit()
+    return result
 
 
 # ==================== SHARED CRUD HELPERS ====================
 
 
+async def append_milestone_column(
+    session: AsyncSession,
+    table: Type[TableType],
+    schema: Type[SchemaType],
+    project_id: str,
+    column_name: str,
+) -> SchemaType:
+    """Add a column after the project's last one.
+
+    The next order is computed by the INSERT itself, so two concurrent
+    creates cannot both read the same ``max(order)``.
+    """
+    next_order = (
+        select(func.coalesce(func.max(table.order), 0) + 1)
+        .where(table.project_id == project_id)
+        .scalar_subquery()
+    )
+    column = table(project_id=project_id, column_name=column_name, order=next_order)
+    session.add(column)
+    await bump_table_version(session, project_id, table.__tablename__)
+    await session.flush()
+    await session.refresh(column)
+    return to_schema(schema, column)
+
+
 async def create_project_item(
     session: AsyncSession,
     table: Type[TableType],
@@ -1992,11 +4930,15 @@ async def create_project_item(
     current_user: Optional["UserProfile"] = None,
 ) -> SchemaType:
     await get_project_or_404(session, project_id, current_user)
-    obj = table(project_id=project_id, **payload.model_dump())
-    session.add(obj)
-    await session.commit()
-    await session.refresh(obj)
-    return to_schema(schema, obj)
+
+    async def write(session: AsyncSession) -> SchemaType:
+        obj = table(project_id=project_id, **payload.model_dump())
+        session.add(obj)
+        await bump_table_version(session, project_id, table.__tablename__)
+        await session.flush()
+        return to_schema(schema, obj)
+
+    return await perform_write(session, write)
 
 
 async def list_project_items(
@@ -2005,14 +4947,33 @@ async def list_project_items(
     schema: Type[SchemaType],
     project_id: str,
     order_by: Optional[Any] = None,
+    response_format: str = "rows",
     current_user: Optional["UserProfile"] = None,
-) -> List[SchemaType]:
+) -> Response:
     await get_project_or_404(session, project_id, current_user)
-    stmt = select(table).where(table.project_id == project_id)
+    columns = schema_columns(table, schema)
+    columnar = response_format == "columnar"
+    if columns is None:
+        stmt = select(table)
+    elif columnar:
+        stmt = select(*(column for column in columns if column.name != "project_id"))
+    else:
+        stmt = select(*columns)
+    stmt = stmt.where(table.project_id == project_id)
     if order_by is not None:
         stmt = stmt.order_by(order_by)
     result = await session.execute(stmt)
-    return [to_schema(schema, row) for row in result.scalars().all()]
+    if columns is None:
+        items = [to_schema(schema, row).model_dump(mode="json") for row in result.scalars().all()]
+        if not columnar:
+            return FastJSONResponse(items)
+        names = [name for name in schema.model_fields if name != "project_id"]
+        return columnar_response(
+            names, [[item[name] for name in names] for item in items], project_id=project_id
+        )
+    if columnar:
+        return columnar_response(list(result.keys()), result.all(), project_id=project_id)
+    return FastJSONResponse([dict(row) for row in result.mappings()])
 
 
 async def update_project_item(
@@ -2026,15 +4987,19 @@ async def update_project_item(
     current_user: Optional["UserProfile"] = None,
 ) -> SchemaType:
     await get_project_or_404(session, project_id, current_user)
-    obj = await get_item_or_404(session, table, item_id, project_id)
     data = payload.model_dump()
     if extra_updates:
         data.update(extra_updates)
-    for key, value in data.items():
-        setattr(obj, key, value)
-    await session.commit()
-    await session.refresh(obj)
-    return to_schema(schema, obj)
+
+    async def write(session: AsyncSession) -> SchemaType:
+        obj = await get_item_or_404(session, table, item_id, project_id)
+        for key, value in data.items():
+            setattr(obj, key, value)
+        await bump_table_version(session, project_id, table.__tablename__)
+        await session.flush()
+        return to_schema(schema, obj)
+
+    return await perform_write(session, write)
 
 
 async def delete_project_item(
@@ -2045,9 +5010,13 @@ async def delete_project_item(
     current_user: Optional["UserProfile"] = None,
 ) -> Dict[str, str]:
     await get_project_or_404(session, project_id, current_user)
-    obj = await get_item_or_404(session, table, item_id, project_id)
-    await session.delete(obj)
-    await session.commit()
+
+    async def write(session: AsyncSession) -> None:
+        obj = await get_item_or_404(session, table, item_id, project_id)
+        await session.delete(obj)
+        await bump_table_version(session, project_id, table.__tablename__)
+
+    await perform_write(session, write)
     return {"message": "Item deleted successfully"}
 
 
@@ -2071,17 +5040,19 @@ async def create_revision_history(
     )
 
 
-@api_router.get("/projects/{project_id}/revision-history", response_model=List[RevisionHistory])
+@api_router.get("/projects/{project_id}/revision-history", responses=list_responses(RevisionHistory))
 async def get_revision_history(
     project_id: str,
+    response_format: str = Depends(list_response_format),
     current_user: UserProfile = Depends(get_current_user),
-    session: AsyncSession = Depends(get_session),
-) -> List[RevisionHistory]:
+    session: AsyncSession = Depends(get_read_session),
+) -> Response:
     return await list_project_items(
         session,
         RevisionHistoryTable,
         RevisionHistory,
         project_id,
+        response_format=response_format,
         current_user=current_user,
     )
 
@@ -2138,17 +5109,19 @@ async def create_toc_entry(
     )
 
 
-@api_router.get("/projects/{project_id}/toc-entries", response_model=List[TOCEntry])
+@api_router.get("/projects/{project_id}/toc-entries", responses=list_responses(TOCEntry))
 async def get_toc_entries(
     project_id: str,
+    response_format: str = Depends(list_response_format),
     current_user: UserProfile = Depends(get_current_user),
-    session: AsyncSession = Depends(get_session),
-) -> List[TOCEntry]:
+    session: AsyncSession = Depends(get_read_session),
+) -> Response:
     return await list_project_items(
         session,
         TOCEntryTable,
         TOCEntry,
         project_id,
+        response_format=response_format,
         current_user=current_user,
     )
 
@@ -2205,17 +5178,19 @@ async def create_definition_acronym(
     )
 
 
-@api_router.get("/projects/{project_id}/definition-acronyms", response_model=List[DefinitionAcronym])
+@api_router.get("/projects/{project_id}/definition-acronyms", responses=list_responses(DefinitionAcronym))
 async def get_definition_acronyms(
     project_id: str,
+    response_format: str = Depends(list_response_format),
     current_user: UserProfile = Depends(get_current_user),
-    session: AsyncSession = Depends(get_session),
-) -> List[DefinitionAcronym]:
+    session: AsyncSession = Depends(get_read_session),
+) -> Response:
     return await list_project_items(
         session,
         DefinitionAcronymTable,
         DefinitionAcronym,
         project_id,
+        response_format=response_format,
         current_user=current_user,
     )
 
@@ -2263,173 +5238,1632 @@ async def create_or_update_single_entry(
     session: AsyncSession = Depends(get_session),
 ) -> SingleEntryField:
     await get_project_or_404(session, project_id, current_user)
-    stmt = select(SingleEntryFieldTable).where(
+
+    # Omitting image_data keeps the stored image; an explicit null removes it.
+    replace_image = "image_data" in item.model_fields_set
+    blob: Optional[Dict[str, Any]] = None
+    if item.image_data:
+        parsed = parse_image_data_url(item.image_data)
+        if parsed is None:
+            raise HTTPException(status_code=400, detail="Unsupported image data")
+        # Hash and measure before queuing so the writer only runs the INSERTs.
+        blob = await prepare_image_blob(*parsed)
+
+    async def write(session: AsyncSession) -> Tuple[SingleEntryField, Optional[str]]:
+        image_id: Optional[str] = None
+        if blob is not None:
+            await insert_image_blob(session, **blob)
+            image_id = blob["id"]
+
+        stmt = select(SingleEntryFieldTable).where(
+            SingleEntryFieldTable.project_id == project_id,
+            SingleEntryFieldTable.field_name == item.field_name,
+        )
+        existing = await session.execute(stmt)
+        row = existing.scalar_one_or_none()
+        if row is None:
+            row = SingleEntryFieldTable(
+                project_id=project_id,
+                field_name=item.field_name,
+                content=item.content,
+                image_id=image_id,
+            )
+            session.add(row)
+        else:
+            row.content = item.content
+            if replace_image and row.image_id != image_id:
+                previous_image_id = row.image_id
+                row.image_id = image_id
+                await release_image_blob(session, previous_image_id)
+
+        await bump_table_version(session, project_id, SingleEntryFieldTable.__tablename__)
+        await session.flush()
+        result = await session.execute(
+            single_entry_select().where(SingleEntryFieldTable.id == row.id)
+        )
+        return serialize_single_entry(*result.one()), image_id
+
+    entry, image_id = await perform_write(session, write)
+    schedule_image_renditions(image_id, session_shard(session))
+    return entry
+
+
+@api_router.get("/projects/{project_id}/single-entry", response_model=List[SingleEntryField])
+async def get_single_entries(
+    project_id: str,
+    fields: Optional[str] = None,
+    current_user: UserProfile = Depends(get_current_user),
+    session: AsyncSession = Depends(get_read_session),
+) -> List[SingleEntryField]:
+    """Return several single-entry fields (all when ``fields`` is omitted).
+
+    Images are referenced by URL only, so the response never carries image bytes.
+    """
+    await get_project_or_404(session, project_id, current_user)
+    stmt = single_entry_select().where(SingleEntryFieldTable.project_id == project_id)
+    field_names = _split_csv_param(fields)
+    if field_names is not None:
+        stmt = stmt.where(SingleEntryFieldTable.field_name.in_(field_names))
+    result = await session.execute(stmt.order_by(SingleEntryFieldTable.field_name))
+    return [serialize_single_entry(*entry) for entry in result.all()]
+
+
+@api_router.get("/projects/{project_id}/single-entry/{field_name}", response_model=Optional[SingleEntryField])
+async def get_single_entry(
+    project_id: str,
+    field_name: str,
+    current_user: UserProfile = Depends(get_current_user),
+    session: AsyncSession = Depends(get_read_session),
+) -> Optional[SingleEntryField]:
+    await get_project_or_404(session, project_id, current_user)
+    stmt = single_entry_select().where(
         SingleEntryFieldTable.project_id == project_id,
-        SingleEntryFieldTable.field_name == item.field_name,
+        SingleEntryFieldTable.field_name == field_name,
     )
-    existing = await session.execute(stmt)
-    row = existing.scalar_one_or_none()
-    if row is None:
-        new_item = SingleEntryFieldTable(project_id=project_id, **item.model_dump())
-        session.add(new_item)
-        await session.commit()
-        await session.refresh(new_item)
-        return to_schema(SingleEntryField, new_item)
+    result = await session.execute(stmt)
+    entry = result.one_or_none()
+    if entry is None:
+        return None
+    return serialize_single_entry(*entry)
 
-    row.content = item.content
-    row.image_data = item.image_data
-    await session.commit()
-    await session.refresh(row)
-    return to_schema(SingleEntryField, row)
+
+@api_router.get("/projects/{project_id}/single-entry/{field_name}/image")
+async def get_single_entry_image(
+    project_id: str,
+    field_name: str,
+    request: Request,
+    v: Optional[str] = None,
+    rendition: Optional[str] = None,
+    current_user: UserProfile = Depends(get_current_user),
+    session: AsyncSession = Depends(get_read_session),
+) -> Response:
+    if rendition is not None and rendition not in RENDITION_SIZES:
+        raise HTTPException(status_code=400, detail="Unknown rendition")
+    await get_project_or_404(session, project_id, current_user)
+    result = await session.execute(
+        select(SingleEntryFieldTable.image_id).where(
+            SingleEntryFieldTable.project_id == project_id,
+            SingleEntryFieldTable.field_name == field_name,
+        )
+    )
+    image_id = result.scalar_one_or_none()
+    if image_id is None:
+        raise HTTPException(status_code=404, detail="Image not found")
+
+    source: Any = ImageBlobTable
+    source_filter: Any = ImageBlobTable.id == image_id
+    etag = f'"{image_id}"'
+    blob = None
+    if rendition is not None:
+        rendition_filter = (ImageRenditionTable.image_id == image_id) & (
+            ImageRenditionTable.kind == rendition
+        )
+        blob = (
+            await session.execute(
+                select(ImageRenditionTable.content_type, ImageRenditionTable.size).where(
+                    rendition_filter
+                )
+            )
+        ).one_or_none()
+        if blob is not None:
+            source, source_filter = ImageRenditionTable, rendition_filter
+            etag = f'"{image_id}-{rendition}"'
+    if blob is None:
+        blob = (
+            await session.execute(
+                select(ImageBlobTable.content_type, ImageBlobTable.size).where(source_filter)
+            )
+        ).one_or_none()
+    if blob is None:
+        raise HTTPException(status_code=404, detail="Image not found")
+    content_type, size = blob
+
+    headers = {
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+        "Cache-Control": (
+            "private, max-age=31536000, immutable" if v == image_id else "private, no-cache"
+        ),
+    }
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and (
+        if_none_match.strip() == "*"
+        or headers["ETag"] in [tag.strip() for tag in if_none_match.split(",")]
+    ):
+        return Response(status_code=304, headers=headers)
+
+    byte_range = None
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and (not if_range or if_range.strip() == headers["ETag"]):
+        byte_range = parse_byte_range(range_header, size)
+
+    if byte_range is None:
+        data_column: Any = source.data
+        status_code = 200
+    else:
+        start, end = byte_range
+        data_column = func.substr(source.data, start + 1, end - start + 1)
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+        status_code = 206
+
+    data_result = await session.execute(select(data_column).where(source_filter))
+    return Response(
+        content=data_result.scalar_one(),
+        status_code=status_code,
+        media_type=content_type,
+        headers=headers,
+    )
+
+
+@api_router.put(
+    "/projects/{project_id}/single-entry/{field_name}/image",
+    response_model=SingleEntryField,
+)
+async def upload_single_entry_image(
+    project_id: str,
+    field_name: str,
+    file: UploadFile = File(...),
+    current_user: UserProfile = Depends(require_editor),
+    session: AsyncSession = Depends(get_session),
+) -> SingleEntryField:
+    await get_project_or_404(session, project_id, current_user)
+    # Validate before queuing so the writer never waits on a slow upload.
+    blob = await uploaded_image_blob(file, await read_image_upload(file))
+    image_id = blob["id"]
+
+    async def write(session: AsyncSession) -> Tuple[SingleEntryField, str]:
+        await insert_image_blob(session, **blob)
+        result = await session.execute(
+            select(SingleEntryFieldTable).where(
+                SingleEntryFieldTable.project_id == project_id,
+                SingleEntryFieldTable.field_name == field_name,
+            )
+        )
+        row = result.scalar_one_or_none()
+        if row is None:
+            row = SingleEntryFieldTable(
+                project_id=project_id, field_name=field_name, content="", image_id=image_id
+            )
+            session.add(row)
+        elif row.image_id != image_id:
+            previous_image_id = row.image_id
+            row.image_id = image_id
+            await release_image_blob(session, previous_image_id)
+
+        await bump_table_version(session, project_id, SingleEntryFieldTable.__tablename__)
+        await session.flush()
+        result = await session.execute(
+            single_entry_select().where(SingleEntryFieldTable.id == row.id)
+        )
+        return serialize_single_entry(*result.one()), image_id
+
+    entry, image_id = await perform_write(session, write)
+    schedule_image_renditions(image_id, session_shard(session))
+    return entry
+
+
+async def _build_table_sheet(
+    session: AsyncSession,
+    project_id: str,
+    model: Type[ProjectLinkedMixin],
+    sheet_title: str,
+    columns: Sequence[str],
+) -> Optional[ExportSheet]:
+    stmt = select(model).where(model.project_id == project_id)
+    rows = (await session.execute(stmt)).scalars().all()
+    if not rows or not columns:
+        return None
+
+    return ExportSheet(
+        title=sheet_title,
+        columns=list(columns),
+        rows=[
+            [format_cell_value(getattr(row, column)) for column in columns]
+            for row in rows
+        ],
+    )
+
+
+async def _collect_section_sheets(
+    session: AsyncSession,
+    project_id: str,
+    selection: ExportSelection,
+    versions: Dict[str, int],
+) -> List[ExportSheet]:
+    specs = [
+        (meta, f"{section} {table_name.replace('_', ' ').title()}")
+        for (section, table_name), meta in SECTION_TABLE_REGISTRY.items()
+        if selection.includes(section, table_name)
+    ]
+    fragments: Dict[str, Tuple[ExportSheet, ...]] = {}
+    stale: List[Tuple[SectionTableMeta, str]] = []
+    for meta, sheet_title in specs:
+        cached = get_cached_export_fragment(
+            (project_id, meta.table_name, None), versions.get(meta.table_name, 0)
+        )
+        if cached is None:
+            stale.append((meta, sheet_title))
+        else:
+            fragments[meta.table_name] = cached
+
+    documents: Dict[str, List[Dict[str, Any]]] = {}
+    if SECTION_DOCUMENT_STORAGE and stale:
+        # One query covers every stale table instead of one per table.
+        result = await session.execute(
+            select(SectionRowTable.table_name, SectionRowTable.data).where(
+                SectionRowTable.project_id == project_id,
+                SectionRowTable.table_name.in_([meta.table_name for meta, _ in stale]),
+            )
+        )
+        for table_name, data in result.all():
+            documents.setdefault(table_name, []).append(data)
+
+    for meta, sheet_title in stale:
+        if SECTION_DOCUMENT_STORAGE:
+            rows = documents.get(meta.table_name, [])
+            sheet = (
+                ExportSheet(
+                    title=sheet_title,
+                    columns=list(meta.columns),
+                    rows=[
+                        [format_cell_value(data.get(column)) for column in meta.columns]
+                        for data in rows
+                    ],
+                )
+                if rows and meta.columns
+                else None
+            )
+        else:
+            sheet = await _build_table_sheet(
+                session, project_id, meta.model, sheet_title, meta.columns
+            )
+        fragments[meta.table_name] = (sheet,) if sheet is not None else ()
+        store_export_fragment(
+            (project_id, meta.table_name, None),
+            versions.get(meta.table_name, 0),
+            fragments[meta.table_name],
+        )
+    return [sheet for meta, _ in specs for sheet in fragments[meta.table_name]]
+
+
+async def collect_project_export(
+    session: AsyncSession,
+    project: ProjectTable,
+    selection: Optional[ExportSelection] = None,
+) -> ProjectExportData:
+    """Gather the export payload, reusing cached sheet fragments.
+
+    Each table's fragment is cached against the table's content version, so
+    only tables written since the previous export are queried and rebuilt.
+    """
+    if selection is None:
+        selection = ExportSelection()
+    project_id = project.id
+    versions = await fetch_table_versions(session, project_id)
+
+    created_at = getattr(project, "created_at", None)
+    summary_rows = [
+        ("Project ID", project.id),
+        ("Project Name", project.name),
+        ("Description", project.description or ""),
+        ("Created By", project.created_by),
+        (
+            "Created At",
+            created_at.isoformat() if isinstance(created_at, datetime) else "",
+        ),
+    ]
+
+    single_entries: List[ExportSingleEntry] = []
+    selected_fields = selection.single_entry_fields()
+    if selected_fields is None or selected_fields:
+        table_name = SingleEntryFieldTable.__tablename__
+        version = versions.get(table_name, 0)
+        key = (
+            project_id,
+            table_name,
+            None if selected_fields is None else tuple(sorted(selected_fields)),
+        )
+        cached = get_cached_export_fragment(key, version)
+        if cached is not None:
+            single_entries = cached
+        else:
+            # Prefer the pre-scaled export rendition; fall back to the original
+            # while the rendition is still being generated.
+            single_entry_stmt = (
+                select(
+                    SingleEntryFieldTable.field_name,
+                    SingleEntryFieldTable.content,
+                    func.coalesce(ImageRenditionTable.data, ImageBlobTable.data),
+                    func.coalesce(ImageRenditionTable.width, ImageBlobTable.width),
+                    func.coalesce(ImageRenditionTable.height, ImageBlobTable.height),
+                )
+                .outerjoin(ImageBlobTable, ImageBlobTable.id == SingleEntryFieldTable.image_id)
+                .outerjoin(
+                    ImageRenditionTable,
+                    (ImageRenditionTable.image_id == SingleEntryFieldTable.image_id)
+                    & (ImageRenditionTable.kind == "export"),
+                )
+                .where(SingleEntryFieldTable.project_id == project_id)
+                .order_by(SingleEntryFieldTable.field_name)
+            )
+            if selected_fields is not None:
+                single_entry_stmt = single_entry_stmt.where(
+                    SingleEntryFieldTable.field_name.in_(selected_fields)
+                )
+            single_entries = [
+                ExportSingleEntry(*row)
+                for row in (await session.execute(single_entry_stmt)).all()
+            ]
+            store_export_fragment(key, version, single_entries)
+
+    table_specs: List[Tuple[Type[ProjectLinkedMixin], str, Sequence[str]]] = []
+    for sheet_title, model in EXPORT_STATIC_TABLES:
+        table_name = model.__tablename__
+        if not selection.includes(TYPED_TABLE_SECTIONS.get(table_name), table_name):
+            continue
+        columns = [
+            column.name
+            for column in model.__table__.columns
+            if column.name not in EXPORT_COLUMN_EXCLUDES
+        ]
+        table_specs.append((model, sheet_title, columns))
+
+    sheets: List[ExportSheet] = []
+    for model, sheet_title, columns in table_specs:
+        table_name = model.__tablename__
+        version = versions.get(table_name, 0)
+        key = (project_id, table_name, None)
+        cached = get_cached_export_fragment(key, version)
+        if cached is None:
+            # Empty tables are cached as an empty tuple so they are skipped too.
+            sheet = await _build_table_sheet(
+                session, project_id, model, sheet_title, columns
+            )
+            cached = (sheet,) if sheet is not None else ()
+            store_export_fragment(key, version, cached)
+        sheets.extend(cached)
+    sheets.extend(await _collect_section_sheets(session, project_id, selection, versions))
+
+    return ProjectExportData(
+        filename=export_filename(project),
+        summary_rows=summary_rows,
+        single_entries=single_entries,
+        sheets=sheets,
+    )
+
+
+@api_router.get("/projects/{project_id}/export/xlsx")
+async def export_project_xlsx(
+    project_id: str,
+    sections: Optional[str] = None,
+    tables: Optional[str] = None,
+    current_user: UserProfile = Depends(get_current_user),
+    session: AsyncSession = Depends(get_read_session),
+):
+    selection = parse_export_selection(sections, tables)
+    project = await get_project_or_404(session, project_id, current_user)
+    export_data = await collect_project_export(session, project, selection)
+    payload = await asyncio.to_thread(render_project_workbook, export_data)
+
+    headers = {
+        "Content-Disposition": f'attachment; filename="{export_data.filename}"',
+    }
+
+    return StreamingResponse(
+        BytesIO(payload),
+        media_type=XLSX_MEDIA_TYPE,
+        headers=headers,
+    )
+
+
+class _ZipStreamBuffer:
+    """Write-only sink for ``zipfile`` that hands back whatever was written."""
+
+    def __init__(self) -> None:
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def get_export_executor() -> ProcessPoolExecutor:
+    # Workers are spawned rather than forked: the server already runs threads
+    # (to_thread, the database driver) whose locks a fork would copy mid-use.
+    global _export_executor
+    if _export_executor is None:
+        _export_executor = ProcessPoolExecutor(
+            max_workers=EXPORT_MAX_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _export_executor
+
+
+async def stream_projects_zip(
+    project_ids: Sequence[str],
+    selection: Optional[ExportSelection] = None,
+    read: bool = False,
+) -> AsyncGenerator[bytes, None]:
+    """Stream a ZIP of project workbooks, written in the order they finish.
+
+    Projects are collected concurrently, at most ``EXPORT_MAX_WORKERS`` at a
+    time, and rendered in the process pool, so collecting the next projects
+    overlaps with rendering the previous ones. The response has started by
+    the time a project fails, so its workbook is replaced by an
+    ``.error.txt`` entry instead of cutting the archive short.
+    """
+    loop = asyncio.get_running_loop()
+    executor = get_export_executor()
+    # Only a bounded number of workbooks are queued or held in memory at once;
+    # each one is written to the archive and released as soon as it finishes.
+    max_in_flight = EXPORT_MAX_WORKERS * 2
+    collect_slots = asyncio.Semaphore(EXPORT_MAX_WORKERS)
+    pending: Set[asyncio.Future] = set()
+    used_names: Set[str] = set()
+    sink = _ZipStreamBuffer()
+    archive = zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_STORED)
+
+    def write_entry(filename: str, payload: bytes) -> None:
+        stem, _, extension = filename.rpartition(".")
+        candidate = filename
+        counter = 1
+        while candidate in used_names:
+            candidate = f"{stem}_{counter}.{extension}"
+            counter += 1
+        used_names.add(candidate)
+        archive.writestr(candidate, payload)
+
+    async def drain_completed(return_when: str) -> AsyncGenerator[bytes, None]:
+        done, _ = await asyncio.wait(pending, return_when=return_when)
+        for future in done:
+            pending.discard(future)
+            entry = future.result()
+            if entry is not None:
+                write_entry(*entry)
+                yield sink.drain()
+
+    async def export_project(project_id: str) -> Optional[Tuple[str, bytes]]:
+        global _export_executor
+        filename = f"{project_id}.xlsx"
+        try:
+            async with collect_slots:
+                session_factory = await project_session_factory(project_id, read=read)
+                async with session_factory() as session:
+                    result = await session.execute(
+                        select(ProjectTable).where(
+                            ProjectTable.id == project_id, ProjectTable.deleted_at.is_(None)
+                        )
+                    )
+                    project = result.scalar_one_or_none()
+                    if project is None:
+                        return None
+                    filename = export_filename(project)
+                    export_data = await collect_project_export(session, project, selection)
+            payload = await loop.run_in_executor(
+                executor, render_project_workbook, export_data
+            )
+            return export_data.filename, payload
+        except Exception as exc:
+            logger.exception("Exporting project %s to the archive failed", project_id)
+            if isinstance(exc, BrokenProcessPool) and _export_executor is executor:
+                _export_executor = None
+            message = f"This project could not be exported ({type(exc).__name__}).\n"
+            return f"{filename.rpartition('.')[0]}.error.txt", message.encode()
+
+    try:
+        for project_id in project_ids:
+            pending.add(asyncio.ensure_future(export_project(project_id)))
+            while len(pending) >= max_in_flight:
+                async for chunk in drain_completed(asyncio.FIRST_COMPLETED):
+                    yield chunk
+
+        while pending:
+            async for chunk in drain_completed(asyncio.ALL_COMPLETED):
+                yield chunk
+
+        archive.close()
+        yield sink.drain()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+@api_router.post("/export/projects/zip")
+async def export_projects_zip(
+    payload: BulkExportRequest,
+    request: Request,
+    current_user: UserProfile = Depends(require_admin),
+    session: AsyncSession = Depends(get_read_session),
+):
+    selection = parse_export_selection(payload.sections, payload.tables)
+    if payload.all_visible:
+        result = await session.execute(
+            select(ProjectTable.id)
+            .where(ProjectTable.deleted_at.is_(None))
+            .order_by(ProjectTable.name)
+        )
+        project_ids = [row[0] for row in result.all()]
+    else:
+        if not payload.project_ids:
+            raise HTTPException(
+                status_code=400, detail="Provide project_ids or set all_visible"
+            )
+        project_ids = list(dict.fromkeys(payload.project_ids))
+        result = await session.execute(
+            select(ProjectTable.id).where(
+                ProjectTable.id.in_(project_ids), ProjectTable.deleted_at.is_(None)
+            )
+        )
+        missing = set(project_ids) - {row[0] for row in result.all()}
+        if missing:
+            raise HTTPException(status_code=404, detail="Project not found")
+
+    filename = f"projects_{datetime.now(timezone.utc):%Y%m%d_%H%M%S}.zip"
+    headers = {
+        "Content-Disposition": f'attachment; filename="{filename}"',
+    }
+
+    return StreamingResponse(
+        stream_projects_zip(project_ids, selection, read=not prefers_primary(request)),
+        media_type="application/zip",
+        headers=headers,
+    )
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def encode_raw_export_rows(
+    export_format: str, columns: Sequence[str], rows: Sequence[Sequence[Any]]
+) -> str:
+    if export_format == "ndjson":
+        return "".join(
+            json.dumps(dict(zip(columns, row)), ensure_ascii=False, default=_json_default)
+            + "\n"
+            for row in rows
+        )
+    buffer = StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerows([format_cell_value(value) for value in row] for row in rows)
+    return buffer.getvalue()
+
+
+async def stream_table_rows(
+    project_id: str,
+    model: Type[ProjectLinkedMixin],
+    columns: Sequence[str],
+    export_format: str,
+    session_factory: async_sessionmaker = async_session,
+    section_meta: Optional[SectionTableMeta] = None,
+) -> AsyncGenerator[bytes, None]:
+    """Stream a table's rows as CSV or NDJSON from a server-side cursor.
+
+    Rows are fetched ``RAW_EXPORT_CHUNK_ROWS`` at a time and each partition is
+    encoded and sent before the next one is read. ``section_meta`` marks a
+    generic section table, whose rows may be stored as documents.
+    """
+    if export_format == "csv":
+        yield encode_raw_export_rows("csv", columns, [columns]).encode("utf-8")
+
+    documents = section_meta is not None and SECTION_DOCUMENT_STORAGE
+    if documents:
+        stmt = select(SectionRowTable.id, SectionRowTable.data).where(
+            section_rows_filter(section_meta, project_id)
+        )
+    else:
+        table_columns = model.__table__.columns
+        stmt = select(*(table_columns[column] for column in columns)).where(
+            model.project_id == project_id
+        )
+    stmt = stmt.execution_options(yield_per=RAW_EXPORT_CHUNK_ROWS)
+    # The request-scoped session is closed before the response body is sent,
+    # so the stream holds its own.
+    async with session_factory() as session:
+        result = await session.stream(stmt)
+        try:
+            async for partition in result.partitions():
+                if documents:
+                    partition = [
+                        [{**data, "id": row_id}.get(column) for column in columns]
+                        for row_id, data in partition
+                    ]
+                yield encode_raw_export_rows(export_format, columns, partition).encode("utf-8")
+        finally:
+            await result.close()
+
+
+async def raw_table_export_response(
+    request: Request,
+    project: ProjectTable,
+    model: Type[ProjectLinkedMixin],
+    columns: Sequence[str],
+    export_format: str,
+    section_meta: Optional[SectionTableMeta] = None,
+) -> StreamingResponse:
+    media_type = RAW_EXPORT_FORMATS.get(export_format)
+    if media_type is None:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported format. Use one of: {', '.join(RAW_EXPORT_FORMATS)}",
+        )
+    stem = export_filename(project).rsplit(".", 1)[0]
+    filename = f"{stem}_{model.__tablename__}.{export_format}"
+    headers = {
+        "Content-Disposition": f'attachment; filename="{filename}"',
+    }
+    return StreamingResponse(
+        stream_table_rows(
+            project.id,
+            model,
+            columns,
+            export_format,
+            await read_session_factory(request),
+            section_meta,
+        ),
+        media_type=media_type,
+        headers=headers,
+    )
+
+
+@api_router.get("/projects/{project_id}/sections/{section}/tables/{table_name}/export")
+async def export_generic_table_rows(
+    project_id: str,
+    section: str,
+    table_name: str,
+    request: Request,
+    export_format: str = Query("csv", alias="format"),
+    current_user: UserProfile = Depends(get_current_user),
+    session: AsyncSession = Depends(get_read_session),
+):
+    project = await get_project_or_404(session, project_id, current_user)
+    meta = resolve_section_table(section, table_name)
+    return await raw_table_export_response(
+        request, project, meta.model, ["id", *meta.columns], export_format, meta
+    )
+
+
+@api_router.get("/projects/{project_id}/{table_slug}/export")
+async def export_typed_table_rows(
+    project_id: str,
+    table_slug: str,
+    request: Request,
+    export_format: str = Query("csv", alias="format"),
+    current_user: UserProfile = Depends(get_current_user),
+    session: AsyncSession = Depends(get_read_session),
+):
+    model = TYPED_TABLE_SLUGS.get(table_slug)
+    if model is None:
+        raise HTTPException(status_code=404, detail="Table not found")
+    project = await get_project_or_404(session, project_id, current_user)
+    columns = [
+        column.name
+        for column in model.__table__.columns
+        if column.name != "project_id"
+    ]
+    return await raw_table_export_response(request, project, model, columns, export_format)
+
+
+def _next_import_batch(rows: Any) -> List[Tuple[int, Tuple[Any, ...]]]:
+    batch: List[Tuple[int, Tuple[Any, ...]]] = []
+    for row_number, values in rows:
+        if values is None or all(value is None for value in values):
+            continue
+        batch.append((row_number, values))
+        if len(batch) >= IMPORT_BATCH_SIZE:
+            break
+    return batch
+
+
+async def import_sheet_rows(
+    session: AsyncSession,
+    project_id: str,
+    worksheet: Any,
+    target: ImportTarget,
+    report: ImportSheetReport,
+    dry_run: bool,
+) -> None:
+    rows = enumerate(worksheet.iter_rows(values_only=True), start=1)
+    header_row = await asyncio.to_thread(next, rows, None)
+    if header_row is None:
+        return
+    headers = header_row[1]
+    header_to_column = {friendly_header(column): column for column in target.columns}
+    column_indexes: List[Tuple[int, Any]] = []
+    for index, header in enumerate(headers):
+        column_name = header_to_column.get(str(header).strip()) if header is not None else None
+        if column_name is None:
+            if header is not None:
+                report.ignored_columns.append(str(header))
+            continue
+        column_indexes.append((index, target.model.__table__.c[column_name]))
+
+    mapped_columns = {column.name for _, column in column_indexes}
+    missing_required = [
+        friendly_header(column.name)
+        for column in target.model.__table__.columns
+        if column.name in target.columns
+        and not column.nullable
+        and column.name not in mapped_columns
+    ]
+    if missing_required:
+        report.errors.append(f"Missing required columns: {', '.join(missing_required)}")
+        return
+
+    while True:
+        batch = await asyncio.to_thread(_next_import_batch, rows)
+        if not batch:
+            break
+        records: List[Dict[str, Any]] = []
+        for row_number, values in batch:
+            report.rows += 1
+            record: Dict[str, Any] = {"id": str(uuid.uuid4()), "project_id": project_id}
+            try:
+                for index, column in column_indexes:
+                    value = values[index] if index < len(values) else None
+                    record[column.name] = coerce_import_value(column, value)
+            except (TypeError, ValueError) as exc:
+                if len(report.errors) < IMPORT_MAX_REPORTED_ERRORS:
+                    report.errors.append(f"Row {row_number}: {exc}")
+                continue
+            records.append(record)
+        if records and not dry_run:
+            model, meta = target.model, target.section_meta
+            if meta is not None and SECTION_DOCUMENT_STORAGE:
+                model = SectionRowTable
+                records = [
+                    {
+                        "id": record["id"],
+                        "project_id": project_id,
+                        "section": meta.section,
+                        "table_name": meta.table_name,
+                        "data": {column: record.get(column) for column in meta.columns},
+                    }
+                    for record in records
+                ]
+            await session.execute(insert(model), records)
+        report.imported += len(records)
+
+
+async def import_single_entries(
+    session: AsyncSession,
+    project_id: str,
+    worksheet: Any,
+    report: ImportSheetReport,
+    dry_run: bool,
+) -> None:
+    rows = enumerate(worksheet.iter_rows(min_row=2, values_only=True), start=2)
+    while True:
+        batch = await asyncio.to_thread(_next_import_batch, rows)
+        if not batch:
+            break
+        contents: Dict[str, str] = {}
+        for row_number, values in batch:
+            report.rows += 1
+            field_name = values[0] if values else None
+            if not field_name:
+                if len(report.errors) < IMPORT_MAX_REPORTED_ERRORS:
+                    report.errors.append(f"Row {row_number}: Field Name is required")
+                continue
+            content = values[1] if len(values) > 1 else None
+            contents[str(field_name)] = "" if content is None else str(content)
+        report.imported += len(contents)
+        if dry_run or not contents:
+            continue
+
+        existing = await session.execute(
+            select(SingleEntryFieldTable).where(
+                SingleEntryFieldTable.project_id == project_id,
+                SingleEntryFieldTable.field_name.in_(list(contents)),
+            )
+        )
+        for row in existing.scalars().all():
+            row.content = contents.pop(row.field_name)
+        session.add_all(
+            SingleEntryFieldTable(project_id=project_id, field_name=field_name, content=content)
+            for field_name, content in contents.items()
+        )
 
 
-@api_router.get("/projects/{project_id}/single-entry/{field_name}", response_model=Optional[SingleEntryField])
-async def get_single_entry(
+@api_router.post("/projects/{project_id}/import/xlsx", response_model=ImportReport)
+async def import_project_xlsx(
     project_id: str,
-    field_name: str,
-    current_user: UserProfile = Depends(get_current_user),
+    file: UploadFile = File(...),
+    dry_run: bool = False,
+    replace: bool = False,
+    current_user: UserProfile = Depends(require_editor),
     session: AsyncSession = Depends(get_session),
-) -> Optional[SingleEntryField]:
+) -> ImportReport:
+    """Import a workbook in the export layout.
+
+    The upload stays spooled on disk and is read with openpyxl's read-only
+    mode, so memory use does not grow with the workbook. All rows are
+    inserted in one transaction, which is rolled back if any sheet reports an
+    error; ``dry_run`` only validates and reports. ``replace`` clears each
+    imported table for the project first. Embedded images are not imported.
+    """
     await get_project_or_404(session, project_id, current_user)
-    stmt = select(SingleEntryFieldTable).where(
-        SingleEntryFieldTable.project_id == project_id,
-        SingleEntryFieldTable.field_name == field_name,
-    )
-    result = await session.execute(stmt)
-    row = result.scalar_one_or_none()
-    return to_schema(SingleEntryField, row) if row else None
+    from openpyxl import load_workbook
 
+    try:
+        workbook = await asyncio.to_thread(
+            load_workbook, file.file, read_only=True, data_only=True
+        )
+    except Exception as exc:
+        raise HTTPException(status_code=400, detail="Unreadable workbook") from exc
 
-@api_router.get("/projects/{project_id}/export/xlsx")
-async def export_project_xlsx(
-    project_id: str,
-    current_user: UserProfile = Depends(get_current_user),
-    session: AsyncSession = Depends(get_session),
-):
-    project = await get_project_or_404(session, project_id, current_user)
+    report = ImportReport(dry_run=dry_run, valid=True)
+    touched_tables: Set[str] = set()
+    try:
+        targets = await asyncio.to_thread(resolve_import_targets, workbook.worksheets)
+        for worksheet in workbook.worksheets:
+            sheet_report = ImportSheetReport(sheet=worksheet.title)
+            report.sheets.append(sheet_report)
+            if worksheet.title == "Project Summary":
+                continue
+            if worksheet.title == "Single Entries":
+                sheet_report.table = SingleEntryFieldTable.__tablename__
+                await import_single_entries(
+                    session, project_id, worksheet, sheet_report, dry_run
+                )
+            else:
+                target = targets[worksheet.title]
+                if isinstance(target, str):
+                    sheet_report.errors.append(target)
+                    report.valid = False
+                    continue
+                sheet_report.table = target.model.__tablename__
+                if replace and not dry_run:
+                    meta = target.section_meta
+                    if meta is not None:
+                        model = section_row_model(meta)
+                        row_filter = section_rows_filter(meta, project_id)
+                    else:
+                        model = target.model
+                        row_filter = target.model.project_id == project_id
+                    await session.execute(delete(model).where(row_filter))
+                await import_sheet_rows(
+                    session, project_id, worksheet, target, sheet_report, dry_run
+                )
+            if sheet_report.errors:
+                report.valid = False
+            if sheet_report.imported or replace:
+                touched_tables.add(sheet_report.table)
+    finally:
+        workbook.close()
+
+    if dry_run or not report.valid:
+        await session.rollback()
+        return report
+
+    for table_name in touched_tables:
+        await bump_table_version(session, project_id, table_name)
+    await session.commit()
+    return report
 
-    workbook = Workbook()
-    used_titles: Set[str] = set()
-    retained_image_streams: List[BytesIO] = []
 
-    summary_sheet = workbook.active
-    summary_sheet.title = make_sheet_title("Project Summary", used_titles)
-    summary_sheet.column_dimensions["A"].width = 20
-    summary_sheet.column_dimensions["B"].width = 80
+SNAPSHOT_FORMAT = "plankit-project-snapshot"
+SNAPSHOT_VERSION = 1
+SNAPSHOT_COMPRESSION_LEVEL = int(os.environ.get("SNAPSHOT_COMPRESSION_LEVEL", "6"))
+SNAPSHOT_BATCH_SIZE = int(os.environ.get("SNAPSHOT_BATCH_SIZE", "1000"))
+SNAPSHOT_MEDIA_TYPE = "application/gzip"
 
-    created_at = getattr(project, "created_at", None)
-    summary_rows = [
-        ("Project ID", project.id),
-        ("Project Name", project.name),
-        ("Description", project.description or ""),
-        ("Created By", project.created_by),
+
+def snapshot_table_plan(project_id: str) -> List[Tuple[Type[Base], Any]]:
+    """Tables in a project snapshot, each with the filter selecting its rows."""
+    plan: List[Tuple[Type[Base], Any]] = [
+        (ProjectTable, ProjectTable.id == project_id),
+        (ProjectAccessTable, ProjectAccessTable.project_id == project_id),
         (
-            "Created At",
-            created_at.isoformat() if isinstance(created_at, datetime) else "",
+            ImageBlobTable,
+            ImageBlobTable.id.in_(
+                select(SingleEntryFieldTable.image_id).where(
+                    SingleEntryFieldTable.project_id == project_id
+                )
+            ),
         ),
     ]
+    plan.extend((table, table.project_id == project_id) for table in TABLES_TO_PURGE)
+    return plan
 
-    for label, value in summary_rows:
-        summary_sheet.append([label, value])
-
-    single_entry_stmt = select(SingleEntryFieldTable).where(
-        SingleEntryFieldTable.project_id == project_id
-    )
-    single_entries = (await session.execute(single_entry_stmt)).scalars().all()
-    if single_entries:
-        single_sheet = workbook.create_sheet(
-            title=make_sheet_title("Single Entries", used_titles)
-        )
-        single_sheet.append(["Field Name", "Content", "Image"])
-        single_sheet.column_dimensions["A"].width = 32
-        single_sheet.column_dimensions["B"].width = 80
-        single_sheet.column_dimensions["C"].width = 50
 
-        row_index = 2
-        for entry in sorted(single_entries, key=lambda item: item.field_name):
-            single_sheet.cell(row=row_index, column=1, value=entry.field_name)
-            single_sheet.cell(row=row_index, column=2, value=entry.content)
-            if entry.image_data:
-                decoded = decode_image_for_workbook(entry.image_data)
-                if decoded is not None:
-                    image, buffer = decoded
-                    single_sheet.add_image(image, f"C{row_index}")
-                    retained_image_streams.append(buffer)
-                    if getattr(image, "height", None):
-                        single_sheet.row_dimensions[row_index].height = max(
-                            single_sheet.row_dimensions[row_index].height or 15,
-                            image.height * 0.75,
-                        )
-                else:
-                    single_sheet.cell(
-                        row=row_index,
-                        column=3,
-                        value="Image unavailable",
-                    )
-            row_index += 1
+SNAPSHOT_TABLES: Dict[str, Type[Base]] = {
+    table.__tablename__: table for table, _ in snapshot_table_plan("")
+}
 
-    for sheet_title, model in EXPORT_STATIC_TABLES:
-        stmt = select(model).where(model.project_id == project_id)
-        rows = (await session.execute(stmt)).scalars().all()
-        if not rows:
-            continue
 
-        columns = [
-            column.name
-            for column in model.__table__.columns
-            if column.name not in EXPORT_COLUMN_EXCLUDES
-        ]
-        if not columns:
-            continue
+async def delete_sharded_project_rows(session: AsyncSession, project_id: str) -> None:
+    """Clear rows an interrupted restore or move left in a shard; the caller commits."""
+    for table in TABLES_TO_PURGE:
+        await session.execute(delete(table).where(table.project_id == project_id))
 
-        sheet = workbook.create_sheet(title=make_sheet_title(sheet_title, used_titles))
-        sheet.append([friendly_header(column) for column in columns])
 
-        for idx, _ in enumerate(columns, start=1):
-            sheet.column_dimensions[get_column_letter(idx)].width = 24
+def encode_snapshot_value(column: Any, value: Any) -> Any:
+    if value is None:
+        return None
+    if isinstance(column.type, LargeBinary):
+        return _b64encode(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
 
-        for row in rows:
-            sheet.append([format_cell_value(getattr(row, column)) for column in columns])
 
-    for (section, table_name), meta in SECTION_TABLE_REGISTRY.items():
-        stmt = select(meta.model).where(meta.model.project_id == project_id)
-        rows = (await session.execute(stmt)).scalars().all()
-        if not rows:
-            continue
+def decode_snapshot_value(column: Any, value: Any) -> Any:
+    if value is None:
+        return None
+    if isinstance(column.type, LargeBinary):
+        return _b64decode(value)
+    if isinstance(column.type, DateTime):
+        return datetime.fromisoformat(value)
+    return value
 
-        base_title = f"{section} {table_name.replace('_', ' ').title()}"
-        sheet = workbook.create_sheet(title=make_sheet_title(base_title, used_titles))
-        sheet.append([friendly_header(column) for column in meta.columns])
 
-        for idx, _ in enumerate(meta.columns, start=1):
-            sheet.column_dimensions[get_column_letter(idx)].width = 24
+async def begin_snapshot_reads(session: AsyncSession) -> None:
+    """Open a read transaction on each database the session reads from.
 
-        for row in rows:
-            sheet.append(
-                [format_cell_value(getattr(row, column)) for column in meta.columns]
+    pysqlite runs a SELECT outside any transaction, so without this every
+    table would be read at a different point in time. SQLite gets a deferred
+    ``BEGIN``, which pins one WAL snapshot at the first read; PostgreSQL and
+    MySQL get ``REPEATABLE READ``. The global tables and a shard live in
+    separate databases, so their two transactions cannot share one snapshot.
+    """
+    engines_seen: Set[Any] = set()
+    for mapper in (ProjectTable, SingleEntryFieldTable):
+        bind = session.get_bind(mapper=mapper)
+        if bind in engines_seen:
+            continue
+        engines_seen.add(bind)
+        if bind.dialect.name == "sqlite":
+            await session.execute(text("BEGIN"), bind_arguments={"mapper": mapper})
+        else:
+            await session.connection(
+                bind_arguments={"mapper": mapper},
+                execution_options={"isolation_level": "REPEATABLE READ"},
             )
 
-    output = BytesIO()
-    workbook.save(output)
-    output.seek(0)
-
-    safe_name = "".join(
-        char if char.isalnum() else "_" for char in (project.name or project.id)
-    ).strip("_")
-    filename = f"{safe_name or project.id}.xlsx"
 
+def _snapshot_line(record: Any) -> bytes:
+    return json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+async def stream_project_snapshot(
+    project_id: str, session_factory: async_sessionmaker = async_session
+) -> AsyncGenerator[bytes, None]:
+    """Stream a gzip-compressed NDJSON snapshot of one project.
+
+    The archive is a header line, then for each table a ``{"table", "columns"}``
+    line followed by one JSON array per row, and a footer with row counts.
+    All tables of one database are read in a single read transaction (see
+    ``begin_snapshot_reads``). With sharding, the project and access rows
+    come from the global database in a separate transaction, so a grant
+    changed mid-snapshot may not match the shard's rows.
+    """
+    compressor = zlib.compressobj(SNAPSHOT_COMPRESSION_LEVEL, zlib.DEFLATED, 31)
+    counts: Dict[str, int] = {}
+    header = {
+        "format": SNAPSHOT_FORMAT,
+        "version": SNAPSHOT_VERSION,
+        "project_id": project_id,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+    }
+    yield compressor.compress(_snapshot_line(header))
+
+    async with session_factory() as session:
+        await begin_snapshot_reads(session)
+        for table, row_filter in snapshot_table_plan(project_id):
+            columns = list(table.__table__.columns)
+            table_name = table.__tablename__
+            counts[table_name] = 0
+            yield compressor.compress(
+                _snapshot_line(
+                    {"table": table_name, "columns": [column.name for column in columns]}
+                )
+            )
+            stmt = (
+                select(*columns)
+                .where(row_filter)
+                .execution_options(yield_per=SNAPSHOT_BATCH_SIZE)
+            )
+            result = await session.stream(stmt)
+            try:
+                async for partition in result.partitions():
+                    counts[table_name] += len(partition)
+                    chunk = compressor.compress(
+                        b"".join(
+                            _snapshot_line(
+                                [
+                                    encode_snapshot_value(column, value)
+                                    for column, value in zip(columns, row)
+                                ]
+                            )
+                            for row in partition
+                        )
+                    )
+                    if chunk:
+                        yield chunk
+            finally:
+                await result.close()
+
+    yield compressor.compress(_snapshot_line({"end": True, "counts": counts}))
+    yield compressor.flush()
+
+
+def _read_snapshot_records(stream: Any, limit: int) -> List[Any]:
+    records: List[Any] = []
+    for line in stream:
+        if line.strip():
+            records.append(json.loads(line))
+        if len(records) >= limit:
+            break
+    return records
+
+
+class SnapshotRestorer:
+    """Bulk-load snapshot records into a session; the caller commits.
+
+    With ``defer_global_rows`` the rows of ``GLOBAL_TABLES`` are held back
+    until ``insert_deferred_rows``, so the shard's rows can be committed first.
+    """
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        source_project_id: str,
+        target_project_id: str,
+        project_name: Optional[str] = None,
+        defer_global_rows: bool = False,
+    ) -> None:
+        self.session = session
+        self.source_project_id = source_project_id
+        self.target_project_id = target_project_id
+        self.project_name = project_name
+        self.remap_ids = source_project_id != target_project_id
+        self.defer_global_rows = defer_global_rows
+        self.deferred_rows: List[Tuple[Type[Base], List[Dict[str, Any]]]] = []
+        self.counts: Dict[str, int] = {}
+        self.restored_image_ids: List[str] = []
+        self.table: Optional[Type[Base]] = None
+        self.table_name = ""
+        self.columns: List[Any] = []
+        self.batch: List[Tuple[Type[Base], Dict[str, Any]]] = []
+
+    def start_table(self, table_name: str, column_names: Sequence[str]) -> None:
+        table = SNAPSHOT_TABLES.get(table_name)
+        # Snapshots taken under the other section storage layout are converted.
+        if table is None and table_name in SECTION_TABLES_BY_NAME:
+            table = SECTION_TABLES_BY_NAME[table_name].model
+        elif table is None and table_name == SectionRowTable.__tablename__:
+            table = SectionRowTable
+        if table is None:
+            raise HTTPException(status_code=400, detail=f"Unknown table in snapshot: {table_name}")
+        table_columns = table.__table__.columns
+        unknown = [name for name in column_names if name not in table_columns]
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown columns for {table_name}: {', '.join(unknown)}",
+            )
+        self.table = table
+        self.table_name = table_name
+        self.columns = [table_columns[name] for name in column_names]
+        self.counts[table_name] = 0
+
+    def add_row(self, values: Sequence[Any]) -> None:
+        if self.table is None or len(values) != len(self.columns):
+            raise HTTPException(status_code=400, detail="Malformed snapshot row")
+        row = {
+            column.name: decode_snapshot_value(column, value)
+            for column, value in zip(self.columns, values)
+        }
+        self.counts[self.table_name] += 1
+        if self.table is ProjectTable:
+            row["id"] = self.target_project_id
+            row["deleted_at"] = None
+            if self.project_name:
+                row["name"] = self.project_name
+        elif self.table is not ImageBlobTable:
+            row["project_id"] = self.target_project_id
+            if self.remap_ids:
+                row["id"] = str(uuid.uuid4())
+        self.batch.append(self._convert_section_row(self.table, row))
+
+    def _convert_section_row(
+        self, table: Type[Base], row: Dict[str, Any]
+    ) -> Tuple[Type[Base], Dict[str, Any]]:
+        if table is SectionRowTable and not SECTION_DOCUMENT_STORAGE:
+            meta = SECTION_TABLES_BY_NAME.get(row.get("table_name"))
+            if meta is None:
+                raise HTTPException(status_code=400, detail="Unknown section table in snapshot")
+            data = row.get("data") or {}
+            values = {column: data.get(column) for column in meta.columns}
+            return meta.model, {"id": row["id"], "project_id": row["project_id"], **values}
+        if table in SECTION_TABLE_MODELS and SECTION_DOCUMENT_STORAGE:
+            meta = SECTION_TABLES_BY_NAME[table.__tablename__]
+            return SectionRowTable, {
+                "id": row["id"],
+                "project_id": row["project_id"],
+                "section": meta.section,
+                "table_name": meta.table_name,
+                "data": {column: row.get(column) for column in meta.columns},
+            }
+        return table, row
+
+    async def flush(self) -> None:
+        batch, self.batch = self.batch, []
+        rows_by_table: Dict[Type[Base], List[Dict[str, Any]]] = {}
+        for table, row in batch:
+            rows_by_table.setdefault(table, []).append(row)
+        for table, rows in rows_by_table.items():
+            await self._insert_rows(table, rows)
+
+    async def _insert_rows(self, table: Type[Base], rows: List[Dict[str, Any]]) -> None:
+        if table is ImageBlobTable:
+            # Blobs are content-addressed; keep the copy already stored.
+            result = await self.session.execute(
+                select(ImageBlobTable.id).where(
+                    ImageBlobTable.id.in_([row["id"] for row in rows])
+                )
+            )
+            existing = set(result.scalars())
+            rows = [row for row in rows if row["id"] not in existing]
+            self.restored_image_ids.extend(row["id"] for row in rows)
+        elif table is ProjectAccessTable:
+            # Grants for users that do not exist in this database are dropped.
+            result = await self.session.execute(
+                select(UserTable.id).where(UserTable.id.in_([row["user_id"] for row in rows]))
+            )
+            known_users = set(result.scalars())
+            rows = [row for row in rows if row["user_id"] in known_users]
+        if rows and self.defer_global_rows and table in GLOBAL_TABLES:
+            self.deferred_rows.append((table, rows))
+        elif rows:
+            await self.session.execute(insert(table), rows)
+
+    async def insert_deferred_rows(self) -> None:
+        deferred, self.deferred_rows = self.deferred_rows, []
+        for table, rows in deferred:
+            await self.session.execute(insert(table), rows)
+
+
+async def load_snapshot_records(
+    restorer: SnapshotRestorer, stream: Any
+) -> Optional[Dict[str, Any]]:
+    """Feed snapshot lines into ``restorer``; returns the footer if one was read."""
+    footer: Optional[Dict[str, Any]] = None
+    while footer is None:
+        records = await asyncio.to_thread(_read_snapshot_records, stream, SNAPSHOT_BATCH_SIZE)
+        if not records:
+            break
+        for record in records:
+            if isinstance(record, list):
+                restorer.add_row(record)
+                continue
+            await restorer.flush()
+            if record.get("end"):
+                footer = record
+                break
+            restorer.start_table(record["table"], record["columns"])
+        if len(restorer.batch) >= SNAPSHOT_BATCH_SIZE:
+            await restorer.flush()
+    await restorer.flush()
+    return footer
+
+
+@api_router.get("/projects/{project_id}/snapshot")
+async def export_project_snapshot(
+    project_id: str,
+    request: Request,
+    current_user: UserProfile = Depends(require_admin),
+    session: AsyncSession = Depends(get_read_session),
+):
+    project = await get_project_or_404(session, project_id, current_user)
+    stem = export_filename(project).rsplit(".", 1)[0]
+    timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
     headers = {
-        "Content-Disposition": f'attachment; filename="{filename}"',
+        "Content-Disposition": f'attachment; filename="{stem}_{timestamp}.ndjson.gz"',
     }
-
     return StreamingResponse(
-        output,
-        media_type=
-        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        stream_project_snapshot(project.id, await read_session_factory(request)),
+        media_type=SNAPSHOT_MEDIA_TYPE,
         headers=headers,
     )
 
 
+@api_router.post("/projects/snapshot/restore", response_model=Project)
+async def restore_project_snapshot(
+    file: UploadFile = File(...),
+    as_new: bool = False,
+    name: Optional[str] = None,
+    current_user: UserProfile = Depends(require_admin),
+    session: AsyncSession = Depends(get_session),
+) -> Project:
+    """Restore a project from a snapshot produced by the snapshot endpoint.
+
+    By default the project keeps its original ID and the restore fails if that
+    ID is taken. ``as_new`` restores a copy under fresh IDs, optionally renamed.
+    Rows are bulk-inserted in batches inside one transaction. A shard outside
+    the primary database needs a second one: the shard's rows are committed
+    first, then the project, grants and directory entry, and the shard's rows
+    are purged again if that second commit fails. Rows left by a restore
+    interrupted in between are invisible without the project row, and
+    restoring the same snapshot again clears them.
+    """
+    stream = gzip.open(file.file, mode="rt", encoding="utf-8")
+    try:
+        records = await asyncio.to_thread(_read_snapshot_records, stream, 1)
+    except (OSError, EOFError, ValueError) as exc:
+        raise HTTPException(status_code=400, detail="Unreadable snapshot") from exc
+    header = records[0] if records else {}
+    if header.get("format") != SNAPSHOT_FORMAT:
+        raise HTTPException(status_code=400, detail="Not a project snapshot")
+    if header.get("version") != SNAPSHOT_VERSION:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported snapshot version: {header.get('version')}",
+        )
+
+    source_project_id = header["project_id"]
+    target_project_id = str(uuid.uuid4()) if as_new else source_project_id
+    if not as_new:
+        existing = await session.get(ProjectTable, source_project_id)
+        if existing is not None:
+            raise HTTPException(status_code=409, detail="Project already exists")
+
+    shard = await choose_project_shard(session)
+    two_phase = shard != DEFAULT_SHARD
+    async with SHARD_SESSIONMAKERS[shard]() as shard_session:
+        if two_phase and not as_new:
+            await delete_sharded_project_rows(shard_session, target_project_id)
+        restorer = SnapshotRestorer(
+            shard_session,
+            source_project_id,
+            target_project_id,
+            name,
+            defer_global_rows=two_phase,
+        )
+        try:
+            footer = await load_snapshot_records(restorer, stream)
+        except (OSError, EOFError, ValueError, KeyError) as exc:
+            await shard_session.rollback()
+            raise HTTPException(status_code=400, detail="Corrupt snapshot") from exc
+        except HTTPException:
+            await shard_session.rollback()
+            raise
+        finally:
+            stream.close()
+
+        if footer is None or footer.get("counts") != restorer.counts:
+            await shard_session.rollback()
+            raise HTTPException(status_code=400, detail="Snapshot is truncated")
+        if not restorer.counts.get(ProjectTable.__tablename__):
+            await shard_session.rollback()
+            raise HTTPException(status_code=400, detail="Snapshot has no project row")
+
+        if two_phase:
+            await shard_session.commit()
+        try:
+            await restorer.insert_deferred_rows()
+            record_project_shard(shard_session, target_project_id, shard)
+            await shard_session.commit()
+        except Exception:
+            await shard_session.rollback()
+            if two_phase:
+                await purge_project_children(target_project_id, shard)
+            raise
+        project = await shard_session.get(ProjectTable, target_project_id)
+    evict_project_export_fragments(target_project_id)
+    for image_id in restorer.restored_image_ids:
+        schedule_image_renditions(image_id, shard)
+
+    return to_schema(Project, project)
+
+
+async def _set_project_shard(project_id: str, **values: Any) -> None:
+    async with async_session() as session:
+        await session.execute(
+            update(ProjectShardTable)
+            .where(ProjectShardTable.project_id == project_id)
+            .values(**values)
+        )
+        await session.commit()
+    _project_shard_cache.pop(project_id, None)
+
+
+async def _wait_for_shard_caches() -> None:
+    # Other workers may hold the previous directory entry for this long.
+    if PROJECT_SHARD_CACHE_SECONDS > 0:
+        await asyncio.sleep(PROJECT_SHARD_CACHE_SECONDS)
+
+
+async def _copy_project_rows(
+    project_id: str, source_shard: str, target_shard: str
+) -> Tuple[Dict[str, int], List[str]]:
+    """Copy a project's sharded rows; returns row counts and copied image ids."""
+    async with SHARD_SESSIONMAKERS[target_shard]() as target_session:
+        await delete_sharded_project_rows(target_session, project_id)
+        restorer = SnapshotRestorer(target_session, project_id, project_id)
+        async with SHARD_SESSIONMAKERS[source_shard]() as source_session:
+            for table, row_filter in snapshot_table_plan(project_id):
+                if table in GLOBAL_TABLES:
+                    continue
+                columns = list(table.__table__.columns)
+                restorer.start_table(table.__tablename__, [column.name for column in columns])
+                result = await source_session.stream(
+                    select(*columns)
+                    .where(row_filter)
+                    .execution_options(yield_per=SNAPSHOT_BATCH_SIZE)
+                )
+                try:
+                    async for partition in result.partitions():
+                        for row in partition:
+                            restorer.add_row(
+                                [
+                                    encode_snapshot_value(column, value)
+                                    for column, value in zip(columns, row)
+                                ]
+                            )
+                        await restorer.flush()
+                finally:
+                    await result.close()
+        await target_session.commit()
+    return restorer.counts, restorer.restored_image_ids
+
+
+async def _purge_moved_project_rows(project_id: str, source_shard: str) -> None:
+    source_factory = SHARD_SESSIONMAKERS[source_shard]
+    async with source_factory() as session:
+        image_result = await session.execute(
+            select(SingleEntryFieldTable.image_id)
+            .where(
+                SingleEntryFieldTable.project_id == project_id,
+                SingleEntryFieldTable.image_id.is_not(None),
+            )
+            .distinct()
+        )
+        source_image_ids = [row[0] for row in image_result.all()]
+    for table in TABLES_TO_PURGE:
+        await _delete_project_rows_in_batches(table, project_id, source_factory)
+    async with source_factory() as session:
+        for image_id in source_image_ids:
+            await release_image_blob(session, image_id)
+        await session.commit()
+
+
+def project_shard_move_status(
+    project_id: str, entry: Optional[ProjectShardTable]
+) -> ProjectShardMoveStatus:
+    if entry is None:
+        return ProjectShardMoveStatus(project_id=project_id, shard=DEFAULT_SHARD)
+    return ProjectShardMoveStatus(
+        project_id=project_id,
+        shard=entry.shard,
+        moving=entry.moving,
+        state=entry.move_state,
+        source_shard=entry.move_source,
+        target_shard=entry.move_target,
+        error=entry.move_error,
+    )
+
+
+async def _project_shard_move_heartbeat(project_id: str) -> None:
+    while True:
+        await asyncio.sleep(max(PROJECT_SHARD_MOVE_LEASE_SECONDS / 3, 1.0))
+        try:
+            await _set_project_shard(project_id, move_heartbeat_at=datetime.now(timezone.utc))
+        except Exception:
+            if cancel_requested():
+                raise asyncio.CancelledError
+            logger.warning("Could not refresh the shard move lease of %s", project_id)
+
+
+async def run_project_shard_move(project_id: str) -> None:
+    """Drive a claimed shard move to completion from its recorded state.
+
+    Every step can be repeated, so a worker that claims an interrupted move
+    picks it up where the directory entry says it stopped. A failed copy
+    puts the project back on its source shard; a failure after the switch
+    leaves the move to be resumed once its lease expires.
+    """
+    heartbeat = asyncio.create_task(_project_shard_move_heartbeat(project_id))
+    try:
+        async with async_session() as session:
+            entry = await session.get(ProjectShardTable, project_id)
+        if entry is None or entry.move_state is None:
+            return
+        source_shard, target_shard = entry.move_source, entry.move_target
+        if entry.move_state == "copying":
+            # Workers that cached the entry before the move may still write.
+            await _wait_for_shard_caches()
+            try:
+                _, image_ids = await _copy_project_rows(project_id, source_shard, target_shard)
+            except Exception as exc:
+                if cancel_requested():
+                    raise asyncio.CancelledError
+                logger.exception("Moving project %s to shard %s failed", project_id, target_shard)
+                await _set_project_shard(
+                    project_id,
+                    shard=source_shard,
+                    moving=False,
+                    move_state=None,
+                    move_heartbeat_at=None,
+                    move_error=str(exc),
+                )
+                return
+            await _set_project_shard(project_id, shard=target_shard, move_state="switched")
+            for image_id in image_ids:
+                schedule_image_renditions(image_id, target_shard)
+
+        await _wait_for_shard_caches()
+        await _set_project_shard(project_id, moving=False)
+        evict_project_export_fragments(project_id)
+        # Stale lookups may still read from the source until their cache expires.
+        await _wait_for_shard_caches()
+        await _purge_moved_project_rows(project_id, source_shard)
+        await _set_project_shard(project_id, move_state=None, move_heartbeat_at=None)
+    except Exception:
+        if cancel_requested():
+            raise asyncio.CancelledError
+        logger.exception("Shard move of project %s stopped; it resumes later", project_id)
+    finally:
+        heartbeat.cancel()
+
+
+async def claim_project_shard_move(project_id: str) -> bool:
+    """Take over a move whose worker stopped refreshing its lease."""
+    now = datetime.now(timezone.utc)
+    expired = now - timedelta(seconds=PROJECT_SHARD_MOVE_LEASE_SECONDS)
+    async with async_session() as session:
+        result = await session.execute(
+            update(ProjectShardTable)
+            .where(
+                ProjectShardTable.project_id == project_id,
+                ProjectShardTable.move_state.is_not(None),
+                or_(
+                    ProjectShardTable.move_heartbeat_at.is_(None),
+                    ProjectShardTable.move_heartbeat_at < expired,
+                ),
+            )
+            .values(move_heartbeat_at=now)
+        )
+        await session.commit()
+    return result.rowcount == 1
+
+
+async def resume_project_shard_moves() -> None:
+    if not SHARDING_ENABLED:
+        return
+    async with async_session() as session:
+        result = await session.execute(
+            select(ProjectShardTable.project_id).where(ProjectShardTable.move_state.is_not(None))
+        )
+        project_ids = list(result.scalars().all())
+    for project_id in project_ids:
+        if await claim_project_shard_move(project_id):
+            spawn_background_task(run_project_shard_move(project_id))
+
+
+async def start_project_shard_move(project_id: str, target_shard: str) -> ProjectShardMoveStatus:
+    """Record a shard move and run it in the background.
+
+    Writes to the project are refused (423) while it moves. The project is
+    copied, the directory is switched to the new shard, and the old rows are
+    deleted only after every worker's cached lookup has expired. Progress is
+    kept in the directory entry, so the move survives a restart.
+    """
+    if target_shard not in shard_engines:
+        raise HTTPException(status_code=400, detail=f"Unknown shard: {target_shard}")
+    async with async_session() as session:
+        project = await session.get(ProjectTable, project_id)
+        if project is None or project.deleted_at is not None:
+            raise HTTPException(status_code=404, detail="Project not found")
+        entry = await session.get(ProjectShardTable, project_id)
+        source_shard = (
+            entry.shard if entry is not None and entry.shard in shard_engines else DEFAULT_SHARD
+        )
+        if source_shard == target_shard and not (entry is not None and entry.moving):
+            return project_shard_move_status(project_id, entry)
+        if entry is None:
+            values = {"project_id": project_id, "shard": source_shard}
+            stmt = insert_ignoring_duplicates(session, ProjectShardTable.__table__, values)
+            if stmt is None:
+                session.add(ProjectShardTable(**values))
+            else:
+                await session.execute(stmt)
+        # Only one request can flip an idle entry to moving.
+        claimed = await session.execute(
+            update(ProjectShardTable)
+            .where(
+                ProjectShardTable.project_id == project_id,
+                ProjectShardTable.moving.is_(False),
+                ProjectShardTable.move_state.is_(None),
+            )
+            .values(
+                shard=source_shard,
+                moving=True,
+                move_state="copying",
+                move_source=source_shard,
+                move_target=target_shard,
+                move_heartbeat_at=datetime.now(timezone.utc),
+                move_error=None,
+            )
+        )
+        if claimed.rowcount != 1:
+            await session.rollback()
+            raise HTTPException(status_code=409, detail="Project is already being moved")
+        await session.commit()
+        entry = await session.get(ProjectShardTable, project_id, populate_existing=True)
+    _project_shard_cache.pop(project_id, None)
+    spawn_background_task(run_project_shard_move(project_id))
+    return project_shard_move_status(project_id, entry)
+
+
+@api_router.get("/shards", response_model=List[ShardInfo])
+async def list_shards(
+    current_user: UserProfile = Depends(require_admin),
+    session: AsyncSession = Depends(get_session),
+) -> List[ShardInfo]:
+    counts = await shard_project_counts(session)
+    return [ShardInfo(name=name, projects=count) for name, count in counts.items()]
+
+
+@api_router.post(
+    "/projects/{project_id}/shard", response_model=ProjectShardMoveStatus, status_code=202
+)
+async def move_project_shard(
+    project_id: str,
+    payload: ProjectShardMove,
+    current_user: UserProfile = Depends(require_admin),
+) -> ProjectShardMoveStatus:
+    return await start_project_shard_move(project_id, payload.shard)
+
+
+@api_router.get("/projects/{project_id}/shard", response_model=ProjectShardMoveStatus)
+async def get_project_shard_move(
+    project_id: str,
+    current_user: UserProfile = Depends(require_admin),
+) -> ProjectShardMoveStatus:
+    async with async_session() as session:
+        entry = await session.get(ProjectShardTable, project_id)
+    return project_shard_move_status(project_id, entry)
+
+
 @api_router.post("/projects/{project_id}/project-details", response_model=ProjectDetails)
 async def create_project_details(
     project_id: str,
@@ -2444,7 +6878,7 @@ async def create_project_details(
 async def get_project_details(
     project_id: str,
     current_user: UserProfile = Depends(get_current_user),
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
 ) -> Optional[ProjectDetails]:
     await get_project_or_404(session, project_id, current_user)
     stmt = select(ProjectDetailsTable).where(ProjectDetailsTable.project_id == project_id)
@@ -2474,13 +6908,14 @@ async def create_assumption(
     return await create_project_item(session, AssumptionTable, Assumption, project_id, item, current_user=current_user)
 
 
-@api_router.get("/projects/{project_id}/assumptions", response_model=List[Assumption])
+@api_router.get("/projects/{project_id}/assumptions", responses=list_responses(Assumption))
 async def get_assumptions(
     project_id: str,
+    response_format: str = Depends(list_response_format),
     current_user: UserProfile = Depends(get_current_user),
-    session: AsyncSession = Depends(get_session),
-) -> List[Assumption]:
-    return await list_project_items(session, AssumptionTable, Assumption, project_id, current_user=current_user)
+    session: AsyncSession = Depends(get_read_session),
+) -> Response:
+    return await list_project_items(session, AssumptionTable, Assumption, project_id, response_format=response_format, current_user=current_user)
 
 
 @api_router.put("/projects/{project_id}/assumptions/{item_id}", response_model=Assumption)
@@ -2514,13 +6949,14 @@ async def create_constraint(
     return await create_project_item(session, ConstraintTable, Constraint, project_id, item, current_user=current_user)
 
 
-@api_router.get("/projects/{project_id}/constraints", response_model=List[Constraint])
+@api_router.get("/projects/{project_id}/constraints", responses=list_responses(Constraint))
 async def get_constraints(
     project_id: str,
+    response_format: str = Depends(list_response_format),
     current_user: UserProfile = Depends(get_current_user),
-    session: AsyncSession = Depends(get_session),
-) -> List[Constraint]:
-    return await list_project_items(session, ConstraintTable, Constraint, project_id, current_user=current_user)
+    session: AsyncSession = Depends(get_read_session),
+) -> Response:
+    return await list_project_items(session, ConstraintTable, Constraint, project_id, response_format=response_format, current_user=current_user)
 
 
 @api_router.put("/projects/{project_id}/constraints/{item_id}", response_model=Constraint)
@@ -2554,13 +6990,14 @@ async def create_dependency(
     return await create_project_item(session, DependencyTable, Dependency, project_id, item, current_user=current_user)
 
 
-@api_router.get("/projects/{project_id}/dependencies", response_model=List[Dependency])
+@api_router.get("/projects/{project_id}/dependencies", responses=list_responses(Dependency))
 async def get_dependencies(
     project_id: str,
+    response_format: str = Depends(list_response_format),
     current_user: UserProfile = Depends(get_current_user),
-    session: AsyncSession = Depends(get_session),
-) -> List[Dependency]:
-    return await list_project_items(session, DependencyTable, Dependency, project_id, current_user=current_user)
+    session: AsyncSession = Depends(get_read_session),
+) -> Response:
+    return await list_project_items(session, DependencyTable, Dependency, project_id, response_format=response_format, current_user=current_user)
 
 
 @api_router.put("/projects/{project_id}/dependencies/{item_id}", response_model=Dependency)
@@ -2594,13 +7031,14 @@ async def create_stakeholder(
     return await create_project_item(session, StakeholderTable, Stakeholder, project_id, item, current_user=current_user)
 
 
-@api_router.get("/projects/{project_id}/stakeholders", response_model=List[Stakeholder])
+@api_router.get("/projects/{project_id}/stakeholders", responses=list_responses(Stakeholder))
 async def get_stakeholders(
     project_id: str,
+    response_format: str = Depends(list_response_format),
     current_user: UserProfile = Depends(get_current_user),
-    session: AsyncSession = Depends(get_session),
-) -> List[Stakeholder]:
-    return await list_project_items(session, StakeholderTable, Stakeholder, project_id, current_user=current_user)
+    session: AsyncSession = Depends(get_read_session),
+) -> Response:
+    return await list_project_items(session, StakeholderTable, Stakeholder, project_id, response_format=response_format, current_user=current_user)
 
 
 @api_router.put("/projects/{project_id}/stakeholders/{item_id}", response_model=Stakeholder)
@@ -2632,29 +7070,28 @@ async def create_milestone_column(
     session: AsyncSession = Depends(get_session),
 ) -> MilestoneColumn:
     await get_project_or_404(session, project_id, current_user)
-    result = await session.execute(
-        select(func.max(MilestoneColumnTable.order)).where(MilestoneColumnTable.project_id == project_id)
+    return await perform_write(
+        session,
+        lambda session: append_milestone_column(
+            session, MilestoneColumnTable, MilestoneColumn, project_id, item.column_name
+        ),
     )
-    current_max = result.scalar_one_or_none() or 0
-    column = MilestoneColumnTable(project_id=project_id, column_name=item.column_name, order=current_max + 1)
-    session.add(column)
-    await session.commit()
-    await session.refresh(column)
-    return to_schema(MilestoneColumn, column)
 
 
-@api_router.get("/projects/{project_id}/milestone-columns", response_model=List[MilestoneColumn])
+@api_router.get("/projects/{project_id}/milestone-columns", responses=list_responses(MilestoneColumn))
 async def get_milestone_columns(
     project_id: str,
+    response_format: str = Depends(list_response_format),
     current_user: UserProfile = Depends(get_current_user),
-    session: AsyncSession = Depends(get_session),
-) -> List[MilestoneColumn]:
+    session: AsyncSession = Depends(get_read_session),
+) -> Response:
     return await list_project_items(
         session,
         MilestoneColumnTable,
         MilestoneColumn,
         project_id,
         order_by=MilestoneColumnTable.order.asc(),
+        response_format=response_format,
         current_user=current_user,
     )
 
@@ -2679,13 +7116,14 @@ async def create_deliverable(
     return await create_project_item(session, DeliverableTable, Deliverable, project_id, item, current_user=current_user)
 
 
-@api_router.get("/projects/{project_id}/deliverables", response_model=List[Deliverable])
+@api_router.get("/projects/{project_id}/deliverables", responses=list_responses(Deliverable))
 async def get_deliverables(
     project_id: str,
+    response_format: str = Depends(list_response_format),
     current_user: UserProfile = Depends(get_current_user),
-    session: AsyncSession = Depends(get_session),
-) -> List[Deliverable]:
-    return await list_project_items(session, DeliverableTable, Deliverable, project_id, current_user=current_user)
+    session: AsyncSession = Depends(get_read_session),
+) -> Response:
+    return await list_project_items(session, DeliverableTable, Deliverable, project_id, response_format=response_format, current_user=current_user)
 
 
 @api_router.put("/projects/{project_id}/deliverables/{item_id}", response_model=Deliverable)
@@ -2717,35 +7155,30 @@ async def create_sam_milestone_column(
     session: AsyncSession = Depends(get_session),
 ) -> SamMilestoneColumn:
     await get_project_or_404(session, project_id, current_user)
-    result = await session.execute(
-        select(func.max(SamMilestoneColumnTable.order)).where(
-            SamMilestoneColumnTable.project_id == project_id
-        )
-    )
-    current_max = result.scalar_one_or_none() or 0
-    column = SamMilestoneColumnTable(
-        project_id=project_id, column_name=item.column_name, order=current_max + 1
+    return await perform_write(
+        session,
+        lambda session: append_milestone_column(
+            session, SamMilestoneColumnTable, SamMilestoneColumn, project_id, item.column_name
+        ),
     )
-    session.add(column)
-    await session.commit()
-    await session.refresh(column)
-    return to_schema(SamMilestoneColumn, column)
 
 
-@api_router.get("/projects/{project_id}/sam-milestone-columns", response_model=List[SamMilestoneColumn])
+@api_router.get("/projects/{project_id}/sam-milestone-columns", responses=list_responses(SamMilestoneColumn))
 async def get_sam_milestone_columns(
     project_id: str,
+    response_format: str = Depends(list_response_format),
     current_user: UserProfile = Depends(get_current_user),
-    session: AsyncSession = Depends(get_session),
-) -> List[SamMilestoneColumn]:
-    await get_project_or_404(session, project_id, current_user)
-    stmt = (
-        select(SamMilestoneColumnTable)
-        .where(SamMilestoneColumnTable.project_id == project_id)
-        .order_by(SamMilestoneColumnTable.order.asc())
+    session: AsyncSession = Depends(get_read_session),
+) -> Response:
+    return await list_project_items(
+        session,
+        SamMilestoneColumnTable,
+        SamMilestoneColumn,
+        project_id,
+        order_by=SamMilestoneColumnTable.order.asc(),
+        response_format=response_format,
+        current_user=current_user,
     )
-    result = await session.execute(stmt)
-    return [to_schema(SamMilestoneColumn, row) for row in result.scalars().all()]
 
 
 @api_router.delete("/projects/{project_id}/sam-milestone-columns/{column_id}")
@@ -2781,17 +7214,19 @@ async def create_sam_deliverable(
     )
 
 
-@api_router.get("/projects/{project_id}/sam-deliverables", response_model=List[SamDeliverable])
+@api_router.get("/projects/{project_id}/sam-deliverables", responses=list_responses(SamDeliverable))
 async def get_sam_deliverables(
     project_id: str,
+    response_format: str = Depends(list_response_format),
     current_user: UserProfile = Depends(get_current_user),
-    session: AsyncSession = Depends(get_session),
-) -> List[SamDeliverable]:
+    session: AsyncSession = Depends(get_read_session),
+) -> Response:
     return await list_project_items(
         session,
         SamDeliverableTable,
         SamDeliverable,
         project_id,
+        response_format=response_format,
         current_user=current_user,
     )
 
@@ -2847,35 +7282,74 @@ async def create_generic_table_row(
 ) -> GenericTableRow:
     await get_project_or_404(session, project_id, current_user)
     meta = resolve_section_table(section, table_name)
-    row = meta.model(
-        project_id=project_id,
-        **{column: item.data.get(column) for column in meta.columns},
-    )
-    session.add(row)
-    await session.commit()
-    await session.refresh(row)
-    return serialize_section_row(section, table_name, meta, row)
+
+    async def write(session: AsyncSession) -> GenericTableRow:
+        row = new_section_row(meta, project_id, item.data)
+        session.add(row)
+        await bump_table_version(session, project_id, meta.table_name)
+        await session.flush()
+        return serialize_section_row(section, table_name, meta, row)
+
+    return await perform_write(session, write)
 
 
 @api_router.get(
     "/projects/{project_id}/sections/{section}/tables/{table_name}",
-    response_model=List[GenericTableRow],
+    responses=list_responses(GenericTableRow, ColumnarTableRows),
 )
 async def get_generic_table_rows(
     project_id: str,
     section: str,
     table_name: str,
+    response_format: str = Depends(list_response_format),
     current_user: UserProfile = Depends(get_current_user),
-    session: AsyncSession = Depends(get_session),
-) -> List[GenericTableRow]:
+    session: AsyncSession = Depends(get_read_session),
+) -> Response:
     await get_project_or_404(session, project_id, current_user)
     meta = resolve_section_table(section, table_name)
-    stmt = select(meta.model).where(meta.model.project_id == project_id)
-    result = await session.execute(stmt)
-    return [
-        serialize_section_row(section, table_name, meta, row)
-        for row in result.scalars().all()
-    ]
+    model = section_row_model(meta)
+    value_columns = (
+        [SectionRowTable.data]
+        if SECTION_DOCUMENT_STORAGE
+        else [getattr(model, column) for column in meta.columns]
+    )
+    result = await session.execute(
+        select(model.id, model.project_id, *value_columns).where(
+            section_rows_filter(meta, project_id)
+        )
+    )
+    if response_format == "columnar":
+        if SECTION_DOCUMENT_STORAGE:
+            values = [
+                [row_id, *((document or {}).get(column) for column in meta.columns)]
+                for row_id, _, document in result.all()
+            ]
+        else:
+            values = [[row_id, *row_values] for row_id, _, *row_values in result.all()]
+        return columnar_response(
+            ["id", *meta.columns],
+            values,
+            project_id=project_id,
+            section=section,
+            table_name=table_name,
+        )
+    rows = []
+    for row_id, row_project_id, *values in result.all():
+        if SECTION_DOCUMENT_STORAGE:
+            document = values[0] or {}
+            data = {column: document.get(column) for column in meta.columns}
+        else:
+            data = dict(zip(meta.columns, values))
+        rows.append(
+            {
+                "id": row_id,
+                "project_id": row_project_id,
+                "section": section,
+                "table_name": table_name,
+                "data": data,
+            }
+        )
+    return FastJSONResponse(rows)
 
 
 @api_router.put(
@@ -2893,12 +7367,15 @@ async def update_generic_table_row(
 ) -> GenericTableRow:
     await get_project_or_404(session, project_id, current_user)
     meta = resolve_section_table(section, table_name)
-    row = await get_item_or_404(session, meta.model, item_id, project_id)
-    for column in meta.columns:
-        setattr(row, column, item.data.get(column))
-    await session.commit()
-    await session.refresh(row)
-    return serialize_section_row(section, table_name, meta, row)
+
+    async def write(session: AsyncSession) -> GenericTableRow:
+        row = await get_section_row_or_404(session, meta, item_id, project_id)
+        assign_section_row(meta, row, item.data)
+        await bump_table_version(session, project_id, meta.table_name)
+        await session.flush()
+        return serialize_section_row(section, table_name, meta, row)
+
+    return await perform_write(session, write)
 
 
 @api_router.delete(
@@ -2914,14 +7391,21 @@ async def delete_generic_table_row(
 ) -> Dict[str, str]:
     await get_project_or_404(session, project_id, current_user)
     meta = resolve_section_table(section, table_name)
-    row = await get_item_or_404(session, meta.model, item_id, project_id)
-    await session.delete(row)
-    await session.commit()
+
+    async def write(session: AsyncSession) -> None:
+        row = await get_section_row_or_404(session, meta, item_id, project_id)
+        await session.delete(row)
+        await bump_table_version(session, project_id, meta.table_name)
+
+    await perform_write(session, write)
     return {"message": "Item deleted successfully"}
 
 
 app.include_router(api_router)
 
+if FRONTEND_BUILD_DIR:
+    app.mount("/", FrontendStaticFiles(directory=FRONTEND_BUILD_DIR, html=True), name="frontend")
+
 app.add_middleware(
     CORSMiddleware,
     allow_credentials=True,
@@ -2935,3 +7419,119 @@ logging.basicConfig(
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
 )
 logger = logging.getLogger(__name__)
+
+
+# ==================== MAINTENANCE CLI ====================
+
+
+async def schema_migration_status() -> Dict[str, Set[int]]:
+    status: Dict[str, Set[int]] = {}
+    for shard, shard_engine in shard_engines.items():
+        async with shard_engine.connect() as conn:
+            status[shard] = await conn.run_sync(applied_schema_versions)
+    return status
+
+
+def precompress_frontend_build(directory: str) -> List[str]:
+    """Write ``.br`` and ``.gz`` copies of the compressible files of a build.
+
+    Variants are written at maximum compression and only when they are
+    smaller; brotli copies need the optional ``brotli`` package.
+    """
+    written: List[str] = []
+    for path in sorted(Path(directory).rglob("*")):
+        if not path.is_file() or path.suffix in {".br", ".gz"}:
+            continue
+        media_type = mimetypes.guess_type(path.name)[0] or ""
+        data = path.read_bytes()
+        if not is_compressible_type(media_type) or len(data) < RESPONSE_COMPRESSION_MIN_SIZE:
+            continue
+        variants = {".gz": gzip.compress(data, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            variants[".br"] = brotli.compress(data, quality=11)
+        for suffix, compressed in variants.items():
+            if len(compressed) < len(data):
+                variant = path.with_name(path.name + suffix)
+                variant.write_bytes(compressed)
+                written.append(str(variant))
+    return written
+
+
+async def _run_cli_command(args: argparse.Namespace) -> None:
+    await create_database_tables(
+        migrate=SCHEMA_MIGRATIONS_ON_STARTUP and args.command != "migrate",
+        check_fingerprint=args.command != "migrate",
+    )
+    try:
+        if args.command == "migrate":
+            if args.status:
+                status = await schema_migration_status()
+                for migration in SCHEMA_MIGRATIONS:
+                    pending = [shard for shard, done in status.items() if migration.version not in done]
+                    state = f"pending on {', '.join(pending)}" if pending else "applied"
+                    print(f"{migration.version}\t{migration.name}\t{state}")
+            else:
+                for shard, versions in (await run_schema_migrations()).items():
+                    print(f"{shard}\t{', '.join(map(str, versions)) or 'up to date'}")
+        elif args.command == "convert-section-storage":
+            copied = await convert_section_storage(args.layout, args.replace)
+            for shard, count in copied.items():
+                print(f"{shard}\t{count} rows")
+            print(f"Set SECTION_TABLE_STORAGE={args.layout} before starting the app.")
+        elif args.command == "list-shards":
+            async with async_session() as session:
+                counts = await shard_project_counts(session)
+            for name, count in counts.items():
+                print(f"{name}\t{count}")
+        elif args.command == "move-project":
+            await start_project_shard_move(args.project_id, args.shard)
+            # Wait for the move and the renditions it schedules before exiting.
+            while _background_tasks:
+                await asyncio.gather(*_background_tasks)
+            async with async_session() as session:
+                entry = await session.get(ProjectShardTable, args.project_id)
+            print(project_shard_move_status(args.project_id, entry).model_dump_json(indent=2))
+    finally:
+        await dispose_engines()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Backend maintenance commands")
+    commands = parser.add_subparsers(dest="command", required=True)
+    migrate_parser = commands.add_parser("migrate", help="Apply pending schema migrations")
+    migrate_parser.add_argument(
+        "--status", action="store_true", help="List migrations without applying them"
+    )
+    convert_parser = commands.add_parser(
+        "convert-section-storage",
+        help="Copy generic section rows into the other storage layout (app stopped)",
+    )
+    convert_parser.add_argument("layout", choices=["tables", "document"])
+    convert_parser.add_argument(
+        "--replace", action="store_true", help="Overwrite rows already in the target layout"
+    )
+    commands.add_parser("list-shards", help="Show how many projects each shard holds")
+    move_parser = commands.add_parser("move-project", help="Move a project to another shard")
+    move_parser.add_argument("project_id")
+    move_parser.add_argument("shard")
+    compress_parser = commands.add_parser(
+        "compress-frontend", help="Write precompressed .br/.gz copies of the frontend build"
+    )
+    compress_parser.add_argument("directory", nargs="?", default=FRONTEND_BUILD_DIR)
+    args = parser.parse_args(argv)
+    if args.command == "compress-frontend":
+        if not args.directory:
+            parser.exit(1, "error: pass the build directory or set FRONTEND_BUILD_DIR\n")
+        for variant in precompress_frontend_build(args.directory):
+            print(variant)
+        return
+    try:
+        asyncio.run(_run_cli_command(args))
+    except HTTPException as exc:
+        parser.exit(1, f"error: {exc.detail}\n")
+    except RuntimeError as exc:
+        parser.exit(1, f"error: {exc}\n")
+
+
+if __name__ == "__main__":
+    main()
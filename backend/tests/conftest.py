@@ -0,0 +1,72 @@
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+# server reads its settings at import time, so point it at a throwaway database first.
+_data_dir = tempfile.mkdtemp(prefix="plankit-tests-")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_data_dir}/test.db"
+os.environ["SQLITE_BACKUP_DIR"] = f"{_data_dir}/backups"
+os.environ["SQLITE_BACKUP_INTERVAL_SECONDS"] = "0"
+os.environ["PASSWORD_HASH_ITERATIONS"] = "1000"
+os.environ.pop("FRONTEND_BUILD_DIR", None)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import server  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy.ext.asyncio import create_async_engine  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(server.app) as test_client:
+        yield test_client
+
+
+@pytest.fixture(scope="session")
+def auth_headers(client):
+    response = client.post(
+        "/api/auth/login", json={"email": "admin@plankit.com", "password": "admin123"}
+    )
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture
+def project_id(client, auth_headers):
+    response = client.post("/api/projects", json={"name": "Test project"}, headers=auth_headers)
+    return response.json()["id"]
+
+
+@pytest.fixture(scope="session")
+def shard_template(client, tmp_path_factory):
+    """An empty shard database, created once and copied for each test."""
+    path = tmp_path_factory.mktemp("shard") / "template.db"
+    template_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+
+    async def create_tables():
+        async with template_engine.begin() as conn:
+            await conn.run_sync(
+                server.Base.metadata.create_all, tables=server.database_tables("second")
+            )
+        await template_engine.dispose()
+
+    client.portal.call(create_tables)
+    return path
+
+
+@pytest.fixture
+def second_shard(client, shard_template, tmp_path, monkeypatch):
+    """A second shard database, with sharding switched on for one test."""
+    shutil.copyfile(shard_template, tmp_path / "shard.db")
+    shard_engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/shard.db")
+    sessionmaker = server._shard_sessionmaker(server.engine, shard_engine, "second")
+    monkeypatch.setitem(server.shard_engines, "second", shard_engine)
+    monkeypatch.setitem(server.SHARD_SESSIONMAKERS, "second", sessionmaker)
+    monkeypatch.setitem(server.SHARD_READ_SESSIONMAKERS, "second", sessionmaker)
+    monkeypatch.setattr(server, "SHARDING_ENABLED", True)
+    monkeypatch.setattr(server, "PROJECT_SHARD_CACHE_SECONDS", 0)
+    yield "second"
+    client.portal.call(shard_engine.dispose)
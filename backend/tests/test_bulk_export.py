@@ -0,0 +1,49 @@
+import zipfile
+from io import BytesIO
+
+from openpyxl import load_workbook
+
+import server
+
+
+def create_project(client, auth_headers, name):
+    response = client.post("/api/projects", json={"name": name}, headers=auth_headers)
+    return response.json()["id"]
+
+
+def export_zip(client, auth_headers, project_ids):
+    response = client.post(
+        "/api/export/projects/zip", json={"project_ids": project_ids}, headers=auth_headers
+    )
+    assert response.status_code == 200
+    return zipfile.ZipFile(BytesIO(response.content))
+
+
+def test_zip_contains_a_workbook_per_project(client, auth_headers):
+    project_ids = [create_project(client, auth_headers, f"Zip {index}") for index in range(3)]
+
+    archive = export_zip(client, auth_headers, project_ids)
+
+    assert archive.testzip() is None
+    names = archive.namelist()
+    assert len(names) == 3
+    for name in names:
+        assert "Project Summary" in load_workbook(BytesIO(archive.read(name))).sheetnames
+
+
+def test_failed_project_becomes_an_error_entry(client, auth_headers, monkeypatch):
+    good, bad = (create_project(client, auth_headers, name) for name in ("Zip good", "Zip bad"))
+    collect = server.collect_project_export
+
+    async def fail_for_bad_project(session, project, selection=None):
+        if project.id == bad:
+            raise RuntimeError("collect failed")
+        return await collect(session, project, selection)
+
+    monkeypatch.setattr(server, "collect_project_export", fail_for_bad_project)
+
+    archive = export_zip(client, auth_headers, [good, bad])
+
+    assert archive.testzip() is None
+    assert sorted(archive.namelist()) == ["Zip_bad.error.txt", "Zip_good.xlsx"]
+    assert b"RuntimeError" in archive.read("Zip_bad.error.txt")
@@ -0,0 +1,139 @@
+import gzip
+
+import pytest
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Mount, Route
+from starlette.testclient import TestClient
+
+import server
+
+needs_brotli = pytest.mark.skipif(server.brotli is None, reason="brotli is not installed")
+
+LARGE_TEXT = "plankit " * 2000
+
+
+def large_json(request):
+    return JSONResponse({"text": LARGE_TEXT})
+
+
+def small_json(request):
+    return JSONResponse({"ok": True})
+
+
+def png(request):
+    return Response(b"\x89PNG" + b"\0" * 5000, media_type="image/png")
+
+
+def partial(request):
+    body = LARGE_TEXT[:4000].encode()
+    return Response(
+        body,
+        status_code=206,
+        media_type="text/plain",
+        headers={"Content-Range": f"bytes 0-{len(body) - 1}/{len(LARGE_TEXT)}"},
+    )
+
+
+def streamed(request):
+    async def chunks():
+        for _ in range(20):
+            yield LARGE_TEXT[:500].encode()
+
+    return StreamingResponse(chunks(), media_type="text/plain")
+
+
+@pytest.fixture
+def build_dir(tmp_path):
+    (tmp_path / "static" / "js").mkdir(parents=True)
+    (tmp_path / "index.html").write_text("<html>" + LARGE_TEXT + "</html>")
+    (tmp_path / "static" / "js" / "main.1234.js").write_text("var a = 1;" * 500)
+    server.precompress_frontend_build(str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def compressed_client(build_dir):
+    app = Starlette(
+        routes=[
+            Route("/large", large_json),
+            Route("/small", small_json),
+            Route("/image.png", png),
+            Route("/stream", streamed),
+            Route("/partial", partial),
+            Mount("/", server.FrontendStaticFiles(directory=build_dir, html=True)),
+        ],
+        middleware=[Middleware(server.CompressionMiddleware)],
+    )
+    with TestClient(app) as client:
+        yield client
+
+
+def get(client, path, encoding, **headers):
+    return client.get(path, headers={"Accept-Encoding": encoding, **headers})
+
+
+@needs_brotli
+def test_brotli_is_preferred(compressed_client):
+    response = get(compressed_client, "/large", "gzip, br")
+    assert response.headers["content-encoding"] == "br"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) < len(LARGE_TEXT)
+    assert response.json() == {"text": LARGE_TEXT}
+
+
+def test_gzip_is_the_fallback(compressed_client, monkeypatch):
+    monkeypatch.setattr(server, "brotli", None)
+    response = get(compressed_client, "/large", "br, gzip")
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.json() == {"text": LARGE_TEXT}
+
+
+def test_streamed_bodies_are_compressed(compressed_client):
+    response = get(compressed_client, "/stream", "gzip")
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert response.text == LARGE_TEXT[:500] * 20
+
+
+@pytest.mark.parametrize("path", ["/small", "/image.png"])
+def test_small_and_binary_responses_are_not_compressed(compressed_client, path):
+    response = get(compressed_client, path, "gzip, br")
+    assert "content-encoding" not in response.headers
+
+
+def test_nothing_is_compressed_without_accept_encoding(compressed_client):
+    response = get(compressed_client, "/large", "identity")
+    assert "content-encoding" not in response.headers
+
+
+def test_precompressed_static_file_is_sent_as_is(compressed_client, build_dir):
+    response = get(compressed_client, "/static/js/main.1234.js", "gzip")
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.headers["cache-control"] == "public, max-age=31536000, immutable"
+    stored = (build_dir / "static" / "js" / "main.1234.js.gz").read_bytes()
+    assert int(response.headers["content-length"]) == len(stored)
+    assert gzip.decompress(stored).decode() == response.text
+
+
+def test_spa_routes_fall_back_to_index(compressed_client):
+    response = get(compressed_client, "/projects/123", "identity")
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == "no-cache"
+    assert response.text.startswith("<html>")
+
+
+def test_range_and_not_modified_responses_pass_through(compressed_client):
+    ranged = get(compressed_client, "/partial", "gzip, br")
+    assert ranged.status_code == 206
+    assert "content-encoding" not in ranged.headers
+    assert ranged.text == LARGE_TEXT[:4000]
+
+    # Each precompressed variant has its own ETag.
+    etag = get(compressed_client, "/index.html", "gzip").headers["etag"]
+    not_modified = get(compressed_client, "/index.html", "gzip", **{"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
@@ -0,0 +1,135 @@
+import asyncio
+from io import BytesIO
+
+from openpyxl import load_workbook
+
+import server
+
+
+def workbook_values(payload):
+    workbook = load_workbook(BytesIO(payload))
+    return {
+        sheet.title: [list(row) for row in sheet.iter_rows(values_only=True)]
+        for sheet in workbook.worksheets
+    }
+
+
+def full_rebuild(client, project_id):
+    """Render the workbook from scratch, as if no fragment had been cached."""
+
+    async def collect():
+        async with server.async_session() as session:
+            project = await session.get(server.ProjectTable, project_id)
+            return await server.collect_project_export(session, project)
+
+    saved = server._export_fragment_cache.copy(), server._export_fragment_cache_bytes
+    server._export_fragment_cache.clear()
+    server._export_fragment_cache_bytes = 0
+    try:
+        export_data = client.portal.call(collect)
+    finally:
+        server._export_fragment_cache.clear()
+        server._export_fragment_cache.update(saved[0])
+        server._export_fragment_cache_bytes = saved[1]
+    return server.render_project_workbook(export_data)
+
+
+def seed_project(client, auth_headers, project_id):
+    base = f"/api/projects/{project_id}"
+    assumption = client.post(
+        f"{base}/assumptions",
+        json={"sl_no": "1", "brief_description": "first", "impact_on_project_objectives": "low"},
+        headers=auth_headers,
+    ).json()
+    client.post(
+        f"{base}/constraints",
+        json={"sl_no": "1", "brief_description": "budget", "impact_on_project_objectives": "high"},
+        headers=auth_headers,
+    )
+    client.post(
+        f"{base}/sections/M4/tables/business_continuity",
+        json={"data": {"sl_no": "1", "brief_description": "backup site"}},
+        headers=auth_headers,
+    )
+    client.post(
+        f"{base}/single-entry",
+        json={"field_name": next(iter(server.SINGLE_ENTRY_FIELD_SECTIONS)), "content": "scope"},
+        headers=auth_headers,
+    )
+    return assumption
+
+
+def export(client, auth_headers, project_id):
+    response = client.get(f"/api/projects/{project_id}/export/xlsx", headers=auth_headers)
+    assert response.status_code == 200
+    return response.content
+
+
+def test_incremental_export_matches_full_rebuild(client, auth_headers, project_id):
+    assumption = seed_project(client, auth_headers, project_id)
+    export(client, auth_headers, project_id)
+
+    response = client.put(
+        f"/api/projects/{project_id}/assumptions/{assumption['id']}",
+        json={"sl_no": "1", "brief_description": "edited", "impact_on_project_objectives": "low"},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    incremental = workbook_values(export(client, auth_headers, project_id))
+
+    assert incremental == workbook_values(full_rebuild(client, project_id))
+    assert any("edited" in row for row in incremental["Assumptions"])
+
+
+def test_incremental_export_sees_every_edited_table(client, auth_headers, project_id):
+    seed_project(client, auth_headers, project_id)
+    export(client, auth_headers, project_id)
+
+    base = f"/api/projects/{project_id}"
+    client.post(
+        f"{base}/sections/M4/tables/business_continuity",
+        json={"data": {"sl_no": "2", "brief_description": "second site"}},
+        headers=auth_headers,
+    )
+    client.post(
+        f"{base}/single-entry",
+        json={"field_name": next(iter(server.SINGLE_ENTRY_FIELD_SECTIONS)), "content": "new scope"},
+        headers=auth_headers,
+    )
+    incremental = workbook_values(export(client, auth_headers, project_id))
+
+    assert incremental == workbook_values(full_rebuild(client, project_id))
+
+
+def test_concurrent_version_bumps_are_not_lost(client, project_id):
+    async def bump():
+        async with server.async_session() as session:
+            await server.bump_table_version(session, project_id, "assumptions")
+            await session.commit()
+
+    async def bump_concurrently():
+        await asyncio.gather(*(bump() for _ in range(10)))
+        async with server.async_session() as session:
+            return await server.fetch_table_versions(session, project_id)
+
+    assert client.portal.call(bump_concurrently)["assumptions"] == 10
+
+
+def test_fragment_cache_is_bounded_by_size(monkeypatch):
+    monkeypatch.setattr(server, "EXPORT_FRAGMENT_CACHE_MAX_BYTES", 1000)
+    monkeypatch.setattr(server, "_export_fragment_cache", server.OrderedDict())
+    monkeypatch.setattr(server, "_export_fragment_cache_bytes", 0)
+
+    def entry(size):
+        return [server.ExportSingleEntry("field", "", image=b"x" * size)]
+
+    server.store_export_fragment(("p", "single_entry_fields", 1), 1, entry(400))
+    server.store_export_fragment(("p", "single_entry_fields", 2), 1, entry(400))
+    server.store_export_fragment(("p", "single_entry_fields", 3), 1, entry(400))
+    server.store_export_fragment(("p", "single_entry_fields", 4), 1, entry(5000))
+
+    assert list(server._export_fragment_cache) == [
+        ("p", "single_entry_fields", 2),
+        ("p", "single_entry_fields", 3),
+    ]
+    assert server._export_fragment_cache_bytes == 800
@@ -0,0 +1,56 @@
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+import server
+
+
+@pytest.fixture
+def stored_image(client, auth_headers, project_id):
+    buffer = BytesIO()
+    Image.new("RGB", (50, 40), "purple").save(buffer, "PNG")
+    payload = buffer.getvalue()
+    field_name = next(iter(server.SINGLE_ENTRY_FIELD_SECTIONS))
+    url = f"/api/projects/{project_id}/single-entry/{field_name}/image"
+    response = client.put(
+        url, files={"file": ("image.png", payload, "image/png")}, headers=auth_headers
+    )
+    assert response.status_code == 200
+    return url, payload
+
+
+def test_image_has_strong_etag_and_revalidates(client, auth_headers, stored_image):
+    url, payload = stored_image
+
+    response = client.get(url, headers=auth_headers)
+    assert response.status_code == 200
+    assert response.content == payload
+    etag = response.headers["etag"]
+    assert etag.startswith('"') and not etag.startswith("W/")
+
+    revalidated = client.get(url, headers={**auth_headers, "If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+    assert revalidated.headers["etag"] == etag
+
+
+def test_image_serves_byte_ranges(client, auth_headers, stored_image):
+    url, payload = stored_image
+
+    response = client.get(url, headers={**auth_headers, "Range": "bytes=10-19"})
+    assert response.status_code == 206
+    assert response.content == payload[10:20]
+    assert response.headers["content-range"] == f"bytes 10-19/{len(payload)}"
+
+    suffix = client.get(url, headers={**auth_headers, "Range": "bytes=-5"})
+    assert suffix.status_code == 206
+    assert suffix.content == payload[-5:]
+
+
+def test_image_rejects_unsatisfiable_range(client, auth_headers, stored_image):
+    url, payload = stored_image
+
+    response = client.get(url, headers={**auth_headers, "Range": f"bytes={len(payload)}-"})
+    assert response.status_code == 416
+    assert response.headers["content-range"] == f"bytes */{len(payload)}"
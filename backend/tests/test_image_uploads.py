@@ -0,0 +1,125 @@
+import asyncio
+import base64
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from PIL import Image
+from sqlalchemy import delete, func, select
+
+import server
+
+
+def png_bytes(size=(40, 30)):
+    buffer = BytesIO()
+    Image.new("RGB", size, "red").save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def field_names(count):
+    return list(server.SINGLE_ENTRY_FIELD_SECTIONS)[:count]
+
+
+def test_upload_reports_dimensions(client, auth_headers, project_id):
+    field_name = field_names(1)[0]
+    response = client.put(
+        f"/api/projects/{project_id}/single-entry/{field_name}/image",
+        files={"file": ("image.png", png_bytes((64, 48)), "image/png")},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    assert (response.json()["image_width"], response.json()["image_height"]) == (64, 48)
+
+
+def test_concurrent_identical_uploads_share_one_blob(client, auth_headers, project_id):
+    payload = png_bytes((41, 31))
+
+    def upload(field_name):
+        return client.put(
+            f"/api/projects/{project_id}/single-entry/{field_name}/image",
+            files={"file": ("image.png", payload, "image/png")},
+            headers=auth_headers,
+        )
+
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        responses = list(pool.map(upload, field_names(6)))
+
+    assert [response.status_code for response in responses] == [200] * 6
+    assert len({response.json()["image_url"].split("v=")[1] for response in responses}) == 1
+
+
+def test_concurrent_identical_data_urls_share_one_blob(client, auth_headers, project_id):
+    data_url = "data:image/png;base64," + base64.b64encode(png_bytes((42, 32))).decode()
+
+    def save(field_name):
+        return client.post(
+            f"/api/projects/{project_id}/single-entry",
+            json={"field_name": field_name, "content": "", "image_data": data_url},
+            headers=auth_headers,
+        )
+
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        responses = list(pool.map(save, field_names(6)))
+
+    assert [response.status_code for response in responses] == [200] * 6
+    image_ids = {response.json()["image_url"].split("v=")[1] for response in responses}
+    assert len(image_ids) == 1
+
+    async def count_blobs():
+        async with server.async_session() as session:
+            result = await session.execute(
+                select(func.count())
+                .select_from(server.ImageBlobTable)
+                .where(server.ImageBlobTable.id.in_(image_ids))
+            )
+            return result.scalar_one()
+
+    assert client.portal.call(count_blobs) == 1
+
+
+def test_oversized_upload_is_refused_before_the_route_reads_it(
+    client, auth_headers, project_id, monkeypatch
+):
+    async def unexpected_read(upload):
+        raise AssertionError("oversized body reached the route")
+
+    monkeypatch.setattr(server, "read_image_upload", unexpected_read)
+    field_name = field_names(1)[0]
+    payload = png_bytes() + b"\0" * (server.MAX_IMAGE_UPLOAD_BYTES + server.UPLOAD_CHUNK_SIZE)
+
+    response = client.put(
+        f"/api/projects/{project_id}/single-entry/{field_name}/image",
+        files={"file": ("image.png", payload, "image/png")},
+        headers=auth_headers,
+    )
+
+    assert response.status_code == 413
+    assert response.json()["detail"] == "Image exceeds the upload size limit"
+
+
+def test_concurrent_rendition_tasks_store_each_kind_once(client, auth_headers, project_id):
+    field_name = field_names(1)[0]
+    response = client.put(
+        f"/api/projects/{project_id}/single-entry/{field_name}/image",
+        files={"file": ("image.png", png_bytes((300, 200)), "image/png")},
+        headers=auth_headers,
+    )
+    image_id = response.json()["image_url"].split("v=")[1]
+
+    async def regenerate_twice():
+        async with server.async_session() as session:
+            await session.execute(
+                delete(server.ImageRenditionTable).where(
+                    server.ImageRenditionTable.image_id == image_id
+                )
+            )
+            await session.commit()
+        await asyncio.gather(*(server.generate_image_renditions(image_id) for _ in range(2)))
+        async with server.async_session() as session:
+            result = await session.execute(
+                select(server.ImageRenditionTable.kind).where(
+                    server.ImageRenditionTable.image_id == image_id
+                )
+            )
+            return sorted(result.scalars())
+
+    assert client.portal.call(regenerate_twice) == sorted(server.RENDITION_SIZES)
@@ -0,0 +1,87 @@
+from io import BytesIO
+
+from openpyxl import Workbook
+
+import server
+
+
+def workbook_payload(sheets):
+    workbook = Workbook()
+    workbook.remove(workbook.active)
+    for title, rows in sheets.items():
+        sheet = workbook.create_sheet(title)
+        for row in rows:
+            sheet.append(row)
+    buffer = BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+
+def import_workbook(client, auth_headers, project_id, sheets, **params):
+    response = client.post(
+        f"/api/projects/{project_id}/import/xlsx",
+        params=params,
+        files={"file": ("import.xlsx", workbook_payload(sheets))},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+def assumption_rows(*descriptions):
+    rows = [["Sl No", "Brief Description", "Impact On Project Objectives"]]
+    rows.extend([str(index), text, "low"] for index, text in enumerate(descriptions, start=1))
+    return rows
+
+
+def list_assumptions(client, auth_headers, project_id):
+    response = client.get(f"/api/projects/{project_id}/assumptions", headers=auth_headers)
+    return [row["brief_description"] for row in response.json()]
+
+
+def test_import_with_sheet_errors_changes_nothing(client, auth_headers, project_id):
+    import_workbook(client, auth_headers, project_id, {"Assumptions": assumption_rows("kept")})
+
+    report = import_workbook(
+        client,
+        auth_headers,
+        project_id,
+        {
+            "Assumptions": assumption_rows("replacement"),
+            "Constraints": [["Remarks"], ["no required columns"]],
+        },
+        replace="true",
+    )
+
+    assert report["valid"] is False
+    assert list_assumptions(client, auth_headers, project_id) == ["kept"]
+
+
+def test_colliding_titles_resolve_against_present_sheets(client, auth_headers, project_id, monkeypatch):
+    assumptions, = server.IMPORT_SHEET_TARGETS["Assumptions"]
+    business_continuity, = server.IMPORT_SHEET_TARGETS["M4 Business Continuity"]
+    monkeypatch.setattr(
+        server, "IMPORT_SHEET_TARGETS", {"Shared Title": [business_continuity, assumptions]}
+    )
+
+    # A selective export containing only the second table still numbers its sheet.
+    report = import_workbook(
+        client, auth_headers, project_id, {"Shared Title_1": assumption_rows("from selective export")}
+    )
+
+    assert report["valid"] is True
+    assert report["sheets"][0]["table"] == "assumptions"
+    assert list_assumptions(client, auth_headers, project_id) == ["from selective export"]
+
+
+def test_ambiguous_sheet_titles_are_rejected(client, auth_headers, project_id, monkeypatch):
+    assumptions, = server.IMPORT_SHEET_TARGETS["Assumptions"]
+    constraints, = server.IMPORT_SHEET_TARGETS["Constraints"]
+    monkeypatch.setattr(server, "IMPORT_SHEET_TARGETS", {"Shared Title": [assumptions, constraints]})
+
+    sheet = [["Brief Description", "Remarks"], ["either table", ""]]
+    report = import_workbook(client, auth_headers, project_id, {"Shared Title": sheet})
+
+    assert report["valid"] is False
+    assert report["sheets"][0]["errors"] == ["Sheet title matches more than one table"]
+    assert list_assumptions(client, auth_headers, project_id) == []
@@ -0,0 +1,119 @@
+from sqlalchemy import select
+
+import server
+
+
+def seed_rows(client, auth_headers, project_id):
+    base = f"/api/projects/{project_id}"
+    for index in range(3):
+        client.post(
+            f"{base}/assumptions",
+            json={
+                "sl_no": str(index),
+                "brief_description": f"assumption {index}",
+                "impact_on_project_objectives": "low",
+                "remarks": None if index else "first",
+            },
+            headers=auth_headers,
+        )
+        client.post(
+            f"{base}/sections/M4/tables/business_continuity",
+            json={"data": {"sl_no": str(index), "brief_description": f"site {index}"}},
+            headers=auth_headers,
+        )
+
+
+def by_id(rows):
+    return sorted(rows, key=lambda row: row["id"])
+
+
+def validated_rows(client, project_id):
+    """The same rows serialized through the pydantic schemas."""
+
+    async def fetch():
+        meta = server.resolve_section_table("M4", "business_continuity")
+        async with server.async_session() as session:
+            assumptions = (
+                await session.execute(
+                    select(server.AssumptionTable).where(
+                        server.AssumptionTable.project_id == project_id
+                    )
+                )
+            ).scalars()
+            section_rows = (
+                await session.execute(
+                    select(server.section_row_model(meta)).where(
+                        server.section_rows_filter(meta, project_id)
+                    )
+                )
+            ).scalars()
+            return (
+                [
+                    server.to_schema(server.Assumption, row).model_dump(mode="json")
+                    for row in assumptions
+                ],
+                [
+                    server.serialize_section_row("M4", "business_continuity", meta, row)
+                    .model_dump(mode="json")
+                    for row in section_rows
+                ],
+            )
+
+    return client.portal.call(fetch)
+
+
+def test_fast_list_rows_match_schema_serialization(client, auth_headers, project_id):
+    seed_rows(client, auth_headers, project_id)
+    base = f"/api/projects/{project_id}"
+
+    assumptions = client.get(f"{base}/assumptions", headers=auth_headers).json()
+    section_rows = client.get(
+        f"{base}/sections/M4/tables/business_continuity", headers=auth_headers
+    ).json()
+
+    assert len(assumptions) == len(section_rows) == 3
+    expected_assumptions, expected_section_rows = validated_rows(client, project_id)
+    assert by_id(assumptions) == by_id(expected_assumptions)
+    assert by_id(section_rows) == by_id(expected_section_rows)
+
+
+def from_columnar(payload):
+    return [dict(zip(payload["columns"], row)) for row in payload["rows"]]
+
+
+def test_columnar_lists_round_trip_to_rows(client, auth_headers, project_id):
+    seed_rows(client, auth_headers, project_id)
+    base = f"/api/projects/{project_id}"
+    columnar = {"format": "columnar"}
+
+    assumptions = client.get(f"{base}/assumptions", headers=auth_headers).json()
+    payload = client.get(f"{base}/assumptions", params=columnar, headers=auth_headers).json()
+    decoded = [{**row, "project_id": payload["project_id"]} for row in from_columnar(payload)]
+    assert len(assumptions) == 3
+    assert by_id(decoded) == by_id(assumptions)
+
+    url = f"{base}/sections/M4/tables/business_continuity"
+    section_rows = client.get(url, headers=auth_headers).json()
+    payload = client.get(url, params=columnar, headers=auth_headers).json()
+    decoded = [
+        {
+            "id": values.pop("id"),
+            "project_id": payload["project_id"],
+            "section": payload["section"],
+            "table_name": payload["table_name"],
+            "data": values,
+        }
+        for values in from_columnar(payload)
+    ]
+    assert len(section_rows) == 3
+    assert by_id(decoded) == by_id(section_rows)
+
+
+def test_openapi_documents_both_list_formats(client):
+    schema = client.get("/openapi.json").json()
+    content = schema["paths"]["/api/projects/{project_id}/assumptions"]["get"]["responses"]["200"][
+        "content"
+    ]["application/json"]["schema"]
+
+    refs = {option.get("$ref") or option["items"]["$ref"] for option in content["anyOf"]}
+    assert refs == {"#/components/schemas/Assumption", "#/components/schemas/ColumnarRows"}
@@ -0,0 +1,20 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+
+@pytest.mark.parametrize("slug", ["milestone-columns", "sam-milestone-columns"])
+def test_concurrent_creates_get_distinct_orders(client, auth_headers, project_id, slug):
+    url = f"/api/projects/{project_id}/{slug}"
+
+    def create(index):
+        response = client.post(url, json={"column_name": f"M{index}"}, headers=auth_headers)
+        assert response.status_code == 200, response.text
+        return response.json()["order"]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        orders = list(pool.map(create, range(8)))
+
+    assert sorted(orders) == list(range(1, 9))
+    listed = client.get(url, headers=auth_headers).json()
+    assert sorted(column["order"] for column in listed) == list(range(1, 9))
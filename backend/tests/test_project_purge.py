@@ -0,0 +1,67 @@
+from io import BytesIO
+
+import pytest
+from PIL import Image
+from sqlalchemy import select
+
+import server
+
+
+def upload_image(client, auth_headers, project_id, field_name, color):
+    buffer = BytesIO()
+    Image.new("RGB", (20, 20), color).save(buffer, "PNG")
+    response = client.put(
+        f"/api/projects/{project_id}/single-entry/{field_name}/image",
+        files={"file": ("image.png", buffer.getvalue(), "image/png")},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    return response.json()["image_url"].split("v=")[1]
+
+
+def stored_blob_ids(client):
+    async def fetch():
+        async with server.async_session() as session:
+            return set((await session.execute(select(server.ImageBlobTable.id))).scalars())
+
+    return client.portal.call(fetch)
+
+
+@pytest.fixture
+def projects_with_images(client, auth_headers):
+    field_name = next(iter(server.SINGLE_ENTRY_FIELD_SECTIONS))
+    purged, kept = (
+        client.post("/api/projects", json={"name": name}, headers=auth_headers).json()["id"]
+        for name in ("Purged", "Kept")
+    )
+    own_image = upload_image(client, auth_headers, purged, field_name, "blue")
+    shared_image = upload_image(client, auth_headers, kept, field_name, "green")
+    other_field = list(server.SINGLE_ENTRY_FIELD_SECTIONS)[1]
+    upload_image(client, auth_headers, purged, other_field, "green")
+    return purged, own_image, shared_image
+
+
+def test_purge_releases_only_unreferenced_blobs(client, projects_with_images):
+    purged, own_image, shared_image = projects_with_images
+
+    client.portal.call(server.purge_project_children, purged)
+
+    blob_ids = stored_blob_ids(client)
+    assert own_image not in blob_ids
+    assert shared_image in blob_ids
+
+
+def test_interrupted_purge_leaves_no_orphaned_blobs(client, projects_with_images, monkeypatch):
+    purged, own_image, _ = projects_with_images
+    delete_rows = server._delete_project_rows_in_batches
+
+    async def interrupt_after_single_entries(table, *args, **kwargs):
+        if table is server.ProjectDetailsTable:
+            raise RuntimeError("purge interrupted")
+        await delete_rows(table, *args, **kwargs)
+
+    monkeypatch.setattr(server, "_delete_project_rows_in_batches", interrupt_after_single_entries)
+    with pytest.raises(RuntimeError):
+        client.portal.call(server.purge_project_children, purged)
+
+    assert own_image not in stored_blob_ids(client)
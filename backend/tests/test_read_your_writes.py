@@ -0,0 +1,60 @@
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+import server
+
+
+@pytest.fixture(scope="module")
+def replica_engine(client, tmp_path_factory):
+    """A read replica that has the schema but none of the primary's rows yet."""
+    path = tmp_path_factory.mktemp("replica") / "replica.db"
+    replica = create_async_engine(f"sqlite+aiosqlite:///{path}")
+
+    async def create_schema():
+        async with replica.begin() as conn:
+            await conn.run_sync(server.Base.metadata.create_all)
+
+    client.portal.call(create_schema)
+    yield replica
+    client.portal.call(replica.dispose)
+
+
+@pytest.fixture
+def stale_replica(replica_engine, monkeypatch):
+    monkeypatch.setitem(
+        server.SHARD_READ_SESSIONMAKERS,
+        server.DEFAULT_SHARD,
+        async_sessionmaker(
+            replica_engine, expire_on_commit=False, info={"shard": server.DEFAULT_SHARD}
+        ),
+    )
+
+
+def test_write_marker_sends_next_read_to_primary(client, auth_headers, project_id, stale_replica):
+    response = client.post(
+        f"/api/projects/{project_id}/assumptions",
+        json={"sl_no": "1", "brief_description": "fresh", "impact_on_project_objectives": "low"},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    last_write = response.headers[server.LAST_WRITE_HEADER]
+
+    # No server-side state is involved, so any worker honours the marker.
+    echoed = client.get(
+        f"/api/projects/{project_id}/assumptions",
+        headers={**auth_headers, server.LAST_WRITE_HEADER: last_write},
+    )
+    assert echoed.status_code == 200
+    assert [row["brief_description"] for row in echoed.json()] == ["fresh"]
+
+    replica_read = client.get(f"/api/projects/{project_id}/assumptions", headers=auth_headers)
+    assert replica_read.status_code == 404
+
+
+def test_stale_write_marker_reads_from_replica(client, auth_headers, project_id, stale_replica):
+    stale = f"{server.time.time() - server.READ_AFTER_WRITE_SECONDS - 1:.3f}"
+    response = client.get(
+        f"/api/projects/{project_id}/assumptions",
+        headers={**auth_headers, server.LAST_WRITE_HEADER: stale},
+    )
+    assert response.status_code == 404
@@ -0,0 +1,64 @@
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.dialects import sqlite
+
+import server
+
+
+def query_plan(client, stmt):
+    sql = str(stmt.compile(dialect=sqlite.dialect(), compile_kwargs={"literal_binds": True}))
+
+    async def explain():
+        async with server.engine.connect() as conn:
+            result = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")
+            return " | ".join(row[-1] for row in result.all())
+
+    return client.portal.call(explain)
+
+
+def test_single_entry_lookup_uses_unique_index(client):
+    stmt = server.single_entry_select().where(
+        server.SingleEntryFieldTable.project_id == "project",
+        server.SingleEntryFieldTable.field_name == "scope",
+    )
+    assert "uq_single_entry_field" in query_plan(client, stmt)
+
+
+def test_milestone_columns_use_project_order_index(client):
+    for table, index_name in (
+        (server.MilestoneColumnTable, "ix_milestone_columns_project_order"),
+        (server.SamMilestoneColumnTable, "ix_sam_milestone_columns_project_order"),
+    ):
+        stmt = select(table).where(table.project_id == "project").order_by(table.order.asc())
+        plan = query_plan(client, stmt)
+        assert index_name in plan
+        assert "TEMP B-TREE" not in plan
+
+
+def test_hidden_project_lookup_uses_user_visible_index(client):
+    stmt = select(server.ProjectAccessTable.project_id).where(
+        server.ProjectAccessTable.user_id == "user",
+        server.ProjectAccessTable.visible.is_(False),
+    )
+    assert "ix_project_access_user_visible" in query_plan(client, stmt)
+
+
+def test_duplicate_single_entry_cleanup_keeps_latest_row():
+    engine = create_engine("sqlite://")
+    tables = [
+        server.SingleEntryFieldTable.__table__,
+        server.ImageBlobTable.__table__,
+        server.ImageRenditionTable.__table__,
+    ]
+    with engine.begin() as conn:
+        server.Base.metadata.create_all(conn, tables=tables)
+        conn.execute(text("DROP INDEX uq_single_entry_field"))
+        # Random ids sort differently from insertion order.
+        for row_id, content in (("c", "first"), ("a", "second"), ("b", "latest")):
+            conn.execute(
+                server.SingleEntryFieldTable.__table__.insert().values(
+                    id=row_id, project_id="project", field_name="scope", content=content
+                )
+            )
+        server._drop_duplicate_single_entry_fields(conn)
+        remaining = conn.execute(select(server.SingleEntryFieldTable.__table__.c.content)).all()
+    assert remaining == [("latest",)]
@@ -0,0 +1,114 @@
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import func, select
+
+import server
+
+
+def add_assumption(client, auth_headers, project_id):
+    return client.post(
+        f"/api/projects/{project_id}/assumptions",
+        json={"sl_no": "1", "brief_description": "moved", "impact_on_project_objectives": "low"},
+        headers=auth_headers,
+    )
+
+
+def move_status(client, auth_headers, project_id):
+    response = client.get(f"/api/projects/{project_id}/shard", headers=auth_headers)
+    assert response.status_code == 200
+    return response.json()
+
+
+def wait_for_move(client, auth_headers, project_id, timeout=10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        status = move_status(client, auth_headers, project_id)
+        if status["state"] is None:
+            return status
+        time.sleep(0.05)
+    raise AssertionError(f"Shard move did not finish: {status}")
+
+
+def assumption_count(client, shard, project_id):
+    async def count():
+        async with server.SHARD_SESSIONMAKERS[shard]() as session:
+            return await session.scalar(
+                select(func.count())
+                .select_from(server.AssumptionTable)
+                .where(server.AssumptionTable.project_id == project_id)
+            )
+
+    return client.portal.call(count)
+
+
+def start_move(client, auth_headers, project_id, shard):
+    return client.post(
+        f"/api/projects/{project_id}/shard", json={"shard": shard}, headers=auth_headers
+    )
+
+
+def test_move_runs_in_the_background(client, auth_headers, project_id, second_shard):
+    assert add_assumption(client, auth_headers, project_id).status_code == 200
+
+    response = start_move(client, auth_headers, project_id, second_shard)
+    assert response.status_code == 202
+    assert response.json()["state"] == "copying"
+    assert response.json()["target_shard"] == second_shard
+
+    status = wait_for_move(client, auth_headers, project_id)
+    assert status["shard"] == second_shard
+    assert status["moving"] is False
+    assert status["error"] is None
+    assert assumption_count(client, second_shard, project_id) == 1
+    assert assumption_count(client, server.DEFAULT_SHARD, project_id) == 0
+    rows = client.get(f"/api/projects/{project_id}/assumptions", headers=auth_headers).json()
+    assert [row["brief_description"] for row in rows] == ["moved"]
+
+
+def test_interrupted_move_is_resumed(
+    client, auth_headers, project_id, second_shard, monkeypatch
+):
+    add_assumption(client, auth_headers, project_id)
+    spawn_background_task = server.spawn_background_task
+    # The worker that accepted the move dies before running it.
+    monkeypatch.setattr(server, "spawn_background_task", lambda coro: coro.close())
+    assert start_move(client, auth_headers, project_id, second_shard).status_code == 202
+    assert add_assumption(client, auth_headers, project_id).status_code == 423
+    assert start_move(client, auth_headers, project_id, second_shard).status_code == 423
+
+    monkeypatch.setattr(server, "spawn_background_task", spawn_background_task)
+    # A live lease keeps other workers away.
+    client.portal.call(server.resume_project_shard_moves)
+    assert move_status(client, auth_headers, project_id)["state"] == "copying"
+
+    expired = datetime.now(timezone.utc) - timedelta(
+        seconds=server.PROJECT_SHARD_MOVE_LEASE_SECONDS + 1
+    )
+    client.portal.call(
+        lambda: server._set_project_shard(project_id, move_heartbeat_at=expired)
+    )
+    client.portal.call(server.resume_project_shard_moves)
+
+    status = wait_for_move(client, auth_headers, project_id)
+    assert status["shard"] == second_shard
+    assert assumption_count(client, second_shard, project_id) == 1
+    assert assumption_count(client, server.DEFAULT_SHARD, project_id) == 0
+
+
+def test_failed_copy_returns_project_to_its_shard(
+    client, auth_headers, project_id, second_shard, monkeypatch
+):
+    add_assumption(client, auth_headers, project_id)
+
+    async def broken_copy(project_id, source_shard, target_shard):
+        raise RuntimeError("target shard is full")
+
+    monkeypatch.setattr(server, "_copy_project_rows", broken_copy)
+    assert start_move(client, auth_headers, project_id, second_shard).status_code == 202
+
+    status = wait_for_move(client, auth_headers, project_id)
+    assert status["shard"] == server.DEFAULT_SHARD
+    assert status["moving"] is False
+    assert status["error"] == "target shard is full"
+    assert add_assumption(client, auth_headers, project_id).status_code == 200
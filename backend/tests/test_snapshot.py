@@ -0,0 +1,118 @@
+import gzip
+import json
+
+import pytest
+from sqlalchemy import func, select
+
+import server
+
+
+def add_assumption(client, auth_headers, project_id, description):
+    response = client.post(
+        f"/api/projects/{project_id}/assumptions",
+        json={"sl_no": "1", "brief_description": description, "impact_on_project_objectives": "low"},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+
+
+def snapshot_rows(payload, table_name):
+    rows, current = [], None
+    for line in gzip.decompress(payload).decode().splitlines():
+        record = json.loads(line)
+        if isinstance(record, dict):
+            current = record.get("table")
+        elif current == table_name:
+            rows.append(record)
+    return rows
+
+
+def test_snapshot_ignores_writes_made_while_streaming(client, auth_headers, project_id):
+    add_assumption(client, auth_headers, project_id, "before")
+
+    async def snapshot_with_concurrent_write():
+        chunks = []
+        stream = server.stream_project_snapshot(project_id)
+        # Header, then the first two table lines: the project table has been read.
+        for _ in range(3):
+            chunks.append(await stream.__anext__())
+        async with server.async_session() as session:
+            session.add(
+                server.AssumptionTable(
+                    project_id=project_id,
+                    sl_no="2",
+                    brief_description="during",
+                    impact_on_project_objectives="low",
+                )
+            )
+            await session.commit()
+        chunks.extend([chunk async for chunk in stream])
+        return b"".join(chunks)
+
+    payload = client.portal.call(snapshot_with_concurrent_write)
+
+    rows = snapshot_rows(payload, "assumptions")
+    assert len(rows) == 1
+    assert "before" in rows[0]
+
+
+def take_snapshot(client, auth_headers, project_id):
+    response = client.get(f"/api/projects/{project_id}/snapshot", headers=auth_headers)
+    assert response.status_code == 200
+    return response.content
+
+
+def restore(client, auth_headers, payload):
+    return client.post(
+        "/api/projects/snapshot/restore",
+        params={"as_new": "true"},
+        files={"file": ("snapshot.ndjson.gz", payload, "application/gzip")},
+        headers=auth_headers,
+    )
+
+
+def shard_row_count(client, shard, table):
+    async def count():
+        async with server.SHARD_SESSIONMAKERS[shard]() as session:
+            return await session.scalar(select(func.count()).select_from(table))
+
+    return client.portal.call(count)
+
+
+def test_restore_into_another_shard(client, auth_headers, project_id, second_shard, monkeypatch):
+    add_assumption(client, auth_headers, project_id, "restored")
+    payload = take_snapshot(client, auth_headers, project_id)
+
+    async def pick_second_shard(session):
+        return second_shard
+
+    monkeypatch.setattr(server, "choose_project_shard", pick_second_shard)
+    response = restore(client, auth_headers, payload)
+
+    assert response.status_code == 200
+    restored_id = response.json()["id"]
+    rows = client.get(f"/api/projects/{restored_id}/assumptions", headers=auth_headers).json()
+    assert [row["brief_description"] for row in rows] == ["restored"]
+    assert shard_row_count(client, second_shard, server.AssumptionTable) == 1
+
+
+def test_failed_global_commit_removes_shard_rows(
+    client, auth_headers, project_id, second_shard, monkeypatch
+):
+    add_assumption(client, auth_headers, project_id, "lost")
+    payload = take_snapshot(client, auth_headers, project_id)
+    projects_before = shard_row_count(client, server.DEFAULT_SHARD, server.ProjectTable)
+
+    async def pick_second_shard(session):
+        return second_shard
+
+    def fail_directory_entry(session, project_id, shard):
+        raise RuntimeError("global commit failed")
+
+    monkeypatch.setattr(server, "choose_project_shard", pick_second_shard)
+    monkeypatch.setattr(server, "record_project_shard", fail_directory_entry)
+    with pytest.raises(RuntimeError):
+        restore(client, auth_headers, payload)
+
+    assert shard_row_count(client, second_shard, server.AssumptionTable) == 0
+    assert shard_row_count(client, server.DEFAULT_SHARD, server.ProjectTable) == projects_before
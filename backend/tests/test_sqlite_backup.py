@@ -0,0 +1,32 @@
+import fcntl
+
+import pytest
+from fastapi import HTTPException
+
+import server
+
+
+@pytest.fixture
+def backup_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(server, "SQLITE_BACKUP_DIR", tmp_path)
+    monkeypatch.setattr(server, "SQLITE_BACKUP_INTERVAL_SECONDS", 3600)
+    return tmp_path
+
+
+def test_scheduled_backup_skips_while_another_process_holds_the_lock(client, backup_dir):
+    # flock locks belong to the open file, so a second handle stands in for another worker.
+    with open(backup_dir / ".backup.lock", "a") as other_worker:
+        fcntl.flock(other_worker, fcntl.LOCK_EX)
+        client.portal.call(lambda: server.perform_sqlite_backup(scheduled=True))
+        with pytest.raises(HTTPException) as error:
+            client.portal.call(server.perform_sqlite_backup)
+
+    assert error.value.status_code == 409
+    assert server.list_sqlite_backups() == []
+
+
+def test_scheduled_backup_runs_once_per_interval(client, backup_dir):
+    for _ in range(3):
+        client.portal.call(lambda: server.perform_sqlite_backup(scheduled=True))
+
+    assert len(server.list_sqlite_backups()) == 1
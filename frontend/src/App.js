@@ -11,7 +11,7 @@ import { SearchProvider } from "./context/GlobalSearchContext";
 import { broadcastSessionLogout, isTokenExpired } from "./utils/session";
 import "./App.css";
 
-const BACKEND_URL = process.env.REACT_APP_BACKEND_URL;
+export const BACKEND_URL = process.env.REACT_APP_BACKEND_URL;
 export const API = `${BACKEND_URL}/api`;
 
 // Axios interceptor to add auth token
@@ -21,6 +21,10 @@ axios.interceptors.request.use(
     if (token) {
       config.headers.Authorization = `Bearer ${token}`;
     }
+    const lastWrite = sessionStorage.getItem("lastWrite");
+    if (lastWrite) {
+      config.headers["X-Last-Write"] = lastWrite;
+    }
     return config;
   },
   (error) => {
@@ -28,6 +32,16 @@ axios.interceptors.request.use(
   }
 );
 
+// The backend stamps successful writes; echoing the stamp back keeps this
+// tab's next reads on the primary database until a replica has caught up.
+axios.interceptors.response.use((response) => {
+  const lastWrite = response.headers?.["x-last-write"];
+  if (lastWrite) {
+    sessionStorage.setItem("lastWrite", lastWrite);
+  }
+  return response;
+});
+
 // Protected Route Component
 const ProtectedRoute = ({ children, adminOnly = false }) => {
   const token = localStorage.getItem("token");
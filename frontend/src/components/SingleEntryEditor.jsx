@@ -2,6 +2,7 @@ import React, { useContext, useEffect, useMemo } from "react";
 import { SectionItemContext } from "./SectionLayout";
 import { useGlobalSearch } from "../context/GlobalSearchContext";
 import { buildSingleEntrySearchItems } from "../utils/searchRegistry";
+import SingleEntryImage from "./SingleEntryImage";
 
 const SingleEntryEditor = ({
   definitions = [],
@@ -67,7 +68,8 @@ const SingleEntryEditor = ({
   return (
     <div style={{ display: "grid", gap: "1.5rem" }}>
       {definitions.map((entry) => {
-        const value = values[entry.field] || { content: "", image_data: null };
+        const value = values[entry.field] || { content: "", image_data: null, image_url: null };
+        const hasImage = Boolean(value.image_data || value.image_url);
         const rawContent = value.content ?? "";
         const contentText =
           typeof rawContent === "string" ? rawContent : String(rawContent ?? "");
@@ -86,10 +88,10 @@ const SingleEntryEditor = ({
                   ? contentText
                   : `No ${entry.label.toLowerCase()} provided yet.`}
               </p>
-              {value.image_data ? (
-                <img
+              {hasImage ? (
+                <SingleEntryImage
                   className="single-entry-viewer-image"
-                  src={value.image_data}
+                  value={value}
                   alt={`${entry.label} visual`}
                 />
               ) : null}
@@ -137,10 +139,10 @@ const SingleEntryEditor = ({
                     disabled={!isEditor || loading}
                   />
                 ) : null}
-                {value.image_data && (
+                {hasImage && (
                   <div style={{ marginTop: "0.75rem" }}>
-                    <img
-                      src={value.image_data}
+                    <SingleEntryImage
+                      value={value}
                       alt={`${entry.label} visual`}
                       style={{ maxWidth: "100%", borderRadius: "0.5rem" }}
                     />
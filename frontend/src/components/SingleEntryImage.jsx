@@ -0,0 +1,104 @@
+import React, { useEffect, useRef, useState } from "react";
+import axios from "axios";
+import { BACKEND_URL } from "../App";
+
+// Renders a single-entry image, fetching it with the auth header only once the
+// placeholder scrolls into view. Unsaved uploads are shown from their data URL.
+const SingleEntryImage = ({ value = {}, alt, className, style }) => {
+  const containerRef = useRef(null);
+  const [visible, setVisible] = useState(false);
+  const [objectUrl, setObjectUrl] = useState(null);
+  const [loadFailed, setLoadFailed] = useState(false);
+
+  const pendingSrc = value.image_data || null;
+  const imageUrl = pendingSrc ? null : value.image_url || null;
+  const thumbnailUrl = imageUrl ? value.thumbnail_url || null : null;
+
+  useEffect(() => {
+    if (!imageUrl || visible) {
+      return undefined;
+    }
+
+    const node = containerRef.current;
+    if (!node || typeof IntersectionObserver === "undefined") {
+      setVisible(true);
+      return undefined;
+    }
+
+    const observer = new IntersectionObserver(
+      (entries) => {
+        if (entries.some((entry) => entry.isIntersecting)) {
+          setVisible(true);
+          observer.disconnect();
+        }
+      },
+      { rootMargin: "200px" }
+    );
+    observer.observe(node);
+    return () => observer.disconnect();
+  }, [imageUrl, visible]);
+
+  useEffect(() => {
+    setLoadFailed(false);
+    if (!imageUrl || !visible) {
+      setObjectUrl(null);
+      return undefined;
+    }
+
+    let cancelled = false;
+    const createdUrls = [];
+    // Show the small pre-scaled thumbnail first, then swap in the original.
+    const load = async () => {
+      for (const url of [thumbnailUrl, imageUrl].filter(Boolean)) {
+        try {
+          const response = await axios.get(`${BACKEND_URL}${url}`, { responseType: "blob" });
+          if (cancelled) {
+            return;
+          }
+          const nextUrl = URL.createObjectURL(response.data);
+          createdUrls.push(nextUrl);
+          setObjectUrl(nextUrl);
+        } catch {
+          if (!cancelled) {
+            setLoadFailed(true);
+          }
+          return;
+        }
+      }
+    };
+    load();
+
+    return () => {
+      cancelled = true;
+      createdUrls.forEach((url) => URL.revokeObjectURL(url));
+    };
+  }, [imageUrl, thumbnailUrl, visible]);
+
+  if (!pendingSrc && !imageUrl) {
+    return null;
+  }
+
+  const src = pendingSrc || objectUrl;
+  const placeholderStyle =
+    value.image_width && value.image_height
+      ? { aspectRatio: `${value.image_width} / ${value.image_height}` }
+      : { minHeight: "4rem" };
+
+  return (
+    <div ref={containerRef}>
+      {src ? (
+        <img className={className} src={src} alt={alt} style={style} />
+      ) : (
+        <div
+          className={className}
+          style={{ ...style, ...placeholderStyle, width: value.image_width || "100%" }}
+          aria-label={alt}
+        >
+          {loadFailed ? "Image could not be loaded" : null}
+        </div>
+      )}
+    </div>
+  );
+};
+
+export default SingleEntryImage;
@@ -29,18 +29,24 @@ const M3Definitions = ({ projectId, isEditor, sectionId, sectionName, onSingleEn
 
   const fetchData = async () => {
     try {
-      const [defsResponse, field1, field2, field3] = await Promise.all([
+      const [defsResponse, singleEntriesResponse] = await Promise.all([
         axios.get(`${API}/projects/${projectId}/definition-acronyms`),
-        axios.get(`${API}/projects/${projectId}/single-entry/reference_to_pif`),
-        axios.get(`${API}/projects/${projectId}/single-entry/reference_to_other_documents`),
-        axios.get(`${API}/projects/${projectId}/single-entry/plan_for_other_resources`)
+        axios.get(`${API}/projects/${projectId}/single-entry`, {
+          params: {
+            fields: "reference_to_pif,reference_to_other_documents,plan_for_other_resources"
+          }
+        })
       ]);
 
       setDefinitions(defsResponse.data);
+      const contentByField = {};
+      (singleEntriesResponse.data || []).forEach((entry) => {
+        contentByField[entry.field_name] = entry.content;
+      });
       const nextFields = {
-        reference_to_pif: field1.data?.content || "",
-        reference_to_other_documents: field2.data?.content || "",
-        plan_for_other_resources: field3.data?.content || ""
+        reference_to_pif: contentByField.reference_to_pif || "",
+        reference_to_other_documents: contentByField.reference_to_other_documents || "",
+        plan_for_other_resources: contentByField.plan_for_other_resources || ""
       };
 
       setSingleFields(nextFields);
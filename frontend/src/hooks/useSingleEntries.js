@@ -2,19 +2,20 @@ import { useCallback, useEffect, useRef, useState } from "react";
 import axios from "axios";
 import { API } from "../App";
 
-const fileToDataUrl = (file) =>
-  new Promise((resolve, reject) => {
-    const reader = new FileReader();
-    reader.onload = () => resolve(reader.result);
-    reader.onerror = reject;
-    reader.readAsDataURL(file);
-  });
-
+// image_file/image_data hold an unsaved upload and its local preview URL;
+// stored images are referenced by image_url and fetched lazily by SingleEntryImage.
 const normalizeValue = (value = {}) => ({
   content: typeof value.content === "string" ? value.content : value.content ?? "",
-  image_data: value.image_data || null
+  image_file: value.image_file || null,
+  image_data: value.image_data || null,
+  image_url: value.image_url || null,
+  image_width: value.image_width ?? null,
+  image_height: value.image_height ?? null,
+  thumbnail_url: value.thumbnail_url || null
 });
 
+const EMPTY_VALUE = { content: "", image_file: null, image_data: null, image_url: null };
+
 export const useSingleEntries = (projectId, definitions = []) => {
   const [values, setValues] = useState({});
   const [loading, setLoading] = useState(false);
@@ -31,7 +32,8 @@ export const useSingleEntries = (projectId, definitions = []) => {
 
     const isDirty =
       initialValue.content !== normalizedNext.content ||
-      initialValue.image_data !== normalizedNext.image_data;
+      initialValue.image_file !== normalizedNext.image_file ||
+      initialValue.image_url !== normalizedNext.image_url;
 
     setDirtyMap((prev) => {
       if (prev[field] === isDirty) {
@@ -54,16 +56,18 @@ export const useSingleEntries = (projectId, definitions = []) => {
 
       setLoading(true);
       try {
-        const responses = await Promise.all(
-          definitions.map((definition) =>
-            axios.get(`${API}/projects/${projectId}/single-entry/${definition.field}`)
-          )
-        );
+        const response = await axios.get(`${API}/projects/${projectId}/single-entry`, {
+          params: { fields: definitions.map((definition) => definition.field).join(",") }
+        });
+        const entriesByField = {};
+        (response.data || []).forEach((entry) => {
+          entriesByField[entry.field_name] = entry;
+        });
 
         const nextValues = {};
         const nextInitial = {};
-        definitions.forEach((definition, index) => {
-          const payload = responses[index].data || {};
+        definitions.forEach((definition) => {
+          const payload = entriesByField[definition.field] || {};
           const normalized = normalizeValue(payload);
           nextValues[definition.field] = normalized;
           nextInitial[definition.field] = { ...normalized };
@@ -89,7 +93,7 @@ export const useSingleEntries = (projectId, definitions = []) => {
     (field, content) => {
       setValues((prev) => {
         const nextValue = {
-          ...(prev[field] || { image_data: null, content: "" }),
+          ...(prev[field] || EMPTY_VALUE),
           content
         };
 
@@ -104,8 +108,13 @@ export const useSingleEntries = (projectId, definitions = []) => {
     if (!file) {
       setValues((prev) => {
         const nextValue = {
-          ...(prev[field] || { content: "", image_data: null }),
-          image_data: null
+          ...(prev[field] || EMPTY_VALUE),
+          image_file: null,
+          image_data: null,
+          image_url: null,
+          image_width: null,
+          image_height: null,
+          thumbnail_url: null
         };
 
         setDirtyForField(field, nextValue);
@@ -114,11 +123,13 @@ export const useSingleEntries = (projectId, definitions = []) => {
       return;
     }
 
-    const dataUrl = await fileToDataUrl(file);
+    const previewUrl = URL.createObjectURL(file);
     setValues((prev) => {
       const nextValue = {
-        ...(prev[field] || { content: "", image_data: null }),
-        image_data: dataUrl
+        ...(prev[field] || EMPTY_VALUE),
+        image_file: file,
+        image_data: previewUrl,
+        image_url: null
       };
 
       setDirtyForField(field, nextValue);
@@ -129,18 +140,33 @@ export const useSingleEntries = (projectId, definitions = []) => {
   const saveEntry = useCallback(
     async (field) => {
       const payload = normalizeValue(values[field]);
-      await axios.post(`${API}/projects/${projectId}/single-entry`, {
-        field_name: field,
-        content: payload.content,
-        image_data: payload.image_data
-      });
+      const initialValue = normalizeValue(initialRef.current[field]);
+      const body = { field_name: field, content: payload.content };
+      if (!payload.image_file && !payload.image_url && initialValue.image_url) {
+        // An explicit null removes the stored image; omitting it keeps it.
+        body.image_data = null;
+      }
+
+      let response = await axios.post(`${API}/projects/${projectId}/single-entry`, body);
+      if (payload.image_file) {
+        // Images go up as multipart so the server can stream and validate them.
+        const formData = new FormData();
+        formData.append("file", payload.image_file);
+        response = await axios.put(
+          `${API}/projects/${projectId}/single-entry/${field}/image`,
+          formData
+        );
+        URL.revokeObjectURL(payload.image_data);
+      }
+      const saved = normalizeValue(response.data || {});
 
       const nextInitial = {
         ...initialRef.current,
-        [field]: { ...payload }
+        [field]: { ...saved }
       };
 
       updateInitialState(nextInitial);
+      setValues((prev) => ({ ...prev, [field]: saved }));
       setDirtyMap((prev) => ({ ...prev, [field]: false }));
     },
     [projectId, updateInitialState, values]